@@ -0,0 +1,68 @@
+from autogen_agentchat.agents import AssistantAgent
+from autogen_core.models import SystemMessage, UserMessage
+from autogen_ext.models.ollama import OllamaChatCompletionClient
+from typing import Dict, Any, List, Optional
+from core.model_scheduler import get_model_scheduler
+from core.single_flight import canonical_key, get_single_flight
+from config.options import COALESCING_OPTIONS
+
+DEFAULT_MODEL_INFO: Dict[str, Any] = {
+    "vision": False,
+    "function_calling": False,
+    "json_output": False,
+    "family": "unknown",
+    "structured_output": True,
+}
+
+
+class BaseLLMAgent(AssistantAgent):
+    """
+    Assistant agent bound to a single Ollama model.
+
+    Every call goes through the shared ModelScheduler so that calls are grouped by model
+    and Ollama does not keep swapping models in and out of memory. Calls are stateless
+    (system message + one user message): no chat history is carried between tasks, so the
+    prompt prefix stays identical across calls and Ollama can reuse its cached KV state.
+    Identical concurrent prompts to the same model share one call (see core.single_flight), unless
+    they are sent with different sampling options.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        system_message: str,
+        model: str = "gemma3n:e2b",
+        model_info: Optional[Dict[str, Any]] = None,
+    ):
+        model_client = OllamaChatCompletionClient(model=model, model_info=model_info or DEFAULT_MODEL_INFO)
+        super().__init__(name=name, model_client=model_client, system_message=system_message)
+        self.model = model
+        self.model_client = model_client
+        self.system_message = system_message
+
+    def build_messages(self, task: str) -> List[Any]:
+        """Build the message list sent to the model for a single task."""
+        return [SystemMessage(content=self.system_message), UserMessage(content=task, source="user")]
+
+    async def run_task(self, task: str, options: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Run a single task once the agent's model is resident and return the stripped reply.
+
+        Args:
+            task: User prompt
+            options: Ollama sampling options for this call only, e.g. {"temperature": 0.9, "seed": 2}
+        """
+        messages = self.build_messages(task=task)
+        extra_create_args = {"options": options} if options else {}
+
+        async def call() -> str:
+            result = await get_model_scheduler().run(
+                model=self.model,
+                job=lambda: self.model_client.create(messages=messages, extra_create_args=extra_create_args),
+            )
+            return str(result.content).strip()
+
+        if not COALESCING_OPTIONS["prompts"]:
+            return await call()
+        key = canonical_key(self.model, self.system_message, task, *([options] if options else []))
+        return await get_single_flight(name="prompt").run(key=key, job=call)
@@ -0,0 +1,110 @@
+from typing import Dict, Any, Optional, Tuple
+from agents.base_agent import BaseLLMAgent
+from agents.content_generation.prompts import BATCH_INSTRUCTIONS, CONTENT_SYSTEM_MESSAGE
+from core.property_context import PropertyContext
+from core.field_dependencies import ALL_FIELDS
+
+
+class ContentAgent(BaseLLMAgent):
+    """
+    Base class for the section content agents.
+
+    Subclasses provide the section instructions in PROMPTS ({language: {"initial", "refinement"}})
+    and choose which pre-rendered listing payload they send with PAYLOAD_KIND. Prompts are assembled
+    as static prefix -> section instructions -> listing payload (see agents.content_generation.prompts),
+    all read from a PropertyContext built once per (listing, language, tone).
+
+    DEPENDS_ON lists the property_data fields the payload reads (dotted paths, see
+    core.field_dependencies); the full "property_data" payload reads every field.
+    """
+
+    PROMPTS: Dict[str, Dict[str, str]] = {}
+    PAYLOAD_KIND = "property_data"
+    DEPENDS_ON: Tuple[str, ...] = (ALL_FIELDS,)
+
+    def __init__(self, name: str, model: str = "gemma3n:e2b", model_info: Optional[Dict[str, Any]] = None):
+        super().__init__(name=name, model=model, model_info=model_info, system_message=CONTENT_SYSTEM_MESSAGE)
+
+    def build_payload(self, context: PropertyContext) -> str:
+        """Get the listing-specific data block that closes the prompt."""
+        return context.payloads[self.PAYLOAD_KIND]
+
+    def build_user_prompt(
+        self,
+        property_data: Dict[str, Any],
+        language="en",
+        tone="family-oriented",
+        context: Optional[PropertyContext] = None,
+    ) -> str:
+        context = context or PropertyContext.build(property_data=property_data, language=language, tone=tone)
+        instructions = self.PROMPTS.get(context.language, self.PROMPTS["en"])["initial"]
+        return "\n\n".join([context.static_prefix, instructions, self.build_payload(context=context)])
+
+    def build_refinement_prompt(
+        self,
+        property_data: Dict[str, Any],
+        current_content: str,
+        suggestion: str,
+        language="en",
+        tone="family-oriented",
+        context: Optional[PropertyContext] = None,
+    ) -> str:
+        context = context or PropertyContext.build(property_data=property_data, language=language, tone=tone)
+        instructions = self.PROMPTS.get(context.language, self.PROMPTS["en"])["refinement"]
+        return "\n\n".join(
+            [
+                context.static_prefix,
+                instructions,
+                self.build_payload(context=context),
+                f"{context.labels['current_content']}:\n{current_content}",
+                f"{context.labels['suggestion']}:\n- {suggestion}",
+            ]
+        )
+
+    def build_batch_prompt(self, contexts: Dict[str, PropertyContext]) -> str:
+        """
+        Build one initial prompt covering several listings that share language and tone.
+
+        Args:
+            contexts: PropertyContext of each listing, keyed by the ID the model must echo back
+
+        Returns:
+            Static prefix -> section instructions -> batch instructions -> one tagged payload per listing
+        """
+        first = next(iter(contexts.values()))
+        instructions = self.PROMPTS.get(first.language, self.PROMPTS["en"])["initial"]
+        batch_instructions = BATCH_INSTRUCTIONS.get(first.language, BATCH_INSTRUCTIONS["en"])
+        listings = [f"[{listing_id}] {self.build_payload(context=context)}" for listing_id, context in contexts.items()]
+        return "\n\n".join([first.static_prefix, instructions, batch_instructions, *listings])
+
+    async def generate_initial(
+        self,
+        property_data: Dict[str, Any],
+        language="en",
+        tone="family-oriented",
+        context: Optional[PropertyContext] = None,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Generate the initial section draft, with per-call sampling options if given."""
+        prompt = self.build_user_prompt(property_data=property_data, language=language, tone=tone, context=context)
+        return await self.run_task(task=prompt, options=options)
+
+    async def refine(
+        self,
+        property_data: Dict[str, Any],
+        current_content: str,
+        suggestion: str,
+        language="en",
+        tone="family-oriented",
+        context: Optional[PropertyContext] = None,
+    ) -> str:
+        """Refine the existing section content based on a suggestion."""
+        prompt = self.build_refinement_prompt(
+            property_data=property_data,
+            current_content=current_content,
+            suggestion=suggestion,
+            language=language,
+            tone=tone,
+            context=context,
+        )
+        return await self.run_task(task=prompt)
@@ -0,0 +1,92 @@
+"""
+Shared prompt layout for the content generation agents.
+
+Every content prompt is laid out from most to least stable so that Ollama can reuse the
+KV cache of the prompt prefix across the seven section calls and across listings:
+
+1. CONTENT_SYSTEM_MESSAGE: identical for all content agents
+2. Static prefix: depends only on (language, tone)
+3. Section instructions: depend only on (section, language)
+4. Listing payload: property data, current content and suggestion, always last
+
+Batched prompts (see core.prompt_batcher) insert BATCH_INSTRUCTIONS after the section
+instructions and then list the payloads of several listings, each tagged with its ID.
+"""
+
+from typing import Dict
+from config.options import TONE_OPTIONS, LANGUAGE_OPTIONS
+
+CONTENT_SYSTEM_MESSAGE = (
+    "You are a real estate SEO and copywriting expert writing the sections of a property listing page. "
+    "Follow the section instructions exactly and only output the requested plain text string, "
+    "with no extra content, questions, options, explanations or formatting."
+)
+
+STATIC_PREFIX_TEMPLATES = {
+    "en": """Respond exclusively in {language_name}.
+Write with a {tone_name} tone. Tone details: {tone_description}
+Only use the facts given in the listing data. Do not invent or add features, amenities or numbers.
+Only output the requested text. Do not include any extra content, questions, options or explanations.""",
+    "es": """Responde exclusivamente en {language_name}.
+Escribe con un tono {tone_name}. Detalles del tono: {tone_description}
+Solo usa los datos proporcionados de la propiedad. No inventes ni agregues características, servicios o cifras.
+Solo proporciona el texto solicitado. No incluyas contenido adicional, preguntas, opciones o explicaciones.""",
+    "pt": """Responda exclusivamente em {language_name}.
+Escreva com um tom {tone_name}. Detalhes do tom: {tone_description}
+Use apenas os dados fornecidos da propriedade. Não invente nem adicione características, comodidades ou números.
+Apenas forneça o texto solicitado. Não inclua conteúdo extra, perguntas, opções ou explicações.""",
+}
+
+PAYLOAD_LABELS = {
+    "en": {
+        "property_data": "Property data",
+        "features": "Available features",
+        "neighborhood": "Neighborhood location",
+        "current_content": "Current content",
+        "suggestion": "Suggestion for improvement",
+    },
+    "es": {
+        "property_data": "Datos de la propiedad",
+        "features": "Características disponibles",
+        "neighborhood": "Ubicación del vecindario",
+        "current_content": "Contenido actual",
+        "suggestion": "Sugerencia de mejora",
+    },
+    "pt": {
+        "property_data": "Dados da propriedade",
+        "features": "Características disponíveis",
+        "neighborhood": "Localização do bairro",
+        "current_content": "Conteúdo atual",
+        "suggestion": "Sugestão de melhoria",
+    },
+}
+
+
+# Output format of a prompt covering several listings of the same section
+BATCH_INSTRUCTIONS = {
+    "en": """Write the section separately for each listing below; each listing starts with its ID in brackets.
+Each text must follow the instructions above on its own.
+Output only a JSON array with one object per listing, in the same order: [{"id": "L1", "text": "..."}]""",
+    "es": """Escribe la sección por separado para cada propiedad; cada propiedad empieza con su ID entre corchetes.
+Cada texto debe seguir por sí solo las instrucciones anteriores.
+Proporciona solo un array JSON con un objeto por propiedad, en el mismo orden: [{"id": "L1", "text": "..."}]""",
+    "pt": """Escreva a seção separadamente para cada propriedade; cada propriedade começa com o seu ID entre colchetes.
+Cada texto deve seguir sozinho as instruções acima.
+Forneça apenas um array JSON com um objeto por propriedade, na mesma ordem: [{"id": "L1", "text": "..."}]""",
+}
+
+
+def build_static_prefix(language: str = "en", tone: str = "family-oriented") -> str:
+    """Render the (language, tone) instruction block shared by every section prompt."""
+    tone_options = TONE_OPTIONS.get(tone, {})
+    template = STATIC_PREFIX_TEMPLATES.get(language, STATIC_PREFIX_TEMPLATES["en"])
+    return template.format(
+        language_name=LANGUAGE_OPTIONS.get(language, {}).get("name", language),
+        tone_name=tone_options.get("name", tone),
+        tone_description=tone_options.get("description", ""),
+    )
+
+
+def get_payload_labels(language: str = "en") -> Dict[str, str]:
+    """Get the localized labels used in the listing payload block."""
+    return PAYLOAD_LABELS.get(language, PAYLOAD_LABELS["en"])
@@ -1,29 +1,28 @@
-from autogen_agentchat.agents import AssistantAgent
-from autogen_ext.models.ollama import OllamaChatCompletionClient
 from typing import Dict, Any, List
+from agents.base_agent import BaseLLMAgent
 import asyncio
 import json
 
 
-class FactCheckerAgent(AssistantAgent):
+class FactCheckerAgent(BaseLLMAgent):
     """Agent that verifies factual accuracy of content against property data."""
 
     def __init__(
         self,
-        name="fact_checker_agent",
-        model="gemma3n:e2b",
-        model_info={
+        name: str = "fact_checker_agent",
+        model: str = "gemma3n:e2b",
+        model_info: Dict[str, Any] = {
             "vision": False,
             "function_calling": False,
             "json_output": False,
             "family": "unknown",
             "structured_output": True,
         },
-    ):
-        model_client = OllamaChatCompletionClient(model=model, model_info=model_info)
+    ) -> None:
         super().__init__(
             name=name,
-            model_client=model_client,
+            model=model,
+            model_info=model_info,
             system_message="You are a real estate fact-checking expert. Compare content against property data to verify accuracy. Identify factual errors and inconsistencies. Always respond with valid JSON containing 'score' (0.0-1.0) and 'feedback' (a summary of findings).",
         )
 
@@ -39,11 +38,11 @@ class FactCheckerAgent(AssistantAgent):
             Standardized evaluation results dictionary
         """
         prompt = self.build_fact_checking_prompt(content=content, property_data=property_data)
-        response = await self.run(task=prompt)
+        response_text = await self.run_task(task=prompt)
 
         # Parse response (expecting JSON format)
         try:
-            result = json.loads(s=response.messages[-1].content.strip())
+            result = json.loads(s=response_text)
             score = float(result.get("score", 0.5))
             feedback = result.get("feedback", "No feedback available.")
         except (json.JSONDecodeError, ValueError, KeyError):
@@ -1,9 +1,16 @@
-from autogen_agentchat.agents import AssistantAgent
-from autogen_ext.models.ollama import OllamaChatCompletionClient
-from typing import Dict, Any, List
+from typing import Dict, Any, Optional, Tuple, Union
+from agents.base_agent import BaseLLMAgent
 import json
 import re
-from config.options import LANGUAGE_OPTIONS
+from core.property_context import PropertyContext
+from core.finding_router import compact_findings, format_findings, route_section_findings
+from config.options import IMPROVEMENT_OPTIONS
+
+# Sections the improvement instructions can target, in document order
+IMPROVEMENT_SECTIONS = ["title", "meta", "h1", "description", "key_features", "neighborhood", "call_to_action"]
+
+# Section keys the model may answer with instead of the agents' keys
+SECTION_ALIASES = {"meta_description": "meta"}
 
 # Language-specific prompts for improvement suggestions
 IMPROVEMENT_PROMPTS = {
@@ -33,16 +40,20 @@ IMPORTANT: For each section, you must include:
 
 You MUST respond with a valid JSON object in this EXACT format:
 {{
-  "title": "None" OR "Problem: [state the specific issue found for TITLE]. Fix: [provide clear instruction on how to resolve it]",
-  "meta_description": "None" OR "Problem: [state the specific issue found for META DESCRIPTION]. Fix: [provide clear instruction on how to resolve it]",
-  "h1": "None" OR "Problem: [state the specific issue found for H1]. Fix: [provide clear instruction on how to resolve it]",
-  "description": "None" OR "Problem: [state the specific issue found for DESCRIPTION]. Fix: [provide clear instruction on how to resolve it]",
-  "key_features": "None" OR "Problem: [state the specific issue found for KEY FEATURES]. Fix: [provide clear instruction on how to resolve it]",
-  "neighborhood": "None" OR "Problem: [state the specific issue found for NEIGHBORHOOD]. Fix: [provide clear instruction on how to resolve it]",
-  "call_to_action": "None" OR "Problem: [state the specific issue found for CALL TO ACTION]. Fix: [provide clear instruction on how to resolve it]"
+{response_format}
 }}
 
 CRITICAL: Only include problems that specifically belong to each section. Do not mix problems from different sections. Use "None" for sections with no identified issues.""",
+        "section_format": '  "{section}": "None" OR "Problem: [state the specific issue found for {label}]. Fix: [provide clear instruction on how to resolve it]"',
+        "section_labels": {
+            "title": "TITLE",
+            "meta": "META DESCRIPTION",
+            "h1": "H1",
+            "description": "DESCRIPTION",
+            "key_features": "KEY FEATURES",
+            "neighborhood": "NEIGHBORHOOD",
+            "call_to_action": "CALL TO ACTION",
+        },
     },
     "es": {
         "prompt": """Responde exclusivamente en {language_name}. Analiza los hallazgos de evaluación y extrae instrucciones específicas de mejora para cada sección de contenido. NO generes contenido nuevo, solo proporciona instrucciones claras sobre cómo solucionar los problemas identificados.
@@ -70,16 +81,20 @@ IMPORTANTE: Para cada sección, debes incluir:
 
 DEBES responder con un objeto JSON válido en este formato EXACTO:
 {{
-  "title": "None" O "Problema: [indica el problema específico encontrado para TÍTULO]. Solución: [proporciona instrucción clara sobre cómo resolverlo]",
-  "meta_description": "None" O "Problema: [indica el problema específico encontrado para META DESCRIPCIÓN]. Solución: [proporciona instrucción clara sobre cómo resolverlo]",
-  "h1": "None" O "Problema: [indica el problema específico encontrado para H1]. Solución: [proporciona instrucción clara sobre cómo resolverlo]",
-  "description": "None" O "Problema: [indica el problema específico encontrado para DESCRIPCIÓN]. Solución: [proporciona instrucción clara sobre cómo resolverlo]",
-  "key_features": "None" O "Problema: [indica el problema específico encontrado para CARACTERÍSTICAS CLAVE]. Solución: [proporciona instrucción clara sobre cómo resolverlo]",
-  "neighborhood": "None" O "Problema: [indica el problema específico encontrado para VECINDARIO]. Solución: [proporciona instrucción clara sobre cómo resolverlo]",
-  "call_to_action": "None" O "Problema: [indica el problema específico encontrado para LLAMADA A LA ACCIÓN]. Solución: [proporciona instrucción clara sobre cómo resolverlo]"
+{response_format}
 }}
 
 CRÍTICO: Solo incluye problemas que específicamente pertenezcan a cada sección. No mezcles problemas de diferentes secciones. Usa "None" para secciones sin problemas identificados.""",
+        "section_format": '  "{section}": "None" O "Problema: [indica el problema específico encontrado para {label}]. Solución: [proporciona instrucción clara sobre cómo resolverlo]"',
+        "section_labels": {
+            "title": "TÍTULO",
+            "meta": "META DESCRIPCIÓN",
+            "h1": "H1",
+            "description": "DESCRIPCIÓN",
+            "key_features": "CARACTERÍSTICAS CLAVE",
+            "neighborhood": "VECINDARIO",
+            "call_to_action": "LLAMADA A LA ACCIÓN",
+        },
     },
     "pt": {
         "prompt": """Responda exclusivamente em {language_name}. Analise os achados de avaliação e extraia instruções específicas de melhoria para cada seção de conteúdo. NÃO gere conteúdo novo, apenas forneça instruções claras sobre como resolver os problemas identificados.
@@ -107,21 +122,25 @@ IMPORTANTE: Para cada seção, você deve incluir:
 
 Você DEVE responder com um objeto JSON válido neste formato EXATO:
 {{
-  "title": "None" OU "Problema: [indique o problema específico encontrado para TÍTULO]. Solução: [forneça instrução clara sobre como resolvê-lo]",
-  "meta_description": "None" OU "Problema: [indique o problema específico encontrado para META DESCRIÇÃO]. Solução: [forneça instrução clara sobre como resolvê-lo]",
-  "h1": "None" OU "Problema: [indique o problema específico encontrado para H1]. Solução: [forneça instrução clara sobre como resolvê-lo]",
-  "description": "None" OU "Problema: [indique o problema específico encontrado para DESCRIÇÃO]. Solução: [forneça instrução clara sobre como resolvê-lo]",
-  "key_features": "None" OU "Problema: [indique o problema específico encontrado para CARACTERÍSTICAS CHAVE]. Solução: [forneça instrução clara sobre como resolvê-lo]",
-  "neighborhood": "None" OU "Problema: [indique o problema específico encontrado para VIZINHANÇA]. Solução: [forneça instrução clara sobre como resolvê-lo]",
-  "call_to_action": "None" OU "Problema: [indique o problema específico encontrado para CHAMADA PARA AÇÃO]. Solução: [forneça instrução clara sobre como resolvê-lo]"
+{response_format}
 }}
 
 CRÍTICO: Inclua apenas problemas que especificamente pertencem a cada seção. Não misture problemas de diferentes seções. Use "None" para seções sem problemas identificados.""",
+        "section_format": '  "{section}": "None" OU "Problema: [indique o problema específico encontrado para {label}]. Solução: [forneça instrução clara sobre como resolvê-lo]"',
+        "section_labels": {
+            "title": "TÍTULO",
+            "meta": "META DESCRIÇÃO",
+            "h1": "H1",
+            "description": "DESCRIÇÃO",
+            "key_features": "CARACTERÍSTICAS CHAVE",
+            "neighborhood": "VIZINHANÇA",
+            "call_to_action": "CHAMADA PARA AÇÃO",
+        },
     },
 }
 
 
-class ImprovementSuggestionAgent(AssistantAgent):
+class ImprovementSuggestionAgent(BaseLLMAgent):
     """
     Agent that takes evaluation results and provides specific improvement instructions
     for each content section of the HTML. The instructions are designed to be used
@@ -139,35 +158,64 @@ class ImprovementSuggestionAgent(AssistantAgent):
             "family": "unknown",
             "structured_output": True,
         },
+        max_findings: Optional[int] = None,
     ):
-        model_client = OllamaChatCompletionClient(model=model, model_info=model_info)
+        """
+        Initialize the agent.
+
+        Args:
+            name: Agent name
+            model: Ollama model to use
+            model_info: Model capabilities passed to the Ollama client
+            max_findings: Most severe findings kept in a prompt (IMPROVEMENT_OPTIONS["max_findings"] by default)
+        """
         super().__init__(
             name=name,
-            model_client=model_client,
+            model=model,
+            model_info=model_info,
             system_message="You are a multilingual content analysis expert for real estate listings. Given evaluation results, extract and parse the specific problems found and provide clear fix instructions for each content section based solely on evaluation findings. Always respond in the target language specified. Focus on addressing only the issues identified in the evaluation results. Do not generate new content, only provide instructions.",
         )
+        self.max_findings = IMPROVEMENT_OPTIONS["max_findings"] if max_findings is None else max_findings
+        # How often sections were fixed by rule instead of by the LLM
+        self.routing_stats = {"routed_sections": 0, "llm_sections": 0, "llm_calls": 0, "skipped_llm_calls": 0}
 
     async def generate_section_improvements(
         self,
-        current_content: str,
+        current_content: Union[str, Dict[str, str]],
         evaluation_results: Dict[str, Any],
         property_data: Dict[str, Any],
         language: str = "en",
         tone: str = "professional",
+        context: Optional[PropertyContext] = None,
     ) -> Dict[str, Dict[str, Any]]:
         """
         Generate specific improvement instructions for each HTML content section.
 
         Args:
-            current_content: Current HTML content
-            evaluation_results: Results from CompleteEvaluator
+            current_content: Current section texts keyed by section (only the affected ones are sent),
+                or the whole HTML content; ignored for per-section evaluation results
+            evaluation_results: Results from CompleteEvaluator.evaluate_html_complete, or from
+                CompleteEvaluator.evaluate_sections, in which case only the failed sections,
+                their text and their findings are sent
             property_data: Property data for context
             language: Target language code (en, es, pt)
             tone: Target tone
+            context: Shared per-listing PropertyContext (built from property_data if omitted)
 
         Returns:
             Dict with section-specific fix instructions
         """
+        routed_suggestions: Dict[str, Dict[str, Any]] = {}
+        if "sections" in evaluation_results:
+            # Known finding types become instructions directly; only free-text findings need the LLM
+            context = context or PropertyContext.build(property_data=property_data, language=language, tone=tone)
+            routed_suggestions, llm_sections = self._route_findings(
+                section_results=evaluation_results["sections"], language=language, language_name=context.language_name
+            )
+            if not llm_sections:
+                self.routing_stats["skipped_llm_calls"] += 1
+                return routed_suggestions
+            evaluation_results = dict(evaluation_results, sections=llm_sections)
 
         # Build comprehensive improvement prompt
         improvement_prompt = self._build_improvement_prompt(
@@ -176,63 +224,146 @@ class ImprovementSuggestionAgent(AssistantAgent):
             property_data=property_data,
             language=language,
             tone=tone,
+            context=context,
         )
 
         # Get AI-generated instructions
-        response = await self.run(task=improvement_prompt)
-        suggestions_text = response.messages[-1].content.strip()
+        self.routing_stats["llm_calls"] += 1
+        suggestions_text = await self.run_task(task=improvement_prompt)
 
         # Parse and structure the instructions
         structured_suggestions = self._parse_suggestions_response(
             suggestions_text=suggestions_text, evaluation_results=evaluation_results
         )
 
+        # Rule-based instructions come first; the LLM's instruction is appended when it found something
+        for section, routed in routed_suggestions.items():
+            llm_suggestion = structured_suggestions.get(section, {}).get("suggestion", "None")
+            if llm_suggestion.strip().lower() != "none":
+                routed = {"suggestion": f"{routed['suggestion']} {llm_suggestion}"}
+            structured_suggestions[section] = routed
+
         return structured_suggestions
 
+    def _route_findings(
+        self, section_results: Dict[str, Dict[str, Any]], language: str, language_name: str
+    ) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """
+        Split failed sections into rule-based suggestions and what is left for the LLM.
+
+        Returns:
+            Suggestions for the sections with routable findings, and the failed section results
+            (reduced to their unrouted findings) that still need the LLM
+        """
+        routed_suggestions = {}
+        llm_sections = {}
+        for section, result in section_results.items():
+            if result.get("passed", True):
+                continue
+            instructions, unrouted = route_section_findings(
+                section_result=dict(result, section=section), language=language, language_name=language_name
+            )
+            if instructions:
+                routed_suggestions[section] = {"suggestion": " ".join(instructions)}
+                self.routing_stats["routed_sections"] += 1
+            if unrouted:
+                llm_sections[section] = dict(result, findings=unrouted)
+                self.routing_stats["llm_sections"] += 1
+        return routed_suggestions, llm_sections
+
+    def get_routing_stats(self) -> Dict[str, int]:
+        """Get how many sections and calls were handled by rules versus the LLM."""
+        return dict(self.routing_stats)
+
     def _build_improvement_prompt(
         self,
-        current_content: str,
+        current_content: Union[str, Dict[str, str]],
         evaluation_results: Dict[str, Any],
         property_data: Dict[str, Any],
         language: str,
         tone: str,
+        context: Optional[PropertyContext] = None,
     ) -> str:
-        """Build comprehensive prompt for improvement instructions."""
+        """
+        Build the prompt for improvement instructions.
 
-        # Get language name from language code
-        language_name = LANGUAGE_OPTIONS.get(language, {}).get("name", language)
+        Findings are normalized, deduplicated, ranked by severity and cut to the top max_findings,
+        and only the text of the sections they affect is included.
+        """
+        context = context or PropertyContext.build(property_data=property_data, language=language, tone=tone)
 
-        # Format scores
-        seo_score = evaluation_results.get("seo", {}).get("score", 0.0)
-        language_score = evaluation_results.get("language_match", {}).get("score", 0.0)
-        tone_score = evaluation_results.get("tone_match", {}).get("score", 0.0)
-        scores_text = f"SEO: {seo_score:.2f}, Language: {language_score:.2f}, Tone: {tone_score:.2f}\n"
+        # Get language name from language code
+        language_name = context.language_name
+
+        templates = IMPROVEMENT_PROMPTS.get(language, IMPROVEMENT_PROMPTS["en"])
+
+        if "sections" in evaluation_results:
+            # Per-section results: only the sections that failed are discussed
+            section_results = {
+                section: result for section, result in evaluation_results["sections"].items() if not result["passed"]
+            }
+            target_sections = [section for section in IMPROVEMENT_SECTIONS if section in section_results]
+            scores_text = "\n".join(
+                f"{section}: "
+                + ", ".join(
+                    f"{check} {result.get('score', 0.0):.2f}"
+                    for check, result in section_results[section]["evaluations"].items()
+                )
+                for section in target_sections
+            )
+            current_content = {section: section_results[section]["content"] for section in target_sections}
+            findings = compact_findings(
+                findings=[
+                    dict(finding, section=section)
+                    for section in target_sections
+                    for finding in section_results[section]["findings"]
+                ],
+                max_findings=self.max_findings,
+            )
+        else:
+            # Format scores
+            seo_score = evaluation_results.get("seo", {}).get("score", 0.0)
+            language_score = evaluation_results.get("language_match", {}).get("score", 0.0)
+            tone_score = evaluation_results.get("tone_match", {}).get("score", 0.0)
+            scores_text = f"SEO: {seo_score:.2f}, Language: {language_score:.2f}, Tone: {tone_score:.2f}\n"
+
+            findings = compact_findings(
+                findings=evaluation_results.get("all_findings", []), max_findings=self.max_findings
+            )
+            affected = {finding["section"] for finding in findings}
+            # Findings not tied to a section (e.g. tone of the whole text) concern every section
+            target_sections = (
+                [section for section in IMPROVEMENT_SECTIONS if section in affected]
+                if findings and "document" not in affected
+                else IMPROVEMENT_SECTIONS
+            )
 
         # Format issues
-        all_issues = evaluation_results.get("all_findings", [])
-        issues_text = "\n".join([f"  - {issue}" for issue in all_issues])
-
-        # Get language-specific prompt template
-        prompt_template = IMPROVEMENT_PROMPTS.get(language, IMPROVEMENT_PROMPTS["en"])["prompt"]
-        print(
-            prompt_template.format(
-                language_name=language_name,
-                property_data=json.dumps(obj=property_data, indent=2),
-                tone=tone,
-                scores_text=scores_text,
-                current_content=current_content,
-                issues_text=issues_text,
+        issues_text = format_findings(findings=findings)
+        if isinstance(current_content, dict):
+            current_content = "\n".join(
+                f"{section}: {current_content[section]}" for section in target_sections if section in current_content
             )
+
+        response_format = ",\n".join(
+            templates["section_format"].format(section=section, label=templates["section_labels"][section])
+            for section in target_sections
         )
 
-        return prompt_template.format(
+        # Get language-specific prompt template
+        prompt = templates["prompt"].format(
             language_name=language_name,
-            property_data=json.dumps(obj=property_data, indent=2),
+            # Compact, localized listing facts instead of pretty-printed JSON
+            property_data=context.property_facts,
             tone=tone,
             scores_text=scores_text,
             current_content=current_content,
             issues_text=issues_text,
+            response_format=response_format,
         )
+        print(prompt)
+
+        return prompt
 
     def _parse_suggestions_response(
         self, suggestions_text: str, evaluation_results: Dict[str, Any]
@@ -258,6 +389,7 @@ class ImprovementSuggestionAgent(AssistantAgent):
 
                 # Convert to our expected format
                 for section_key, instruction_text in suggestions_json.items():
+                    section_key = SECTION_ALIASES.get(section_key, section_key)
                     if instruction_text and instruction_text.strip():  # Only include non-empty instructions
                         # Check if it's "None" or actual instruction
                         instruction_clean = instruction_text.strip()
@@ -321,9 +453,9 @@ class ImprovementSuggestionAgent(AssistantAgent):
                 section_mapping = {
                     "título": "title",
                     "title": "title",
-                    "meta descripción": "meta_description",
-                    "meta description": "meta_description",
-                    "meta descrição": "meta_description",
+                    "meta descripción": "meta",
+                    "meta description": "meta",
+                    "meta descrição": "meta",
                     "h1": "h1",
                     "descripción": "description",
                     "description": "description",
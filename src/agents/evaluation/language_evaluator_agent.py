@@ -1,10 +1,9 @@
-from autogen_agentchat.agents import AssistantAgent
-from autogen_ext.models.ollama import OllamaChatCompletionClient
 from typing import Dict, Any
+from agents.base_agent import BaseLLMAgent
 import asyncio
 
 
-class LanguageEvaluatorAgent(AssistantAgent):
+class LanguageEvaluatorAgent(BaseLLMAgent):
     """LLM-based agent for evaluating if content matches the expected language."""
 
     def __init__(
@@ -19,10 +18,10 @@ class LanguageEvaluatorAgent(AssistantAgent):
             "structured_output": True,
         },
     ):
-        model_client = OllamaChatCompletionClient(model=model, model_info=model_info)
         super().__init__(
             name=name,
-            model_client=model_client,
+            model=model,
+            model_info=model_info,
             system_message="You are a language detection expert. You evaluate if text content matches the expected language. Always respond with only a score from 0 to 100, where 100 means perfect language match and 0 means completely wrong language.",
         )
 
@@ -51,12 +50,10 @@ Output:"""
             Standardized evaluation results dictionary
         """
         prompt = self.build_evaluation_prompt(content=content, expected_language=expected_language)
-        response = await self.run(task=prompt)
+        response_text = await self.run_task(task=prompt)
 
         try:
             # Extract score from response
-            response_text = response.messages[-1].content.strip()
-
             if "YES" in response_text:
 
                 score = 1.0
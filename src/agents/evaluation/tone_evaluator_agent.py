@@ -1,10 +1,9 @@
-from autogen_agentchat.agents import AssistantAgent
-from autogen_ext.models.ollama import OllamaChatCompletionClient
 from typing import Dict, Any
+from agents.base_agent import BaseLLMAgent
 from config.options import TONE_OPTIONS
 
 
-class ToneEvaluatorAgent(AssistantAgent):
+class ToneEvaluatorAgent(BaseLLMAgent):
     """Agent that evaluates tone and style appropriateness for real estate content."""
 
     def __init__(
@@ -19,10 +18,10 @@ class ToneEvaluatorAgent(AssistantAgent):
             "structured_output": True,
         },
     ):
-        model_client = OllamaChatCompletionClient(model=model, model_info=model_info)
         super().__init__(
             name=name,
-            model_client=model_client,
+            model=model,
+            model_info=model_info,
             system_message="You are a real estate content expert. Evaluate the tone, style, and appropriateness of real estate content. Provide a score from 0.0 to 1.0 and specific feedback on tone quality. Only output a JSON with 'score' and 'feedback' fields.",
         )
 
@@ -38,18 +37,17 @@ class ToneEvaluatorAgent(AssistantAgent):
             Standardized evaluation results dictionary
         """
         prompt = self.build_tone_prompt(content=content, expected_tone=expected_tone)
-        response = await self.run(task=prompt)
+        response_text = await self.run_task(task=prompt)
 
         # Parse response (expecting JSON format)
         try:
             import json
 
-            result = json.loads(s=response.messages[-1].content.strip())
+            result = json.loads(s=response_text)
             score = float(result.get("score", 0.5))
             feedback = result.get("feedback", "No feedback available")
         except (json.JSONDecodeError, ValueError, KeyError):
             # Fallback parsing
-            response_text = response.messages[-1].content.strip()
             score = self._extract_score_from_text(text=response_text)
             feedback = "Tone evaluation completed"
 
@@ -0,0 +1,86 @@
+"""
+Compare per-listing and cross-listing batched drafts of the short sections (title, meta, H1).
+
+Every listing in data/property_*_data.json is replicated `--copies` times and the initial draft of
+each short section is requested for all of them at once, first with one prompt per listing, then
+through a PromptBatcher that packs up to `--max-listings` listings in one prompt. Wall time, LLM
+calls and the items that had to be retried are reported per mode.
+
+Usage:
+    uv run src/benchmarks/batch_prompt_benchmark.py --model gemma3n:e2b --language en --tone luxury --copies 4
+"""
+
+import argparse
+import asyncio
+import glob
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from core.html_generator import HTMLGenerator  # noqa: E402
+from core.prompt_batcher import PromptBatcher  # noqa: E402
+
+SECTIONS = ("title", "meta", "h1")
+
+
+async def run_mode(
+    model: str, listings: List[Dict[str, Any]], language: str, tone: str, batcher: Optional[PromptBatcher] = None
+) -> Dict[str, float]:
+    """Draft the short sections of every listing concurrently, per listing or through the batcher."""
+    agents = HTMLGenerator(model=model).agents
+    jobs = []
+    for section in SECTIONS:
+        agent = agents[section]
+        for property_data in listings:
+            if batcher is None:
+                jobs.append(agent.generate_initial(property_data=property_data, language=language, tone=tone))
+            else:
+                jobs.append(
+                    batcher.generate_initial(
+                        agent=agent, section=section, property_data=property_data, language=language, tone=tone
+                    )
+                )
+    start = time.perf_counter()
+    await asyncio.gather(*jobs)
+    elapsed = time.perf_counter() - start
+    if batcher is None:
+        calls, retried = len(jobs), 0
+    else:
+        stats = batcher.get_stats()
+        calls, retried = stats["batched_calls"] + stats["single_calls"], stats["retried_items"]
+    return {"drafts": len(jobs), "calls": calls, "retried_items": retried, "wall_seconds": elapsed}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="gemma3n:e2b")
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--tone", default="family-oriented")
+    parser.add_argument("--copies", type=int, default=4, help="Copies of each sample listing")
+    parser.add_argument("--max-listings", type=int, default=8, help="Listings per batched prompt")
+    args = parser.parse_args()
+
+    data_dir = os.path.join(os.path.dirname(__file__), "..", "..", "data")
+    listings = []
+    for path in sorted(glob.glob(os.path.join(data_dir, "property_*_data.json"))):
+        with open(file=path) as f:
+            property_data = json.load(fp=f)
+        # Copies differ in price so identical prompts are not coalesced into one call
+        listings.extend({**property_data, "price": (property_data.get("price") or 0) + copy} for copy in range(args.copies))
+
+    results = {
+        "per_listing": await run_mode(args.model, listings, args.language, args.tone),
+        "batched": await run_mode(
+            args.model, listings, args.language, args.tone, batcher=PromptBatcher(max_listings=args.max_listings)
+        ),
+    }
+    print(json.dumps(obj=results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main=main())
@@ -0,0 +1,105 @@
+"""
+Compare the n-gram language check with the spellchecker-based one on accuracy and speed.
+
+Every labeled sample is checked against each of the three target languages: a check is correct
+when it passes for the sample's own language and fails for the other two. "false_refinements"
+counts samples in the right language that the check still flags with a language_mismatch finding,
+which is what starts a refinement round. The samples are listing-style texts full of street names,
+neighborhoods and numbers, plus the sections of the example listings in data/.
+
+Usage:
+    uv run src/benchmarks/language_id_benchmark.py --repeat 200
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from config.options import get_language_name  # noqa: E402
+from core.listing_document import ListingDocument, strip_tags  # noqa: E402
+from evaluate.language import LanguageMatchEvaluator2, NgramLanguageMatchEvaluator  # noqa: E402
+
+# Held-out samples (not part of LANGUAGE_SAMPLES)
+SAMPLES: List[Tuple[str, str]] = [
+    ("en", "Charming 2-bedroom flat in Campo de Ourique, Lisbon, 85 m² on the 3rd floor of Rua Ferreira Borges."),
+    ("en", "Located on Calle de Serrano 47 in Salamanca, Madrid, steps from El Retiro and Goya metro."),
+    ("en", "Enjoy sweeping views of Baía de Guanabara from this Copacabana penthouse, 240 m² with pool."),
+    ("en", "Book a viewing today and let us show you this gem in Príncipe Real."),
+    ("en", "A quiet family home near Parque das Nações with 4 bedrooms, 3 bathrooms and a double garage."),
+    ("en", "Freshly painted, with oak floors, a gas hob and fitted wardrobes throughout."),
+    ("es", "Encantador piso de 2 dormitorios en Campo de Ourique, Lisboa, 85 m² en la 3ª planta de la Rua Ferreira Borges."),
+    ("es", "Situado en la calle de Serrano 47, barrio de Salamanca, a pocos pasos de El Retiro y del metro Goya."),
+    ("es", "Disfrute de las vistas a la Baía de Guanabara desde este ático en Copacabana, 240 m² con piscina."),
+    ("es", "Reserve hoy su visita y déjenos enseñarle esta joya en Príncipe Real."),
+    ("es", "Una casa familiar tranquila junto al Parque das Nações con 4 dormitorios, 3 baños y garaje doble."),
+    ("es", "Recién pintado, con suelos de roble, placa de gas y armarios empotrados en todas las estancias."),
+    ("pt", "Encantador T2 em Campo de Ourique, Lisboa, 85 m² no 3.º andar da Rua Ferreira Borges."),
+    ("pt", "Situado na Calle de Serrano 47, no bairro de Salamanca, a dois passos de El Retiro e do metro Goya."),
+    ("pt", "Desfrute da vista sobre a Baía de Guanabara nesta cobertura em Copacabana, 240 m² com piscina."),
+    ("pt", "Marque hoje a sua visita e deixe-nos mostrar-lhe esta joia no Príncipe Real."),
+    ("pt", "Uma moradia familiar sossegada junto ao Parque das Nações com 4 quartos, 3 casas de banho e garagem dupla."),
+    ("pt", "Acabado de pintar, com soalho de carvalho, placa a gás e roupeiros embutidos em todas as divisões."),
+]
+
+
+def listing_samples(data_dir: str) -> List[Tuple[str, str]]:
+    """Get the visible sections of the example listings, labeled with their <html lang>."""
+    samples = []
+    for path in sorted(glob.glob(os.path.join(data_dir, "property_*_listing.html"))):
+        with open(file=path) as f:
+            html_content = f.read()
+        language = html_content.split('lang="', 1)[1].split('"', 1)[0]
+        for element in ("<h1>", '<section id="description">', '<ul id="key-features">', '<p class="call-to-action">'):
+            if element in html_content:
+                closing = "</" + element[1:].split(" ", 1)[0].rstrip(">") + ">"
+                samples.append((language, strip_tags(html_content.split(element, 1)[1].split(closing, 1)[0])))
+    return samples
+
+
+def run_method(evaluator: Any, samples: List[Tuple[str, str]], repeat: int) -> Dict[str, Any]:
+    """Check every sample against every target language and time the checks."""
+    checks, correct, false_refinements = 0, 0, 0
+    elapsed = 0.0
+    for label, text in samples:
+        document = ListingDocument.from_text(text=text)
+        # Tokenize outside the timed region: both methods read the same cached tokens
+        document.tokens
+        for target in ("en", "es", "pt"):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                result = evaluator.evaluate(
+                    document=document, language_code=target, target_language=get_language_name(code=target)
+                )
+            elapsed += time.perf_counter() - start
+            checks += 1
+            correct += int(result["passed"] == (target == label))
+            false_refinements += int(target == label and bool(result["findings"]))
+    return {
+        "checks": checks,
+        "accuracy": correct / checks,
+        "false_refinements": false_refinements,
+        "us_per_check": 1e6 * elapsed / (checks * repeat),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=50, help="Timed repetitions per check")
+    args = parser.parse_args()
+
+    data_dir = os.path.join(os.path.dirname(__file__), "..", "..", "data")
+    samples = SAMPLES + listing_samples(data_dir=data_dir)
+    methods = {"spellchecker": LanguageMatchEvaluator2(), "ngram": NgramLanguageMatchEvaluator()}
+    results = {name: run_method(evaluator, samples, args.repeat) for name, evaluator in methods.items()}
+    print(json.dumps(obj=dict(samples=len(samples), **results), indent=2))
+
+
+if __name__ == "__main__":
+    main()
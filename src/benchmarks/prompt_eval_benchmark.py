@@ -0,0 +1,105 @@
+"""
+Measure Ollama prompt-eval time for the content prompts before and after the shared-prefix layout.
+
+The "legacy" layout mimics the previous prompts: one system message per agent and the listing
+data placed ahead of the section instructions. The "prefix" layout is the current one: shared
+system message, (language, tone) prefix, section instructions and the listing payload last.
+Both layouts are sent sequentially for every section of every listing, and the timing fields
+returned by Ollama (prompt_eval_count, prompt_eval_duration) are aggregated per layout.
+
+Usage:
+    uv run src/benchmarks/prompt_eval_benchmark.py --model gemma3n:e2b --language en --tone luxury
+"""
+
+import argparse
+import asyncio
+import glob
+import json
+import os
+import sys
+from typing import Any, Dict, List
+
+import ollama
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from agents.content_generation.prompts import build_static_prefix  # noqa: E402
+from core.html_generator import HTMLGenerator  # noqa: E402
+from core.property_context import PropertyContext  # noqa: E402
+
+# System messages used by each agent before the shared-prefix layout
+LEGACY_SYSTEM_MESSAGES = {
+    "title": "You are a real estate SEO expert. Only output a single plain title string for the property, under 60 characters, with no extra content, questions, or options. Do not include any explanations or formatting beyond the required string.",
+    "meta": "You are a real estate SEO expert. Only output a single plain meta description string for the property, under 155 characters, with no extra content, questions, or options. Do not include any explanations or formatting beyond the required string.",
+    "h1": "You are a real estate SEO expert. Only output a single plain headline string for the property, with no extra content, questions, or options. Do not include any explanations or formatting beyond the required string.",
+    "description": "You are a real estate copywriting expert. Only output a single plain description string for the property, between 500 and 700 characters, with no extra content, questions, or options. Do not include any explanations or formatting beyond the required string.",
+    "key_features": "You are a real estate copywriting expert. Generate 3-5 key property features as a simple list, with each feature on a new line. Start each line with a hyphen (-). Only use features that are explicitly provided in the property data. Do not invent or hallucinate features.",
+    "neighborhood": "You are a real estate copywriting expert. Only output a single plain paragraph string about the neighborhood for the property, with no extra content, questions, or options. Do not include any explanations or formatting beyond the required string.",
+    "call_to_action": "You are a real estate copywriting expert. Only output a single plain call-to-action string for the property, with no extra content, questions, or options. Do not include any explanations or formatting beyond the required string.",
+}
+
+
+def build_messages(agent: Any, section: str, property_data: Dict[str, Any], language: str, tone: str, layout: str):
+    """Build the chat messages for one section call in the requested layout."""
+    if layout == "prefix":
+        return [
+            {"role": "system", "content": agent.system_message},
+            {"role": "user", "content": agent.build_user_prompt(property_data=property_data, language=language, tone=tone)},
+        ]
+    instructions = agent.PROMPTS.get(language, agent.PROMPTS["en"])["initial"]
+    payload = agent.build_payload(
+        context=PropertyContext.build(property_data=property_data, language=language, tone=tone)
+    )
+    return [
+        {"role": "system", "content": LEGACY_SYSTEM_MESSAGES[section]},
+        {"role": "user", "content": f"{payload}\n\n{build_static_prefix(language=language, tone=tone)}\n\n{instructions}"},
+    ]
+
+
+async def run_layout(
+    client: ollama.AsyncClient, model: str, listings: List[Dict[str, Any]], language: str, tone: str, layout: str
+) -> Dict[str, float]:
+    """Send every section prompt of every listing and aggregate Ollama's prompt timing fields."""
+    agents = HTMLGenerator(model=model).agents
+    calls, prompt_tokens, prompt_eval_ns = 0, 0, 0
+    for property_data in listings:
+        for section, agent in agents.items():
+            messages = build_messages(agent, section, property_data, language, tone, layout)
+            response = await client.chat(model=model, messages=messages, options={"num_predict": 1})
+            calls += 1
+            prompt_tokens += response.prompt_eval_count or 0
+            prompt_eval_ns += response.prompt_eval_duration or 0
+    return {
+        "calls": calls,
+        "evaluated_prompt_tokens": prompt_tokens,
+        "prompt_eval_ms_total": prompt_eval_ns / 1e6,
+        "prompt_eval_ms_per_call": prompt_eval_ns / 1e6 / max(1, calls),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="gemma3n:e2b")
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--tone", default="family-oriented")
+    parser.add_argument("--host", default=None)
+    args = parser.parse_args()
+
+    data_dir = os.path.join(os.path.dirname(__file__), "..", "..", "data")
+    listings = []
+    for path in sorted(glob.glob(os.path.join(data_dir, "property_*_data.json"))):
+        with open(file=path) as f:
+            listings.append(json.load(fp=f))
+
+    client = ollama.AsyncClient(host=args.host)
+    # Warm the model so load time does not leak into the first layout
+    await client.generate(model=args.model, prompt="")
+    results = {}
+    for layout in ("legacy", "prefix"):
+        results[layout] = await run_layout(client, args.model, listings, args.language, args.tone, layout)
+    print(json.dumps(obj=results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main=main())
@@ -2,6 +2,8 @@
 Configuration settings for language and tone options.
 """
 
+import os
+
 # Language options with their codes and full names
 LANGUAGE_OPTIONS = {
     "en": {"name": "English", "code": "en", "spell_check_code": "en"},
@@ -38,17 +40,128 @@ TONE_OPTIONS = {
 }
 
 # Model options with descriptions
+# speed_rank: lower is faster. Used by the draft/escalate cascade to pick the drafting model.
 MODEL_OPTIONS = {
     "gemma3n:e2b": {
         "name": "Gemma3n E2B",
         "description": "Recommended high-performance model with optimized efficiency",
+        "speed_rank": 1,
     },
     "gemma3:1b-it-qat": {
         "name": "Gemma3 1B IT QAT",
         "description": "Lightweight quantized model for faster inference",
+        "speed_rank": 0,
     },
 }
 
+# Ollama model residency scheduling (see core.model_scheduler)
+SCHEDULER_OPTIONS = {
+    "max_resident_models": int(os.getenv("MAX_RESIDENT_MODELS", "1")),
+    "max_batch_per_turn": int(os.getenv("MAX_BATCH_PER_TURN", "8")),
+    "ollama_host": os.getenv("OLLAMA_HOST", "http://localhost:11434"),
+}
+
+# Template fast path for key features and H1 (see core.section_templates): "off" uses the LLM agents,
+# "template" renders both sections without any LLM call and "fallback" renders them when their
+# LLM call fails.
+SECTION_TEMPLATE_OPTIONS = {
+    "mode": os.getenv("SECTION_TEMPLATES", "off"),
+}
+
+# Cross-listing prompt batching (see core.prompt_batcher): concurrent initial drafts of these sections
+# with the same language, tone and model share one prompt of up to max_listings listings.
+PROMPT_BATCHING_OPTIONS = {
+    "enabled": os.getenv("PROMPT_BATCHING", "false").lower() == "true",
+    "sections": tuple(os.getenv("PROMPT_BATCHING_SECTIONS", "title,meta,h1").split(",")),
+    "max_listings": int(os.getenv("PROMPT_BATCHING_MAX_LISTINGS", "8")),
+    "max_wait_ms": float(os.getenv("PROMPT_BATCHING_MAX_WAIT_MS", "50")),
+    "max_retries": int(os.getenv("PROMPT_BATCHING_MAX_RETRIES", "1")),
+}
+
+# Best-of-N sampling (see core.best_of_n): each section is drafted `candidates` times concurrently with
+# temperatures spread between min_temperature and max_temperature, the best candidate by the local
+# checks is kept and only sections where no candidate passes go through LLM refinement.
+BEST_OF_N_OPTIONS = {
+    "enabled": os.getenv("BEST_OF_N", "false").lower() == "true",
+    "candidates": int(os.getenv("BEST_OF_N_CANDIDATES", "4")),
+    "min_temperature": float(os.getenv("BEST_OF_N_MIN_TEMPERATURE", "0.3")),
+    "max_temperature": float(os.getenv("BEST_OF_N_MAX_TEMPERATURE", "1.0")),
+}
+
+# In-flight deduplication of identical concurrent work (see core.single_flight): "generations" joins
+# duplicate HTMLGenerator.generate_html calls, "prompts" joins identical agent prompts to the same model.
+COALESCING_OPTIONS = {
+    "generations": os.getenv("COALESCE_GENERATIONS", "true").lower() == "true",
+    "prompts": os.getenv("COALESCE_PROMPTS", "true").lower() == "true",
+}
+
+# Improvement prompt size (see agents.evaluation.improvement_suggestion_agent)
+IMPROVEMENT_OPTIONS = {
+    "max_findings": int(os.getenv("IMPROVEMENT_MAX_FINDINGS", "8")),
+}
+
+# Evaluator cascade (see evaluate.complete_evaluator). Once a cheaper section check has failed the
+# section will be refined anyway: "never" still runs every check, "llm" skips the LLM checks and
+# "always" skips every remaining check.
+EVALUATION_OPTIONS = {
+    "short_circuit": os.getenv("EVALUATION_SHORT_CIRCUIT", "llm"),
+}
+
+# Language check (see evaluate.language): "ngram" uses the character n-gram identifier and passes
+# from min_probability for the target language; "spellchecker" uses the share of unknown words.
+LANGUAGE_MATCH_OPTIONS = {
+    "method": os.getenv("LANGUAGE_MATCH_METHOD", "ngram"),
+    "min_probability": float(os.getenv("LANGUAGE_MIN_PROBABILITY", "0.5")),
+}
+
+# Compiled, memory-mapped spell dictionaries shared by worker processes (see evaluate.spell_dictionary)
+SPELL_DICTIONARY_OPTIONS = {
+    "directory": os.getenv(
+        "SPELL_DICTIONARY_DIR", os.path.join(os.path.expanduser("~"), ".cache", "real-estate-content-generator")
+    ),
+}
+
+# Neighborhood sections shared across listings (see core.neighborhood_store): each (city, neighborhood,
+# language, tone, model) collects `variants` evaluated sections, then serves them until they are
+# older than max_age_days. Opt-in: it writes to disk and serves text from earlier runs.
+NEIGHBORHOOD_STORE_OPTIONS = {
+    "enabled": os.getenv("NEIGHBORHOOD_STORE", "false").lower() == "true",
+    "path": os.getenv(
+        "NEIGHBORHOOD_STORE_PATH",
+        os.path.join(os.path.expanduser("~"), ".cache", "real-estate-content-generator", "neighborhoods.sqlite3"),
+    ),
+    "variants": int(os.getenv("NEIGHBORHOOD_STORE_VARIANTS", "3")),
+    "max_age_days": float(os.getenv("NEIGHBORHOOD_STORE_MAX_AGE_DAYS", "30")),
+}
+
+# Pre-generated call-to-action variants (see core.cta_pool), written by `python -m core.cta_pool`. A
+# listing tries up to max_tries pooled variants against its local checks before the LLM drafts one.
+CTA_POOL_OPTIONS = {
+    "enabled": os.getenv("CTA_POOL", "true").lower() == "true",
+    "path": os.getenv(
+        "CTA_POOL_PATH",
+        os.path.join(os.path.expanduser("~"), ".cache", "real-estate-content-generator", "cta_pool.json"),
+    ),
+    "max_tries": int(os.getenv("CTA_POOL_MAX_TRIES", "3")),
+}
+
+# Process pool for the CPU-bound checks of batch runs (see evaluate.batch_evaluator); 0 workers means
+# one per core. "spawn" avoids forking a process that already runs an event loop and client threads.
+BATCH_EVALUATION_OPTIONS = {
+    "max_workers": int(os.getenv("BATCH_EVALUATION_WORKERS", "0")),
+    "start_method": os.getenv("BATCH_EVALUATION_START_METHOD", "spawn"),
+}
+
+# Lexicon tone pre-classifier (see evaluate.tone). Local scores inside [uncertain_low, uncertain_high)
+# go to the LLM tone evaluator; audit_rate is the share of confident decisions also sent to the LLM
+# to measure agreement outside the band.
+TONE_CLASSIFIER_OPTIONS = {
+    "uncertain_low": float(os.getenv("TONE_UNCERTAIN_LOW", "0.35")),
+    "uncertain_high": float(os.getenv("TONE_UNCERTAIN_HIGH", "0.65")),
+    "min_evidence": float(os.getenv("TONE_MIN_EVIDENCE", "1.0")),
+    "audit_rate": float(os.getenv("TONE_AUDIT_RATE", "0.0")),
+}
+
 
 def get_language_options():
     """Get list of language options for dropdowns."""
@@ -73,3 +186,8 @@ def get_language_name(code: str) -> str:
 def get_tone_name(code: str) -> str:
     """Get tone name from code."""
     return TONE_OPTIONS.get(code, {}).get("name", "Professional")
+
+
+def get_fastest_model() -> str:
+    """Get the code of the fastest model in MODEL_OPTIONS (lowest speed_rank)."""
+    return min(MODEL_OPTIONS, key=lambda code: MODEL_OPTIONS[code].get("speed_rank", 0))
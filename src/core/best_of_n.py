@@ -0,0 +1,113 @@
+"""
+Best-of-N parallel sampling of section drafts.
+
+The section pipeline improves a draft serially: evaluate, ask for a suggestion, refine, evaluate
+again. With Ollama serving parallel requests it is usually faster to draft the section N times at
+once, each with its own temperature and seed, score every candidate with the local checks (no LLM
+call) and keep the best one. Only when no candidate passes does the section go through the usual
+LLM refinement, starting from the best scored candidate.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from config.options import BEST_OF_N_OPTIONS
+
+
+class BestOfNSampler:
+    """Draft N candidates of a section concurrently and keep the best by evaluation."""
+
+    def __init__(self, candidates: int = 4, min_temperature: float = 0.3, max_temperature: float = 1.0):
+        """
+        Initialize the sampler.
+
+        Args:
+            candidates: Drafts per section
+            min_temperature: Temperature of the first candidate
+            max_temperature: Temperature of the last candidate; the others are spread evenly in between
+        """
+        if candidates < 1:
+            raise ValueError("candidates must be at least 1")
+        if min_temperature > max_temperature:
+            raise ValueError("min_temperature must not exceed max_temperature")
+        self.candidates = candidates
+        self.min_temperature = min_temperature
+        self.max_temperature = max_temperature
+
+        # Metrics
+        self._sections = 0
+        self._passed = 0
+        self._drafts = 0
+        self._duplicates = 0
+
+    def sampling_options(self) -> List[Dict[str, Any]]:
+        """Get the Ollama options of each candidate: evenly spread temperatures and distinct seeds."""
+        step = (self.max_temperature - self.min_temperature) / max(1, self.candidates - 1)
+        return [
+            {"temperature": round(self.min_temperature + index * step, 3), "seed": index}
+            for index in range(self.candidates)
+        ]
+
+    async def sample(
+        self,
+        draft: Callable[[Dict[str, Any]], Awaitable[str]],
+        evaluate: Callable[[str], Awaitable[Dict[str, Any]]],
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Draft every candidate, evaluate the distinct ones and pick the best.
+
+        Args:
+            draft: Drafts one candidate with the given sampling options
+            evaluate: Evaluates one candidate; returns a section result with "passed" and "score"
+
+        Returns:
+            The best passing candidate, or the best scored one when none passes, with its evaluation
+
+        Raises:
+            The first draft error when every draft failed
+        """
+        results = await asyncio.gather(*[draft(options) for options in self.sampling_options()], return_exceptions=True)
+        drafts = [result for result in results if isinstance(result, str) and result.strip()]
+        if not drafts:
+            errors = [result for result in results if isinstance(result, BaseException)]
+            raise errors[0] if errors else ValueError("Every sampled candidate was empty")
+        # Low temperatures often give the same text; evaluate it once
+        distinct = list(dict.fromkeys(drafts))
+        evaluations = await asyncio.gather(*[evaluate(candidate) for candidate in distinct])
+        # Passing candidates rank above failing ones, then by score; ties keep the lowest temperature
+        best = max(
+            range(len(distinct)),
+            key=lambda index: (evaluations[index]["passed"], evaluations[index].get("score", 0.0)),
+        )
+
+        self._sections += 1
+        self._passed += int(evaluations[best]["passed"])
+        self._drafts += len(drafts)
+        self._duplicates += len(drafts) - len(distinct)
+        return distinct[best], evaluations[best]
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get the sections sampled, those where a candidate passed, the drafts made and the duplicate drafts."""
+        return {
+            "sections": self._sections,
+            "passed": self._passed,
+            "drafts": self._drafts,
+            "duplicates": self._duplicates,
+        }
+
+
+_sampler: Optional[BestOfNSampler] = None
+
+
+def get_best_of_n_sampler() -> Optional[BestOfNSampler]:
+    """Get the process-wide sampler configured from BEST_OF_N_OPTIONS (None when disabled)."""
+    global _sampler
+    if not BEST_OF_N_OPTIONS["enabled"]:
+        return None
+    if _sampler is None:
+        _sampler = BestOfNSampler(
+            candidates=BEST_OF_N_OPTIONS["candidates"],
+            min_temperature=BEST_OF_N_OPTIONS["min_temperature"],
+            max_temperature=BEST_OF_N_OPTIONS["max_temperature"],
+        )
+    return _sampler
@@ -0,0 +1,200 @@
+"""
+Pre-generated, evaluated call-to-action variants per (language, tone, listing type).
+
+A call to action hardly depends on the listing: "Book your private viewing today" fits every
+luxury flat for sale. An offline job (build_call_to_action_pool, or `python -m core.cta_pool`)
+drafts candidates with CallToActionAgent for every (language, tone, listing type), evaluates them
+with every check, LLM tone check included, and keeps the best scored ones in a JSON file. At
+generation time a listing walks the pooled variants from an offset given by a hash of the listing,
+so pages do not all end the same way, and takes the first one that passes the listing's local
+checks; only when none passes is the CTA drafted by the LLM.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+from agents.content_generation.call_to_action_agent import CallToActionAgent
+from config.options import CTA_POOL_OPTIONS, LANGUAGE_OPTIONS, TONE_OPTIONS
+from core.listing_document import ListingDocument
+from core.neighborhood_store import listing_identity
+from evaluate.complete_evaluator import CompleteEvaluator
+
+LISTING_TYPES = ["sale", "rent"]
+DEFAULT_LISTING_TYPE = "sale"
+
+
+class CallToActionPool:
+    """Pooled call-to-action variants, best scored first, loaded from the file the offline job writes."""
+
+    def __init__(self, variants: Optional[Dict[str, Dict[str, Dict[str, List[Dict[str, Any]]]]]] = None):
+        """
+        Initialize the pool.
+
+        Args:
+            variants: {language: {tone: {listing_type: [{"text", "score"}, ...]}}}
+        """
+        self.variants = variants or {}
+
+        # Metrics
+        self._served = 0
+        self._rejected = 0
+        self._fallbacks = 0
+
+    @classmethod
+    def load(cls, path: str) -> "CallToActionPool":
+        """Load a pool written by save()."""
+        with open(file=path, encoding="utf-8") as f:
+            return cls(variants=json.load(f)["variants"])
+
+    def save(self, path: str, model: str) -> None:
+        """Write the pool atomically, recording the model that drafted it."""
+        os.makedirs(name=os.path.dirname(path) or ".", exist_ok=True)
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(file=temporary_path, mode="w", encoding="utf-8") as f:
+            json.dump({"model": model, "created_at": time.time(), "variants": self.variants}, f, ensure_ascii=False, indent=2)
+        os.replace(temporary_path, path)
+
+    def get_variants(self, language: str, tone: str, listing_type: str = DEFAULT_LISTING_TYPE) -> List[str]:
+        """Get the pooled texts of a key, best scored first."""
+        entries = self.variants.get(language, {}).get(tone, {}).get(listing_type, [])
+        return [entry["text"] for entry in entries]
+
+    def set_variants(self, language: str, tone: str, listing_type: str, entries: List[Dict[str, Any]]) -> None:
+        """Replace the variants of a key with [{"text", "score"}, ...] entries."""
+        ordered = sorted(entries, key=lambda entry: entry["score"], reverse=True)
+        self.variants.setdefault(language, {}).setdefault(tone, {})[listing_type] = ordered
+
+    def candidates(
+        self, property_data: Mapping[str, Any], language: str, tone: str, max_tries: Optional[int] = None
+    ) -> List[str]:
+        """
+        Get the variants a listing should try, in order.
+
+        Args:
+            property_data: Listing data; its identity (see listing_identity) sets the starting variant,
+                so edits such as a new price keep a listing's order while the pool is unchanged, and
+                different listings start at different variants
+            language: Target language code
+            tone: Target tone code
+            max_tries: Number of variants to return (all if omitted)
+
+        Returns:
+            Pooled texts starting at the listing's offset and wrapping around
+        """
+        listing_type = str(property_data.get("listing_type") or DEFAULT_LISTING_TYPE)
+        variants = self.get_variants(language=language, tone=tone, listing_type=listing_type)
+        if not variants:
+            return []
+        start = int(listing_identity(property_data)[:8], 16) % len(variants)
+        rotated = variants[start:] + variants[:start]
+        return rotated[:max_tries] if max_tries else rotated
+
+    def record(self, served: bool, rejected: int) -> None:
+        """Count one listing: whether a pooled variant was served and how many failed its checks."""
+        self._served += int(served)
+        self._fallbacks += int(not served)
+        self._rejected += rejected
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get the listings served from the pool, the variants rejected and the LLM fallbacks."""
+        return {"served": self._served, "rejected": self._rejected, "fallbacks": self._fallbacks}
+
+
+async def _build_key(
+    agent: CallToActionAgent, evaluator: CompleteEvaluator, language: str, tone: str, listing_type: str, candidates: int, keep: int
+) -> List[Dict[str, Any]]:
+    """Draft and evaluate the candidates of one key and return the best passing ones."""
+    property_data = {"listing_type": listing_type}
+    language_name = LANGUAGE_OPTIONS.get(language, {}).get("name", language)
+    entries: Dict[str, float] = {}
+    # Drafted one after the other: identical concurrent prompts would share one call
+    for _ in range(candidates):
+        text = await agent.generate_initial(property_data=property_data, language=language, tone=tone)
+        if not text or text in entries:
+            continue
+        evaluation = await evaluator.evaluate_section(
+            document=ListingDocument(sections={"call_to_action": text}, language=language),
+            section="call_to_action",
+            property_data=property_data,
+            language=language,
+            language_name=language_name,
+            tone=tone,
+        )
+        if evaluation["passed"]:
+            entries[text] = float(evaluation.get("score", 1.0))
+    best = sorted(entries.items(), key=lambda item: item[1], reverse=True)[:keep]
+    return [{"text": text, "score": score} for text, score in best]
+
+
+async def build_call_to_action_pool(
+    model: str,
+    languages: Optional[Sequence[str]] = None,
+    tones: Optional[Sequence[str]] = None,
+    listing_types: Optional[Sequence[str]] = None,
+    candidates: int = 8,
+    keep: int = 4,
+) -> CallToActionPool:
+    """
+    Draft, evaluate and keep call-to-action variants for every (language, tone, listing type).
+
+    Args:
+        model: Model drafting the candidates
+        languages: Language codes (all supported languages if omitted)
+        tones: Tone codes (all tones if omitted)
+        listing_types: Listing types (sale and rent if omitted)
+        candidates: Drafts per key
+        keep: Passing drafts kept per key, best scored first
+
+    Returns:
+        The pool; keys where no draft passed have no variants and always use the LLM
+    """
+    agent = CallToActionAgent(model=model)
+    evaluator = CompleteEvaluator(short_circuit="never")
+    keys = [
+        (language, tone, listing_type)
+        for language in languages or LANGUAGE_OPTIONS
+        for tone in tones or TONE_OPTIONS
+        for listing_type in listing_types or LISTING_TYPES
+    ]
+    results = await asyncio.gather(
+        *[_build_key(agent, evaluator, language, tone, listing_type, candidates, keep) for language, tone, listing_type in keys]
+    )
+    pool = CallToActionPool()
+    for (language, tone, listing_type), entries in zip(keys, results):
+        pool.set_variants(language=language, tone=tone, listing_type=listing_type, entries=entries)
+    return pool
+
+
+_pool: Optional[CallToActionPool] = None
+_pool_loaded = False
+
+
+def get_call_to_action_pool() -> Optional[CallToActionPool]:
+    """Get the process-wide pool from CTA_POOL_OPTIONS["path"] (None until the offline job has written it)."""
+    global _pool, _pool_loaded
+    if not _pool_loaded:
+        _pool_loaded = True
+        path = CTA_POOL_OPTIONS["path"]
+        if CTA_POOL_OPTIONS["enabled"] and os.path.exists(path):
+            try:
+                _pool = CallToActionPool.load(path=path)
+            except (OSError, ValueError, KeyError) as e:
+                logging.getLogger(__name__).warning(f"Could not load the call-to-action pool {path}: {e}")
+    return _pool
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-generate the call-to-action pool")
+    parser.add_argument("--model", default="gemma3n:e2b", help="Model drafting the candidates")
+    parser.add_argument("--candidates", type=int, default=8, help="Drafts per (language, tone, listing type)")
+    parser.add_argument("--keep", type=int, default=4, help="Passing drafts kept per key")
+    parser.add_argument("--path", default=CTA_POOL_OPTIONS["path"], help="Pool file to write")
+    args = parser.parse_args()
+    pool = asyncio.run(build_call_to_action_pool(model=args.model, candidates=args.candidates, keep=args.keep))
+    pool.save(path=args.path, model=args.model)
+    print(args.path)
@@ -0,0 +1,76 @@
+"""
+Field-level dependencies between property_data and the generated sections.
+
+Every content agent declares the property_data fields its prompts read (ContentAgent.DEPENDS_ON),
+as dotted paths such as "location.city", or "*" for agents whose payload carries every listing
+fact. When a listing changes, changed_fields() diffs the old and new data and only the sections
+whose agent reads a changed field have to be drafted again; the other sections are kept and only
+re-evaluated against the new data.
+"""
+
+from typing import Any, Iterable, List, Mapping, Set
+
+# Dependency matching any field
+ALL_FIELDS = "*"
+
+
+def changed_fields(old: Mapping[str, Any], new: Mapping[str, Any], prefix: str = "") -> Set[str]:
+    """
+    Get the dotted paths of the fields that differ between two versions of a listing.
+
+    Nested dicts are compared key by key, so a new price gives {"price"} and a renamed neighborhood
+    gives {"location.neighborhood"}; any other value (lists included) is compared as a whole.
+
+    Args:
+        old: Previous property data
+        new: Current property data
+        prefix: Path of the dicts being compared (used by the recursion)
+
+    Returns:
+        The changed, added and removed paths
+    """
+    changed = set()
+    for key in set(old) | set(new):
+        path = f"{prefix}{key}"
+        old_value, new_value = old.get(key), new.get(key)
+        if isinstance(old_value, Mapping) and isinstance(new_value, Mapping):
+            changed |= changed_fields(old=old_value, new=new_value, prefix=f"{path}.")
+        elif key not in old or key not in new or old_value != new_value:
+            changed.add(path)
+    return changed
+
+
+def _overlaps(dependency: str, path: str) -> bool:
+    """Whether a dependency covers a changed path or lies inside it ("location" vs "location.city")."""
+    return (
+        dependency == ALL_FIELDS
+        or dependency == path
+        or path.startswith(f"{dependency}.")
+        or dependency.startswith(f"{path}.")
+    )
+
+
+def depends_on_changes(dependencies: Iterable[str], changed: Iterable[str]) -> bool:
+    """Whether any of the declared dependencies is affected by the changed paths."""
+    changed = list(changed)
+    return any(_overlaps(dependency=dependency, path=path) for dependency in dependencies for path in changed)
+
+
+def affected_sections(
+    agents: Mapping[str, Any], old_property_data: Mapping[str, Any], new_property_data: Mapping[str, Any]
+) -> List[str]:
+    """
+    Get the sections whose agent reads a field that changed, in agent order.
+
+    Args:
+        agents: Content agents keyed by section, each with a DEPENDS_ON tuple
+        old_property_data: Property data the previous sections were generated from
+        new_property_data: Current property data
+
+    Returns:
+        Section names that have to be drafted again
+    """
+    changed = changed_fields(old=old_property_data, new=new_property_data)
+    if not changed:
+        return []
+    return [section for section, agent in agents.items() if depends_on_changes(agent.DEPENDS_ON, changed)]
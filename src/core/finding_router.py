@@ -0,0 +1,237 @@
+"""
+Deterministic routing of evaluation findings to per-section fix instructions.
+
+Most findings are mechanical (seokar length and structure issues, low readability, language or
+spelling scores) and map to a fixed instruction for a known section. Those are rendered here
+directly in the target language; only free-text findings such as tone feedback still need the
+improvement LLM.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# seokar element types and the section that owns them
+SEO_ELEMENT_SECTIONS = {
+    "Title": "title",
+    "Meta Description": "meta",
+    "H1 Tag": "h1",
+    "H1 Content": "h1",
+    "Headings Hierarchy": "h1",
+    "Content Readability": "description",
+    "Content Quality": "description",
+}
+
+# Severity ranks, most severe first; seokar levels and evaluator severities share one scale
+SEVERITY_RANKS = {"critical": 0, "error": 1, "high": 1, "warning": 2, "medium": 2, "info": 3, "low": 3}
+
+# seokar issue message -> rule
+SEO_MESSAGE_RULES = {
+    "Missing Title Tag": "missing",
+    "Title Too Short": "too_short",
+    "Title Too Long": "too_long",
+    "Missing Meta Description": "missing",
+    "Meta Description Too Short": "too_short",
+    "Meta Description Too Long": "too_long",
+    "Missing H1 Tag": "missing",
+    "Heading Structure Starts Incorrectly": "heading_structure",
+    "Skipped Heading Level": "heading_structure",
+    "No Main Content Text Extracted": "thin_content",
+    "Thin Content (Low Word Count)": "thin_content",
+    "Low Text-to-HTML Ratio": "thin_content",
+    "Very Low Readability Score": "readability",
+    "Low to Moderate Readability Score": "readability",
+}
+
+# Evaluator finding type -> rule
+FINDING_TYPE_RULES = {
+    "readability": "readability",
+    "language_mismatch": "language_mismatch",
+    "spelling": "spelling",
+    "fact": "fact",
+}
+
+# Optimal lengths used when a length finding does not carry its own details (same as seokar)
+LENGTH_LIMITS = {"title": (30, 60), "meta": (70, 160)}
+
+# Fix instruction of each rule, with a {label} placeholder for the section name
+ROUTER_INSTRUCTIONS: Dict[str, Dict[str, str]] = {
+    "en": {
+        "missing": "Problem: {label} is missing. Fix: add {label} to the listing.",
+        "too_short": "Problem: {label} is too short ({length} characters). Fix: expand it to {low}-{high} characters.",
+        "too_long": "Problem: {label} is too long ({length} characters). Fix: shorten it to {low}-{high} characters.",
+        "heading_structure": "Problem: the heading structure is incorrect. Fix: write one single plain-text main heading.",
+        "thin_content": "Problem: the page has too little text. Fix: expand {label} with more concrete details about the property.",
+        "readability": "Problem: {label} is hard to read. Fix: use shorter sentences and simpler, more common words.",
+        "language_mismatch": "Problem: {label} is not entirely in {language_name}. Fix: rewrite the whole text in {language_name}.",
+        "spelling": "Problem: {label} has misspelled words ({words}). Fix: correct their spelling.",
+        "fact": 'Problem: {label} says "{claimed}", which contradicts the listing data ({correct}). Fix: correct or remove it.',
+    },
+    "es": {
+        "missing": "Problema: falta {label}. Solución: añade {label} al anuncio.",
+        "too_short": "Problema: {label} tiene muy pocos caracteres ({length}). Solución: amplía su longitud a {low}-{high} caracteres.",
+        "too_long": "Problema: {label} tiene demasiados caracteres ({length}). Solución: reduce su longitud a {low}-{high} caracteres.",
+        "heading_structure": "Problema: la estructura de encabezados es incorrecta. Solución: escribe un único encabezado principal en texto plano.",
+        "thin_content": "Problema: la página tiene muy poco texto. Solución: amplía {label} con más detalles concretos de la propiedad.",
+        "readability": "Problema: {label} es difícil de leer. Solución: usa frases más cortas y palabras más simples y comunes.",
+        "language_mismatch": "Problema: {label} no está completamente en {language_name}. Solución: reescribe todo el texto en {language_name}.",
+        "spelling": "Problema: {label} tiene palabras mal escritas ({words}). Solución: corrige su ortografía.",
+        "fact": 'Problema: {label} dice "{claimed}", lo que contradice los datos del anuncio ({correct}). Solución: corrígelo o elimínalo.',
+    },
+    "pt": {
+        "missing": "Problema: falta {label}. Solução: adicione {label} ao anúncio.",
+        "too_short": "Problema: {label} tem poucos caracteres ({length}). Solução: amplie o tamanho para {low}-{high} caracteres.",
+        "too_long": "Problema: {label} tem caracteres demais ({length}). Solução: reduza o tamanho para {low}-{high} caracteres.",
+        "heading_structure": "Problema: a estrutura de cabeçalhos está incorreta. Solução: escreva um único cabeçalho principal em texto simples.",
+        "thin_content": "Problema: a página tem pouco texto. Solução: amplie {label} com mais detalhes concretos do imóvel.",
+        "readability": "Problema: {label} é difícil de ler. Solução: use frases mais curtas e palavras mais simples e comuns.",
+        "language_mismatch": "Problema: {label} não está totalmente em {language_name}. Solução: reescreva todo o texto em {language_name}.",
+        "spelling": "Problema: {label} tem palavras com erros ({words}). Solução: corrija a ortografia.",
+        "fact": 'Problema: {label} diz "{claimed}", o que contradiz os dados do anúncio ({correct}). Solução: corrija ou remova.',
+    },
+}
+
+# How each section is named inside the instructions
+ROUTER_SECTION_LABELS: Dict[str, Dict[str, str]] = {
+    "en": {
+        "title": "the title",
+        "meta": "the meta description",
+        "h1": "the main heading",
+        "description": "the description",
+        "key_features": "the key features list",
+        "neighborhood": "the neighborhood description",
+        "call_to_action": "the call to action",
+    },
+    "es": {
+        "title": "el título",
+        "meta": "la meta descripción",
+        "h1": "el encabezado principal",
+        "description": "la descripción",
+        "key_features": "la lista de características",
+        "neighborhood": "la descripción del vecindario",
+        "call_to_action": "la llamada a la acción",
+    },
+    "pt": {
+        "title": "o título",
+        "meta": "a meta descrição",
+        "h1": "o cabeçalho principal",
+        "description": "a descrição",
+        "key_features": "a lista de características",
+        "neighborhood": "a descrição do bairro",
+        "call_to_action": "a chamada para ação",
+    },
+}
+
+_LENGTH_PATTERN = re.compile(r"Length (\d+) \(optimal (\d+)-(\d+)\)")
+
+
+def _finding_rule(finding: Dict[str, Any]) -> Optional[str]:
+    """Get the rule for a finding, or None when it needs the LLM."""
+    if finding.get("element_type"):
+        return SEO_MESSAGE_RULES.get(str(finding.get("message")))
+    return FINDING_TYPE_RULES.get(str(finding.get("type")))
+
+
+def _render(rule: str, finding: Dict[str, Any], section: str, content: str, language: str, language_name: str) -> str:
+    """Render one rule's instruction in the target language."""
+    templates = ROUTER_INSTRUCTIONS.get(language, ROUTER_INSTRUCTIONS["en"])
+    labels = ROUTER_SECTION_LABELS.get(language, ROUTER_SECTION_LABELS["en"])
+    values: Dict[str, Any] = {"label": labels.get(section, section.replace("_", " ")), "language_name": language_name}
+    if rule in ("too_short", "too_long"):
+        match = _LENGTH_PATTERN.search(str(finding.get("details", "")))
+        if match:
+            values.update(length=match.group(1), low=match.group(2), high=match.group(3))
+        else:
+            low, high = LENGTH_LIMITS.get(section, (0, 0))
+            values.update(length=len(content), low=low, high=high)
+    elif rule == "spelling":
+        values["words"] = str(finding.get("message", "")).split(":", 1)[-1].strip()
+    elif rule == "fact":
+        values.update(claimed=finding.get("claimed", ""), correct=finding.get("correct", ""))
+    return templates[rule].format(**values)
+
+
+def route_section_findings(
+    section_result: Dict[str, Any], language: str = "en", language_name: str = "English"
+) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """
+    Turn the findings of a failed section into fix instructions where a rule exists.
+
+    Only findings of the checks that failed are considered; informational findings of passing
+    checks (e.g. the Flesch score) are ignored.
+
+    Args:
+        section_result: One entry of CompleteEvaluator.evaluate_sections()["sections"]
+        language: Target language code (en, es, pt)
+        language_name: Target language display name
+
+    Returns:
+        The deterministic instructions (deduplicated, in finding order) and the findings that
+        still need the improvement LLM
+    """
+    section = section_result.get("section", "")
+    content = section_result.get("content", "")
+    instructions: List[str] = []
+    unrouted: List[Dict[str, Any]] = []
+    for result in section_result.get("evaluations", {}).values():
+        if result.get("passed", True):
+            continue
+        for finding in result.get("findings", []):
+            rule = _finding_rule(finding=finding)
+            if rule is None:
+                unrouted.append(finding)
+                continue
+            instruction = _render(
+                rule=rule,
+                finding=finding,
+                section=section,
+                content=content,
+                language=language,
+                language_name=language_name,
+            )
+            if instruction not in instructions:
+                instructions.append(instruction)
+    return instructions, unrouted
+
+
+def normalize_finding(finding: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Reduce a finding to a compact typed form.
+
+    seokar issues carry an enum level, details and a recommendation; evaluator findings carry a type
+    and sometimes a severity. Both become {"section", "type", "severity", "message"}.
+    """
+    level = finding.get("severity") or getattr(finding.get("level"), "name", finding.get("level"))
+    parts = [str(finding.get(key, "")).strip().rstrip(".") for key in ("message", "details", "recommendation")]
+    return {
+        "section": finding.get("section") or SEO_ELEMENT_SECTIONS.get(str(finding.get("element_type")), "document"),
+        "type": finding.get("type") or ("seo" if finding.get("element_type") else "other"),
+        "severity": str(level or "medium").lower(),
+        "message": ". ".join(part for part in parts if part) + ".",
+    }
+
+
+def compact_findings(findings: Iterable[Dict[str, Any]], max_findings: Optional[int] = None) -> List[Dict[str, str]]:
+    """
+    Normalize, deduplicate and rank findings by severity, keeping at most max_findings.
+
+    Args:
+        findings: Raw findings from the evaluators
+        max_findings: Maximum number of findings to keep (all when None or 0)
+
+    Returns:
+        Compact findings, most severe first (ties keep their original order)
+    """
+    unique: Dict[Tuple[str, str, str], Dict[str, str]] = {}
+    for finding in findings:
+        compact = normalize_finding(finding=finding)
+        unique.setdefault((compact["section"], compact["type"], compact["message"]), compact)
+    ranked = sorted(unique.values(), key=lambda compact: SEVERITY_RANKS.get(compact["severity"], 2))
+    return ranked[:max_findings] if max_findings else ranked
+
+
+def format_findings(findings: Iterable[Dict[str, str]]) -> str:
+    """Render compact findings one per line as "- [section] type/severity: message"."""
+    return "\n".join(
+        f"  - [{finding['section']}] {finding['type']}/{finding['severity']}: {finding['message']}"
+        for finding in findings
+    )
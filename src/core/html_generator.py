@@ -1,5 +1,5 @@
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import asyncio
 
 # Import agents directly instead of generators
@@ -15,7 +15,21 @@ from agents.content_generation.call_to_action_agent import CallToActionAgent
 from evaluate.complete_evaluator import CompleteEvaluator
 from agents.evaluation.improvement_suggestion_agent import ImprovementSuggestionAgent
 
-from config.options import LANGUAGE_OPTIONS, TONE_OPTIONS, MODEL_OPTIONS
+from core.model_scheduler import get_model_scheduler
+from core.property_context import PropertyContext
+from core.listing_document import ListingDocument
+from core.single_flight import canonical_key, get_single_flight
+from core.field_dependencies import affected_sections, changed_fields
+from core.neighborhood_store import NeighborhoodKey, neighborhood_key, get_neighborhood_store
+from core.cta_pool import get_call_to_action_pool
+from core.section_templates import TEMPLATE_SECTIONS, render_section
+from core.prompt_batcher import get_prompt_batcher
+from core.best_of_n import get_best_of_n_sampler
+from config.options import CTA_POOL_OPTIONS, PROMPT_BATCHING_OPTIONS, SECTION_TEMPLATE_OPTIONS
+from config.options import COALESCING_OPTIONS, LANGUAGE_OPTIONS, TONE_OPTIONS, MODEL_OPTIONS, get_fastest_model
+
+# Template fast path modes (see SECTION_TEMPLATE_OPTIONS)
+TEMPLATE_MODES = ("off", "template", "fallback")
 
 
 class HTMLGenerator:
@@ -32,6 +46,8 @@ class HTMLGenerator:
         self,
         max_iterations: int = 1,
         model: str = "gemma3n:e2b",
+        cascade: bool = False,
+        templates: Optional[str] = None,
     ):
         """
         Initialize the HTML generator.
@@ -39,17 +55,48 @@ class HTMLGenerator:
         Args:
             max_iterations: Maximum number of holistic refinement iterations
             model: The model to use for content generation
+            cascade: Draft every section with the fastest model and escalate only the
+                sections that fail evaluation to `model` during refinement
+            templates: Template fast path for key features and H1: "off", "template" (no LLM call for
+                those sections) or "fallback" (used when their LLM call fails); default from SECTION_TEMPLATE_OPTIONS
         """
         self.max_iterations = max_iterations
         self.model = model
+        self.cascade = cascade
+        self.templates = templates or SECTION_TEMPLATE_OPTIONS["mode"]
         self.logger = logging.getLogger(__name__)
 
         # Validate model
         if model not in MODEL_OPTIONS:
             raise ValueError(f"Unsupported model: {model}. Supported models are: {list(MODEL_OPTIONS.keys())}")
+        if self.templates not in TEMPLATE_MODES:
+            raise ValueError(f"Unsupported template mode: {self.templates}. Supported modes are: {list(TEMPLATE_MODES)}")
 
         # Initialize agents once with the specified model
-        self.agents = {
+        self.agents = self._build_agents(model=model)
+        # In cascade mode drafts come from the fastest model; refinements always use self.agents
+        self.draft_model = get_fastest_model() if cascade else model
+        self.draft_agents = self.agents if self.draft_model == model else self._build_agents(model=self.draft_model)
+        self.escalation_counts: Dict[str, int] = {section: 0 for section in self.agents}
+        # Refinement rounds each section went through in the last run
+        self.section_iterations: Dict[str, int] = {section: 0 for section in self.agents}
+        # Sections drafted from scratch by the last regenerate_html call
+        self.redrafted_sections: List[str] = []
+        # Evaluated neighborhood sections shared across listings (None when disabled)
+        self.neighborhood_store = get_neighborhood_store()
+        # Pre-generated call-to-action variants (None until the offline job has built the pool)
+        self.cta_pool = get_call_to_action_pool()
+        # Shares the initial prompts of short sections with concurrent listings (None when disabled)
+        self.prompt_batcher = get_prompt_batcher()
+        # Drafts N candidates per section at once and keeps the best (None when disabled)
+        self.sampler = get_best_of_n_sampler()
+        self.complete_evaluator = CompleteEvaluator()
+        self.improvement_agent = ImprovementSuggestionAgent(model=model)
+
+    @staticmethod
+    def _build_agents(model: str) -> Dict[str, Any]:
+        """Build one content generation agent per section for the given model."""
+        return {
             "title": TitleAgent(model=model),
             "meta": MetaDescriptionAgent(model=model),
             "h1": H1Agent(model=model),
@@ -58,107 +105,452 @@ class HTMLGenerator:
             "neighborhood": NeighborhoodAgent(model=model),
             "call_to_action": CallToActionAgent(model=model),
         }
-        self.complete_evaluator = CompleteEvaluator()
-        self.improvement_agent = ImprovementSuggestionAgent(model=model)
 
-    async def generate_html(
-        self, property_data: Dict[str, Any], language: str = "en", tone: str = "professional"
-    ) -> str:
+    def get_escalation_counts(self) -> Dict[str, int]:
+        """
+        Get how many times each section was escalated to the larger model in the last run.
+
+        Only meaningful in cascade mode; every count stays at 0 otherwise.
+        """
+        return dict(self.escalation_counts)
+
+    @staticmethod
+    def _validate_options(language: str, tone: str) -> None:
+        """Reject languages and tones that have no prompts."""
         if language not in LANGUAGE_OPTIONS:
             raise ValueError(
                 f"Unsupported language: {language}. Supported languages are: {list(LANGUAGE_OPTIONS.keys())}"
             )
         if tone not in TONE_OPTIONS:
             raise ValueError(f"Unsupported tone: {tone}. Supported tones are: {list(TONE_OPTIONS.keys())}")
-        language_name = LANGUAGE_OPTIONS.get(language, None).get("name", language)
-        self.logger.info(f"Generating initial content drafts in {language_name} with {tone} tone...")
-        tasks = {
-            section: agent.generate_initial(property_data=property_data, language=language, tone=tone)
-            for section, agent in self.agents.items()
+
+    async def generate_html(
+        self, property_data: Dict[str, Any], language: str = "en", tone: str = "professional"
+    ) -> str:
+        self._validate_options(language=language, tone=tone)
+        if not COALESCING_OPTIONS["generations"]:
+            self.sections = await self._generate_sections(property_data=property_data, language=language, tone=tone)
+        else:
+            # Duplicate submissions (re-saves, double clicks, retried webhooks) join the run already in flight
+            key = canonical_key(
+                property_data, language, tone, self.model, self.max_iterations, self.cascade, self.templates
+            )
+            sections = await get_single_flight(name="generation").run(
+                key=key, job=lambda: self._generate_sections(property_data=property_data, language=language, tone=tone)
+            )
+            self.sections = dict(sections)
+        return self._assemble_html_document(language=language)
+
+    async def regenerate_html(
+        self,
+        previous_sections: Dict[str, str],
+        old_property_data: Dict[str, Any],
+        new_property_data: Dict[str, Any],
+        language: str = "en",
+        tone: str = "professional",
+    ) -> str:
+        """
+        Update a generated listing after its property data changed, drafting only what depends on the change.
+
+        Sections whose agent reads a changed field (see ContentAgent.DEPENDS_ON) are drafted again;
+        the others are kept. Every section is then evaluated against the new data and refined if it
+        fails, e.g. a kept description that still quotes the old price, followed by the usual
+        document-level checks.
+
+        Args:
+            previous_sections: Sections generated from old_property_data, in the same language and tone
+            old_property_data: Property data the previous sections were generated from
+            new_property_data: Current property data
+            language: Target language
+            tone: Target tone
+
+        Returns:
+            The updated HTML document
+        """
+        self._validate_options(language=language, tone=tone)
+        redrafted = affected_sections(
+            agents=self.agents, old_property_data=old_property_data, new_property_data=new_property_data
+        )
+        kept = {
+            section: content
+            for section, content in previous_sections.items()
+            if section in self.agents and section not in redrafted
         }
-        results = await asyncio.gather(*tasks.values())
-        self.sections = dict(zip(tasks.keys(), results))
-        # Holistic iterative refinement process
-        await self._refine_html_holistically(
-            property_data=property_data,
-            complete_evaluator=self.complete_evaluator,
-            improvement_agent=self.improvement_agent,
-            agents=self.agents,
-            language=language,
-            language_name=language_name,
-            tone=tone,
+        self.redrafted_sections = [section for section in self.agents if section not in kept]
+        self.logger.info(
+            f"Incremental regeneration: changed fields {sorted(changed_fields(old_property_data, new_property_data))}, "
+            f"drafting {self.redrafted_sections} and re-evaluating {list(kept)}"
+        )
+        self.sections = await self._generate_sections(
+            property_data=new_property_data, language=language, tone=tone, kept_sections=kept
         )
         return self._assemble_html_document(language=language)
 
-    async def _refine_html_holistically(
+    async def _generate_sections(
         self,
         property_data: Dict[str, Any],
-        complete_evaluator: CompleteEvaluator,
-        improvement_agent: ImprovementSuggestionAgent,
-        agents: Dict[str, Any],
+        language: str,
+        tone: str,
+        kept_sections: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, str]:
+        """
+        Run the draft/evaluate/refine pipeline of every section and return the final sections.
+
+        Sections in kept_sections are not drafted again, only evaluated and refined.
+        """
+        language_name = LANGUAGE_OPTIONS.get(language, None).get("name", language)
+        self.logger.info(
+            f"Generating initial content drafts in {language_name} with {tone} tone using {self.draft_model}..."
+        )
+        self.escalation_counts = {section: 0 for section in self.agents}
+        # Derived listing values and prompt fragments are built once and shared by all agents
+        context = PropertyContext.build(property_data=property_data, language=language, tone=tone)
+        self.sections = dict(kept_sections or {})
+        self.section_iterations = {section: 0 for section in self.agents}
+        # Each section runs draft -> checks -> evaluation -> refinement on its own schedule
+        await asyncio.gather(
+            *[
+                self._run_section_pipeline(
+                    section=section,
+                    property_data=property_data,
+                    language=language,
+                    language_name=language_name,
+                    tone=tone,
+                    context=context,
+                )
+                for section in self.agents
+            ]
+        )
+        # Document-level checks run once, after every section has settled
+        await self._run_document_checks(
+            property_data=property_data, language=language, language_name=language_name, tone=tone, context=context
+        )
+        self.logger.info(f"Model scheduler stats: {get_model_scheduler().get_stats()}")
+        self.logger.info(
+            f"Coalesced generations: {get_single_flight(name='generation').get_stats()}, "
+            f"prompts: {get_single_flight(name='prompt').get_stats()}"
+        )
+        return dict(self.sections)
+
+    async def _run_section_pipeline(
+        self,
+        section: str,
+        property_data: Dict[str, Any],
         language: str = "en",
         language_name: Optional[str] = "English",
         tone: str = "professional",
+        context: Optional[PropertyContext] = None,
+        document_findings: Optional[list] = None,
     ) -> None:
         """
-        Refine complete HTML through holistic evaluation and targeted improvements.
+        Draft one section (unless it already exists), then evaluate and refine it until it passes.
+
+        A neighborhood section is served from the neighborhood store when it holds enough variants
+        for the listing's location, and stored once it passes otherwise. In template mode key features and H1 are rendered from their templates instead; in fallback
+        mode the template replaces them when their LLM pipeline fails. With best-of-N sampling the
+        draft is the best of several concurrent candidates, and only refined when none of them passes.
+
+        The section leaves the pipeline as soon as it passes, when no usable suggestion comes back or
+        when it has used its max_iterations refinements. Other sections are never waited for.
+
+        Args:
+            section: Section name
+            property_data: Property data for context
+            language: Target language
+            language_name: Target language display name
+            tone: Target tone
+            context: Shared per-listing PropertyContext
+            document_findings: Document-level findings routed to this section, used on the first evaluation
         """
-        for iteration in range(self.max_iterations):
-            self.logger.info(f"--- Holistic Refinement Iteration {iteration + 1} ---")
-            # Ensamblar el HTML actual
-            current_html = self._assemble_html_document(language=language)
-            print("###########################" * 40)
-            print(current_html)
-            print("###########################" * 40)
-            # Evaluar el HTML
-            evaluation_results = await complete_evaluator.evaluate_html_complete(
-                html_content=current_html,
+        if self.templates == "template" and section in TEMPLATE_SECTIONS:
+            # Zero-LLM mode: the template is the final text, neither evaluated nor refined here
+            if section not in self.sections:
+                self.sections[section] = render_section(
+                    section=section, property_data=property_data, language=language, tone=tone
+                )
+            return
+        try:
+            await self._run_llm_section_pipeline(
+                section=section,
                 property_data=property_data,
                 language=language,
                 language_name=language_name,
                 tone=tone,
+                context=context,
+                document_findings=document_findings,
+            )
+        except Exception as e:
+            if self.templates != "fallback" or section not in TEMPLATE_SECTIONS:
+                raise
+            self.logger.warning(f"LLM pipeline of {section} failed ({e}); using its template")
+            self.sections[section] = render_section(
+                section=section, property_data=property_data, language=language, tone=tone
             )
-            print("###########################" * 40)
-            print(evaluation_results)
-            print("###########################" * 40)
-            self._display_evaluation_summary(evaluation_results=evaluation_results)
-            if not evaluation_results.get("needs_improvement", False):
-                self.logger.info("Holistic refinement complete: Content quality is excellent.")
-                break
-            section_improvements = await improvement_agent.generate_section_improvements(
-                current_content=current_html,
-                evaluation_results=evaluation_results,
+
+    async def _run_llm_section_pipeline(
+        self,
+        section: str,
+        property_data: Dict[str, Any],
+        language: str = "en",
+        language_name: Optional[str] = "English",
+        tone: str = "professional",
+        context: Optional[PropertyContext] = None,
+        document_findings: Optional[list] = None,
+    ) -> None:
+        """Draft, evaluate and refine one section with the LLM agents; see _run_section_pipeline."""
+        store_key = self._neighborhood_store_key(
+            section=section, property_data=property_data, language=language, tone=tone
+        )
+        # Only text drafted or refined in this run is stored; served, kept or already stored text is not
+        fresh = section not in self.sections
+        if fresh:
+            if store_key and await self._serve_stored_neighborhood(store_key=store_key, property_data=property_data):
+                return
+            if section == "call_to_action" and await self._serve_pooled_call_to_action(
+                property_data=property_data, language=language, language_name=language_name, tone=tone
+            ):
+                return
+            if self.sampler is not None:
+                if await self._sample_section(
+                    section=section,
+                    property_data=property_data,
+                    language=language,
+                    language_name=language_name,
+                    tone=tone,
+                    context=context,
+                    store_key=store_key,
+                ):
+                    return
+            else:
+                self.sections[section] = await self._draft_section(
+                    section=section, property_data=property_data, language=language, tone=tone, context=context
+                )
+        while self.section_iterations[section] < self.max_iterations:
+            evaluation = await self.complete_evaluator.evaluate_section(
+                document=self._build_document(language=language),
+                section=section,
+                property_data=property_data,
+                language=language,
+                language_name=language_name,
+                tone=tone,
+                document_findings=document_findings,
+            )
+            document_findings = None
+            if evaluation["passed"]:
+                self.logger.info(f"Section {section} passed after {self.section_iterations[section]} refinement(s)")
+                if store_key and fresh:
+                    await asyncio.to_thread(
+                        self.neighborhood_store.add,
+                        key=store_key,
+                        content=self.sections[section],
+                        score=evaluation.get("score", 1.0),
+                    )
+                return
+            section_improvements = await self.improvement_agent.generate_section_improvements(
+                current_content=self.sections[section],
+                evaluation_results={"sections": {section: evaluation}},
                 property_data=property_data,
                 language=language,
                 tone=tone,
+                context=context,
             )
-            print("###########################" * 40)
-            print(section_improvements)
-            print("###########################" * 40)
-
-            if not section_improvements:
-                self.logger.info("No actionable improvement suggestions were generated. Finalizing content.")
-                break
-            # Refinar las secciones
-            self.sections = await self._apply_section_refinements(
-                sections=self.sections,
-                section_improvements=section_improvements,
+            suggestion = section_improvements.get(section, {}).get("suggestion")
+            if not suggestion or suggestion.strip().lower() == "none":
+                self.logger.info(f"No actionable improvement suggestion for {section}. Finalizing it.")
+                return
+            self.section_iterations[section] += 1
+            refined = await self._apply_section_refinements(
+                sections={section: self.sections[section]},
+                section_improvements={section: {"suggestion": suggestion}},
                 property_data=property_data,
-                agents=agents,
+                agents=self.agents,
                 language=language,
                 tone=tone,
+                context=context,
             )
+            self.sections[section] = refined[section]
+            fresh = True
+
+    async def _draft_section(
+        self,
+        section: str,
+        property_data: Dict[str, Any],
+        language: str,
+        tone: str,
+        context: Optional[PropertyContext] = None,
+    ) -> str:
+        """Get the initial draft of a section, through the prompt batcher for the batched sections."""
+        agent = self.draft_agents[section]
+        if self.prompt_batcher is not None and section in PROMPT_BATCHING_OPTIONS["sections"]:
+            return await self.prompt_batcher.generate_initial(
+                agent=agent, section=section, property_data=property_data, language=language, tone=tone, context=context
+            )
+        return await agent.generate_initial(property_data=property_data, language=language, tone=tone, context=context)
+
+    async def _sample_section(
+        self,
+        section: str,
+        property_data: Dict[str, Any],
+        language: str,
+        language_name: Optional[str],
+        tone: str,
+        context: Optional[PropertyContext],
+        store_key: Optional[NeighborhoodKey],
+    ) -> bool:
+        """
+        Draft best-of-N candidates of a section and keep the best one by the local checks.
+
+        Returns:
+            Whether the kept candidate passed and is final; otherwise it is left to the refinement loop,
+            which also gives a passing neighborhood candidate its full evaluation before it is stored
+        """
+        agent = self.draft_agents[section]
+
+        async def draft(options: Dict[str, Any]) -> str:
+            return await agent.generate_initial(
+                property_data=property_data, language=language, tone=tone, context=context, options=options
+            )
+
+        async def evaluate(candidate: str) -> Dict[str, Any]:
+            return await self.complete_evaluator.evaluate_section(
+                document=ListingDocument(sections={**self.sections, section: candidate}, language=language),
+                section=section,
+                property_data=property_data,
+                language=language,
+                language_name=language_name,
+                tone=tone,
+                local_only=True,
+            )
+
+        self.sections[section], evaluation = await self.sampler.sample(draft=draft, evaluate=evaluate)
+        if not evaluation["passed"]:
+            self.logger.info(f"No best-of-{self.sampler.candidates} candidate of {section} passed; refining the best")
+            return False
+        if store_key:
+            # Other listings reuse stored sections, so only fully evaluated ones go in: the refinement
+            # loop runs every check, LLM tone check included, and stores the candidate once it passes
+            self.logger.info(f"Best-of-{self.sampler.candidates} candidate of {section} passed the local checks")
+            return False
+        self.logger.info(f"Section {section} passed with a best-of-{self.sampler.candidates} candidate")
+        return True
+
+    async def _serve_stored_neighborhood(self, store_key: NeighborhoodKey, property_data: Dict[str, Any]) -> bool:
+        """
+        Use a stored neighborhood section already evaluated for this location, language, tone and model.
+
+        Returns:
+            Whether a stored variant was served; otherwise the section is drafted
+        """
+        # SQLite calls block; keep them off the event loop the other section pipelines share
+        stored = await asyncio.to_thread(self.neighborhood_store.pick, key=store_key, property_data=property_data)
+        if stored is None:
+            return False
+        self.sections["neighborhood"] = stored
+        self.logger.info("Section neighborhood served from the neighborhood store")
+        return True
+
+    async def _serve_pooled_call_to_action(
+        self, property_data: Dict[str, Any], language: str, language_name: Optional[str], tone: str
+    ) -> bool:
+        """
+        Use the first pooled call to action that passes the listing's local checks.
+
+        Pooled variants already passed every check, LLM tone check included, when the pool was built;
+        here they only have to agree with this listing (facts, language, readability, SEO).
+
+        Returns:
+            Whether a pooled variant was served; otherwise the section is left to the LLM
+        """
+        if self.cta_pool is None:
+            return False
+        candidates = self.cta_pool.candidates(
+            property_data=property_data, language=language, tone=tone, max_tries=CTA_POOL_OPTIONS["max_tries"]
+        )
+        for rejected, candidate in enumerate(candidates):
+            self.sections["call_to_action"] = candidate
+            evaluation = await self.complete_evaluator.evaluate_section(
+                document=self._build_document(language=language),
+                section="call_to_action",
+                property_data=property_data,
+                language=language,
+                language_name=language_name,
+                tone=tone,
+                local_only=True,
+            )
+            if evaluation["passed"]:
+                self.cta_pool.record(served=True, rejected=rejected)
+                self.logger.info("Section call_to_action served from the call-to-action pool")
+                return True
+        self.sections.pop("call_to_action", None)
+        if candidates:
+            self.cta_pool.record(served=False, rejected=len(candidates))
+        return False
+
+    def _neighborhood_store_key(
+        self, section: str, property_data: Dict[str, Any], language: str, tone: str
+    ) -> Optional[NeighborhoodKey]:
+        """Get the neighborhood store key of a section, or None when the section is not served from the store."""
+        if section != "neighborhood" or self.neighborhood_store is None:
+            return None
+        return neighborhood_key(property_data=property_data, language=language, tone=tone, model=self.model)
+
+    async def _run_document_checks(
+        self,
+        property_data: Dict[str, Any],
+        language: str = "en",
+        language_name: Optional[str] = "English",
+        tone: str = "professional",
+        context: Optional[PropertyContext] = None,
+    ) -> None:
+        """
+        Run the document-level checks on the settled sections and send their findings back through
+        the pipeline of the sections they belong to, then log the final evaluation.
+        """
+        document_findings = await self.complete_evaluator.evaluate_document_checks(
+            document=self._build_document(language=language)
+        )
+        await asyncio.gather(
+            *[
+                self._run_section_pipeline(
+                    section=section,
+                    property_data=property_data,
+                    language=language,
+                    language_name=language_name,
+                    tone=tone,
+                    context=context,
+                    document_findings=findings,
+                )
+                for section, findings in document_findings.items()
+                if section in self.agents
+            ]
+        )
         # Evaluación final
-        final_html = self._assemble_html_document(language=language)
-        print(final_html)
-        evaluation_results = await complete_evaluator.evaluate_html_complete(
-            html_content=final_html,
+        final_document = self._build_document(language=language)
+        self.logger.debug(f"Final document:\n{final_document.html}")
+        evaluation_results = await self.complete_evaluator.evaluate_html_complete(
+            document=final_document,
             property_data=property_data,
             language=language,
             language_name=language_name,
             tone=tone,
         )
         self._display_evaluation_summary(evaluation_results=evaluation_results)
+        self.logger.info(f"Refinement rounds per section: {self.section_iterations}")
+        self.logger.info(f"Tone checks (lexicon vs LLM): {self.complete_evaluator.tone_match.get_agreement_stats()}")
+        self.logger.info(f"Evaluator cascade: {self.complete_evaluator.get_check_stats()}")
+        self.logger.info(f"Spelling whitelist: {self.complete_evaluator.get_whitelist_stats()}")
+        if self.neighborhood_store is not None:
+            self.logger.info(f"Neighborhood store: {self.neighborhood_store.get_stats()}")
+        if self.cta_pool is not None:
+            self.logger.info(f"Call-to-action pool: {self.cta_pool.get_stats()}")
+        if self.prompt_batcher is not None:
+            self.logger.info(f"Prompt batching: {self.prompt_batcher.get_stats()}")
+        if self.sampler is not None:
+            self.logger.info(f"Best-of-N sampling: {self.sampler.get_stats()}")
+        if self.cascade:
+            self.logger.info(
+                f"Cascade escalations per section ({self.draft_model} -> {self.model}): {self.escalation_counts}"
+            )
 
     def _display_evaluation_summary(self, evaluation_results: Dict[str, Any]):
         """
@@ -186,6 +578,7 @@ class HTMLGenerator:
         agents: Dict[str, Any],
         language: str,
         tone: str,
+        context: Optional[PropertyContext] = None,
     ) -> Dict[str, str]:
         """
         Apply specific refinements to each section based on improvement suggestions.
@@ -197,6 +590,7 @@ class HTMLGenerator:
             agents: Content generation agents
             language: Target language
             tone: Target tone
+            context: Shared per-listing PropertyContext
 
         Returns:
             Dict with refined sections
@@ -204,17 +598,11 @@ class HTMLGenerator:
         refined_sections = sections.copy()
 
         for section_name, improvement_info in section_improvements.items():
-            if (
-                section_name in agents
-                and improvement_info.get("suggestion")
-                and improvement_info.get("suggestion") is not None
-            ):
+            suggestion = improvement_info.get("suggestion")
+            if section_name in agents and suggestion and suggestion.strip().lower() != "none":
                 # Extract current content
                 current_content = sections.get(section_name, "")
 
-                # Get improvement suggestion
-                suggestion = improvement_info["suggestion"]
-
                 self.logger.info(f"Refining {section_name}): {suggestion[:100]}...")
 
                 # Apply refinement using the appropriate agent
@@ -224,74 +612,21 @@ class HTMLGenerator:
                     suggestion=suggestion,
                     language=language,
                     tone=tone,
+                    context=context,
                 )
 
                 # Asignar el contenido refinado directamente; el wrapping se hace en _assemble_html_document
                 refined_sections[section_name] = refined_content
+                if self.cascade:
+                    self.escalation_counts[section_name] = self.escalation_counts.get(section_name, 0) + 1
                 self.logger.info(f"Successfully refined {section_name}")
 
         return refined_sections
 
+    def _build_document(self, language: str = "en") -> ListingDocument:
+        """Wrap the current sections in a ListingDocument for assembly and evaluation."""
+        return ListingDocument(sections=self.sections, language=language)
+
     def _assemble_html_document(self, language: str = "en") -> str:
         """Assemble sections into a complete HTML document following the strict required format."""
-        import re
-
-        def wrap(section_name, content):
-            if section_name == "title":
-                return f"<title>{content}</title>"
-            elif section_name == "meta":
-                return f'<meta name="description" content="{content}">'
-            elif section_name == "h1":
-                return f"<h1>{content}</h1>"
-            elif section_name == "description":
-                return f'<section id="description"><p>{content}</p></section>'
-            elif section_name == "key_features":
-                # Parse plain text list and convert to <li> elements
-                lines = [line.strip() for line in content.strip().split("\n") if line.strip()]
-                list_items = []
-                for line in lines:
-                    clean_line = re.sub(pattern=r"^[•\-*\.\s]+", repl="", string=line).strip()
-                    if clean_line:
-                        list_items.append(f"<li>{clean_line}</li>")
-                list_content = "\n".join(list_items) if list_items else "<li>No features listed</li>"
-                return f'<ul id="key-features">{list_content}</ul>'
-            elif section_name == "neighborhood":
-                return f'<section id="neighborhood"><p>{content}</p></section>'
-            elif section_name == "call_to_action":
-                return f'<p class="call-to-action">{content}</p>'
-            else:
-                return content
-
-        # Defaults for each section
-        title = wrap(section_name="title", content=self.sections.get("title", "Property Listing"))
-        meta = wrap(section_name="meta", content=self.sections.get("meta", ""))
-        h1 = wrap(section_name="h1", content=self.sections.get("h1", "Property Listing"))
-        description = wrap(section_name="description", content=self.sections.get("description", "Property description"))
-        key_features = wrap(
-            section_name="key_features", content=self.sections.get("key_features", "No features listed")
-        )
-        neighborhood = wrap(
-            section_name="neighborhood", content=self.sections.get("neighborhood", "Neighborhood information")
-        )
-        call_to_action = wrap(
-            section_name="call_to_action",
-            content=self.sections.get("call_to_action", "Contact us for more information"),
-        )
-
-        html_template = f"""<!DOCTYPE html>
-<html lang="{language}">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    {title}
-    {meta}
-</head>
-<body>
-    {h1}
-    {description}
-    {key_features}
-    {neighborhood}
-    {call_to_action}
-</body>
-</html>"""
-        return html_template
+        return self._build_document(language=language).html
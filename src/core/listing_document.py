@@ -0,0 +1,203 @@
+"""
+Listing document shared by the evaluators.
+
+HTMLGenerator already holds every section as plain text, so instead of assembling the HTML and
+having each evaluator strip tags and tokenize it again, the sections are wrapped in a
+ListingDocument whose derived views (HTML, plain text, tokens, sentences, word counts) are
+computed lazily, at most once per document.
+"""
+
+import re
+from functools import cached_property
+from typing import Dict, List, Optional
+
+# Sections in document order
+SECTION_ORDER = ["title", "meta", "h1", "description", "key_features", "neighborhood", "call_to_action"]
+
+# Content used when a section has not been generated
+SECTION_DEFAULTS = {
+    "title": "Property Listing",
+    "meta": "",
+    "h1": "Property Listing",
+    "description": "Property description",
+    "key_features": "No features listed",
+    "neighborhood": "Neighborhood information",
+    "call_to_action": "Contact us for more information",
+}
+
+# The meta description lives in a tag attribute and is not part of the visible text
+HIDDEN_SECTIONS = {"meta"}
+
+_TAG_PATTERN = re.compile(r"<[^>]+>")
+_BULLET_PATTERN = re.compile(r"^[•\-*\.\s]+")
+_TOKEN_PATTERN = re.compile(r"\b\w+\b")
+_SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+")
+
+
+def strip_tags(html_content: str) -> str:
+    """Remove HTML tags and collapse whitespace."""
+    return " ".join(_TAG_PATTERN.sub("", html_content).split())
+
+
+def parse_feature_lines(content: str) -> List[str]:
+    """Split a plain-text feature list into items without their bullet markers."""
+    lines = [line.strip() for line in content.strip().split("\n") if line.strip()]
+    return [item for item in (_BULLET_PATTERN.sub("", line).strip() for line in lines) if item]
+
+
+def _wrap_section(section_name: str, content: str) -> str:
+    """Wrap one section's plain text in its HTML element."""
+    if section_name == "title":
+        return f"<title>{content}</title>"
+    if section_name == "meta":
+        return f'<meta name="description" content="{content}">'
+    if section_name == "h1":
+        return f"<h1>{content}</h1>"
+    if section_name in ("description", "neighborhood"):
+        return f'<section id="{section_name}"><p>{content}</p></section>'
+    if section_name == "key_features":
+        list_items = [f"<li>{item}</li>" for item in parse_feature_lines(content)]
+        list_content = "\n".join(list_items) if list_items else "<li>No features listed</li>"
+        return f'<ul id="key-features">{list_content}</ul>'
+    if section_name == "call_to_action":
+        return f'<p class="call-to-action">{content}</p>'
+    return content
+
+
+class ListingDocument:
+    """
+    Generated listing sections with lazily computed views for the evaluators.
+
+    A document is immutable once built: every view is a cached_property, so create a new
+    document whenever a section changes.
+    """
+
+    def __init__(self, sections: Dict[str, str], language: str = "en", html: Optional[str] = None):
+        """
+        Initialize the document.
+
+        Args:
+            sections: Plain-text content keyed by section name
+            language: Language code used for the <html lang> attribute
+            html: Already assembled HTML, when the document does not come from HTMLGenerator
+        """
+        self.sections = dict(sections)
+        self.language = language
+        self._section_documents: Dict[str, "ListingDocument"] = {}
+        if html is not None:
+            # Prime the cached view
+            self.__dict__["html"] = html
+
+    @classmethod
+    def from_text(cls, text: str, language: str = "en") -> "ListingDocument":
+        """Build a single-section document from free text."""
+        return cls(sections={"body": text}, language=language)
+
+    @classmethod
+    def from_html(cls, html_content: str, language: str = "en") -> "ListingDocument":
+        """Build a single-section document from an HTML string that was not generated as sections."""
+        return cls(sections={"body": strip_tags(html_content)}, language=language, html=html_content)
+
+    def section_document(self, section_name: str) -> "ListingDocument":
+        """
+        Get a single-section document for evaluating one section on its own.
+
+        The section's text, tokens and sentences are shared with this document, not recomputed.
+        """
+        if section_name not in self._section_documents:
+            document = ListingDocument(sections={"body": self._content(section_name)}, language=self.language)
+            document.__dict__["section_text"] = {"body": self.section_text.get(section_name, "")}
+            document.__dict__["section_tokens"] = {"body": self.section_tokens.get(section_name, [])}
+            document.__dict__["section_sentences"] = {"body": self.section_sentences.get(section_name, [])}
+            self._section_documents[section_name] = document
+        return self._section_documents[section_name]
+
+    def _section_names(self) -> List[str]:
+        if self.sections and not any(name in self.sections for name in SECTION_ORDER):
+            return list(self.sections)
+        return SECTION_ORDER + [name for name in self.sections if name not in SECTION_ORDER]
+
+    def _content(self, section_name: str) -> str:
+        return self.sections.get(section_name, SECTION_DEFAULTS.get(section_name, ""))
+
+    @cached_property
+    def html(self) -> str:
+        """The complete HTML document in the strict required format."""
+        wrapped = {name: _wrap_section(section_name=name, content=self._content(name)) for name in SECTION_ORDER}
+        return f"""<!DOCTYPE html>
+<html lang="{self.language}">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    {wrapped["title"]}
+    {wrapped["meta"]}
+</head>
+<body>
+    {wrapped["h1"]}
+    {wrapped["description"]}
+    {wrapped["key_features"]}
+    {wrapped["neighborhood"]}
+    {wrapped["call_to_action"]}
+</body>
+</html>"""
+
+    @cached_property
+    def section_text(self) -> Dict[str, str]:
+        """Plain text of every section, without markup, bullets or extra whitespace."""
+        texts = {}
+        for name in self._section_names():
+            content = self._content(name)
+            if name == "key_features":
+                content = "\n".join(parse_feature_lines(content)) or "No features listed"
+            texts[name] = strip_tags(content)
+        return texts
+
+    @cached_property
+    def plain_text(self) -> str:
+        """Visible text of the document, as a browser would show it."""
+        return " ".join(text for name, text in self.section_text.items() if name not in HIDDEN_SECTIONS and text)
+
+    @cached_property
+    def section_tokens(self) -> Dict[str, List[str]]:
+        """Lowercased word tokens of every section."""
+        return {name: _TOKEN_PATTERN.findall(text.lower()) for name, text in self.section_text.items()}
+
+    @cached_property
+    def tokens(self) -> List[str]:
+        """Lowercased word tokens of the visible text."""
+        return [
+            token for name, tokens in self.section_tokens.items() if name not in HIDDEN_SECTIONS for token in tokens
+        ]
+
+    @cached_property
+    def section_sentences(self) -> Dict[str, List[str]]:
+        """Sentences of every section; headings and list items count as one sentence each."""
+        sentences = {}
+        for name in self.section_text:
+            content = self._content(name)
+            if name == "key_features":
+                parts = parse_feature_lines(content)
+            else:
+                parts = [sentence for sentence in _SENTENCE_PATTERN.split(self.section_text[name]) if sentence]
+            sentences[name] = [strip_tags(part) for part in parts if strip_tags(part)]
+        return sentences
+
+    @cached_property
+    def sentences(self) -> List[str]:
+        """Sentences of the visible text."""
+        return [
+            sentence
+            for name, sentences in self.section_sentences.items()
+            if name not in HIDDEN_SECTIONS
+            for sentence in sentences
+        ]
+
+    @cached_property
+    def section_word_counts(self) -> Dict[str, int]:
+        """Number of word tokens in every section."""
+        return {name: len(tokens) for name, tokens in self.section_tokens.items()}
+
+    @cached_property
+    def word_count(self) -> int:
+        """Number of word tokens in the visible text."""
+        return len(self.tokens)
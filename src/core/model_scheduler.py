@@ -0,0 +1,234 @@
+"""
+Model-residency-aware scheduling of LLM calls.
+
+Ollama keeps a limited number of models in memory. When requests for different models
+interleave (per-request model selection in the UI, evaluator agents pinned to a model),
+every switch unloads one model and loads another, which costs seconds. The scheduler
+tracks which models are resident, groups queued calls by model, lets each resident model
+serve a batch of calls before yielding, and never keeps more than a configured number of
+models loaded at the same time.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, TypeVar
+
+import ollama
+
+from config.options import SCHEDULER_OPTIONS
+
+T = TypeVar("T")
+ModelHook = Callable[[str], Awaitable[None]]
+
+
+class ModelScheduler:
+    """
+    Admission control for LLM calls keyed by model.
+
+    A call for a resident model runs immediately. A call for a non-resident model waits
+    until a residency slot is free or a resident model can be evicted (no running calls and
+    either no queued calls or its batch turn is used up). Once another model is waiting, a
+    resident model admits at most `max_batch_per_turn` calls before it is drained and swapped.
+    """
+
+    def __init__(
+        self,
+        max_resident_models: int = 1,
+        max_batch_per_turn: int = 8,
+        ollama_host: Optional[str] = None,
+        load_model: Optional[ModelHook] = None,
+        unload_model: Optional[ModelHook] = None,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_resident_models: Maximum number of models kept loaded at the same time
+            max_batch_per_turn: Calls a resident model may admit while another model is queued
+            ollama_host: Ollama server URL used by the default load/unload hooks
+            load_model: Optional coroutine used to load a model (defaults to Ollama)
+            unload_model: Optional coroutine used to unload a model (defaults to Ollama)
+        """
+        if max_resident_models < 1:
+            raise ValueError("max_resident_models must be at least 1")
+        if max_batch_per_turn < 1:
+            raise ValueError("max_batch_per_turn must be at least 1")
+        self.max_resident_models = max_resident_models
+        self.max_batch_per_turn = max_batch_per_turn
+        self.ollama_host = ollama_host
+        self._load_model = load_model or self._ollama_load
+        self._unload_model = unload_model or self._ollama_unload
+        self.logger = logging.getLogger(__name__)
+
+        # Resident models in least-recently-used order
+        self._resident: "OrderedDict[str, None]" = OrderedDict()
+        self._loading: Set[str] = set()
+        self._running: Dict[str, int] = defaultdict(int)
+        self._waiting: Dict[str, int] = defaultdict(int)
+        self._turn: Dict[str, int] = defaultdict(int)
+        self._condition: Optional[asyncio.Condition] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Metrics
+        self._jobs: Dict[str, int] = defaultdict(int)
+        self._loads = 0
+        self._swaps = 0
+        self._load_seconds = 0.0
+        self._swap_seconds = 0.0
+
+    async def run(self, model: str, job: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run an LLM call once its model is resident.
+
+        Args:
+            model: Model the call is going to hit
+            job: Zero-argument coroutine factory performing the call
+
+        Returns:
+            Whatever the job returns
+        """
+        condition = self._get_condition()
+        async with condition:
+            self._waiting[model] += 1
+            try:
+                await condition.wait_for(lambda: self._can_admit(model=model))
+            finally:
+                self._waiting[model] -= 1
+            evicted = None
+            needs_load = model not in self._resident
+            if needs_load:
+                if len(self._resident) >= self.max_resident_models:
+                    evicted = self._eviction_candidate(model=model)
+                    if evicted is not None:
+                        del self._resident[evicted]
+                        self._turn[evicted] = 0
+                self._resident[model] = None
+                self._turn[model] = 0
+                self._loading.add(model)
+            self._resident.move_to_end(model)
+            self._turn[model] += 1
+            self._running[model] += 1
+        try:
+            if needs_load:
+                await self._swap_in(model=model, evicted=evicted)
+            return await job()
+        finally:
+            async with condition:
+                self._running[model] -= 1
+                self._jobs[model] += 1
+                condition.notify_all()
+
+    async def sync_resident_models(self) -> List[str]:
+        """
+        Seed the residency view from the models Ollama currently reports as loaded.
+
+        Returns:
+            The models considered resident after the sync
+        """
+        try:
+            response = await ollama.AsyncClient(host=self.ollama_host).ps()
+        except Exception as e:
+            self.logger.warning(f"Could not query resident Ollama models: {e}")
+            return list(self._resident)
+        condition = self._get_condition()
+        async with condition:
+            for loaded in response.models:
+                name = loaded.model or loaded.name
+                if name and name not in self._resident and len(self._resident) < self.max_resident_models:
+                    self._resident[name] = None
+            condition.notify_all()
+        return list(self._resident)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get residency, swap and per-model job counts collected so far."""
+        return {
+            "resident_models": list(self._resident),
+            "max_resident_models": self.max_resident_models,
+            "loads": self._loads,
+            "swaps": self._swaps,
+            "load_seconds": round(self._load_seconds, 3),
+            "swap_seconds": round(self._swap_seconds, 3),
+            "jobs_per_model": dict(self._jobs),
+        }
+
+    def _get_condition(self) -> asyncio.Condition:
+        """Get the condition bound to the running loop (a new loop starts with fresh queues)."""
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._loop is not loop:
+            self._condition = asyncio.Condition()
+            self._loop = loop
+            self._loading.clear()
+            self._running.clear()
+            self._waiting.clear()
+        return self._condition
+
+    def _others_waiting(self, model: str) -> bool:
+        """Whether a non-resident model other than `model` has queued calls."""
+        return any(count > 0 for name, count in self._waiting.items() if name != model and name not in self._resident)
+
+    def _can_admit(self, model: str) -> bool:
+        """Decide whether a queued call for `model` may start now."""
+        if model in self._loading:
+            return False
+        if model in self._resident:
+            return not (self._others_waiting(model=model) and self._turn[model] >= self.max_batch_per_turn)
+        if len(self._resident) < self.max_resident_models:
+            return True
+        return self._eviction_candidate(model=model) is not None
+
+    def _eviction_candidate(self, model: str) -> Optional[str]:
+        """Least recently used resident model that is idle and done with its batch."""
+        for resident in self._resident:
+            if resident == model or resident in self._loading or self._running[resident] > 0:
+                continue
+            if self._waiting[resident] == 0 or self._turn[resident] >= self.max_batch_per_turn:
+                return resident
+        return None
+
+    async def _swap_in(self, model: str, evicted: Optional[str]) -> None:
+        """Unload the evicted model (if any) and load `model`, recording the time spent."""
+        start = time.perf_counter()
+        try:
+            if evicted is not None:
+                self.logger.info(f"Swapping model {evicted} -> {model}")
+                await self._unload_model(evicted)
+            await self._load_model(model)
+        except Exception as e:
+            # The call itself will surface a real connectivity problem
+            self.logger.warning(f"Could not preload model {model}: {e}")
+        finally:
+            elapsed = time.perf_counter() - start
+            self._loads += 1
+            self._load_seconds += elapsed
+            if evicted is not None:
+                self._swaps += 1
+                self._swap_seconds += elapsed
+            condition = self._get_condition()
+            async with condition:
+                self._loading.discard(model)
+                condition.notify_all()
+
+    async def _ollama_load(self, model: str) -> None:
+        """Load a model into Ollama memory (an empty prompt only loads the model)."""
+        await ollama.AsyncClient(host=self.ollama_host).generate(model=model, prompt="")
+
+    async def _ollama_unload(self, model: str) -> None:
+        """Unload a model from Ollama memory."""
+        await ollama.AsyncClient(host=self.ollama_host).generate(model=model, prompt="", keep_alive=0)
+
+
+_scheduler: Optional[ModelScheduler] = None
+
+
+def get_model_scheduler() -> ModelScheduler:
+    """Get the process-wide scheduler shared by every agent, configured from SCHEDULER_OPTIONS."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = ModelScheduler(
+            max_resident_models=int(SCHEDULER_OPTIONS["max_resident_models"]),
+            max_batch_per_turn=int(SCHEDULER_OPTIONS["max_batch_per_turn"]),
+            ollama_host=str(SCHEDULER_OPTIONS["ollama_host"]),
+        )
+    return _scheduler
@@ -0,0 +1,216 @@
+"""
+Persistent store of evaluated neighborhood sections shared across listings.
+
+NeighborhoodAgent only reads location.city and location.neighborhood (plus language and tone), so
+every listing in the same neighborhood asks the model for the same paragraph. Sections that pass
+evaluation are kept here, keyed by (city, neighborhood, language, tone, model), with their score.
+Each key collects up to `variants` distinct sections; once it is full, listings are served one of
+its variants, picked by a hash of the listing's identity so neighbouring pages do not all read the same, and
+no LLM call or refinement round is made. Variants older than `max_age_days` are ignored and
+eventually dropped, so the key refills with fresh text.
+
+Every method is blocking; HTMLGenerator calls them through asyncio.to_thread so the event loop
+shared by the section pipelines never waits on SQLite.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from config.options import NEIGHBORHOOD_STORE_OPTIONS
+from core.single_flight import canonical_key
+
+NeighborhoodKey = Tuple[str, str, str, str, str]
+
+# Fields holding a listing's own ID, tried in order before falling back to its title and location
+LISTING_ID_FIELDS = ("id", "listing_id", "reference")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS neighborhood_sections (
+    city TEXT NOT NULL,
+    neighborhood TEXT NOT NULL,
+    language TEXT NOT NULL,
+    tone TEXT NOT NULL,
+    model TEXT NOT NULL,
+    content TEXT NOT NULL,
+    score REAL NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (city, neighborhood, language, tone, model, content)
+)
+"""
+_KEY_CLAUSE = "city = ? AND neighborhood = ? AND language = ? AND tone = ? AND model = ?"
+
+
+def neighborhood_key(
+    property_data: Mapping[str, Any], language: str, tone: str, model: str
+) -> Optional[NeighborhoodKey]:
+    """
+    Get the store key of a listing's neighborhood section.
+
+    Args:
+        property_data: Structured property data
+        language: Target language code
+        tone: Target tone code
+        model: Model that writes the final section
+
+    Returns:
+        The key, or None when the listing has no neighborhood or city to share content with
+    """
+    location = property_data.get("location") or {}
+    city = str(location.get("city") or "").strip().casefold()
+    neighborhood = str(location.get("neighborhood") or "").strip().casefold()
+    if not city and not neighborhood:
+        return None
+    return city, neighborhood, language, tone, model
+
+
+def listing_identity(property_data: Mapping[str, Any]) -> str:
+    """
+    Get a hash that identifies a listing across edits of its price, features or copy.
+
+    Args:
+        property_data: Structured property data
+
+    Returns:
+        Hash of the listing's ID, or of its title and location when it has none
+    """
+    for field in LISTING_ID_FIELDS:
+        if property_data.get(field) not in (None, ""):
+            return canonical_key(field, property_data[field])
+    return canonical_key(property_data.get("title"), property_data.get("location"))
+
+
+class NeighborhoodStore:
+    """
+    SQLite-backed variants of the neighborhood section, scored by the section evaluation.
+
+    The database is opened on first use; one connection is shared by the threads of a process
+    and SQLite serializes writers across processes.
+    """
+
+    def __init__(self, path: str, variants: int = 3, max_age_days: float = 30.0):
+        """
+        Initialize the store.
+
+        Args:
+            path: SQLite database file (":memory:" for a private, in-process store)
+            variants: Distinct sections collected per key before listings are served from it
+            max_age_days: Age after which a variant is no longer served
+        """
+        if variants < 1:
+            raise ValueError("variants must be at least 1")
+        self.path = path
+        self.variants = variants
+        self.max_age_seconds = max_age_days * 86400
+        self.logger = logging.getLogger(__name__)
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+        # Metrics
+        self._hits = 0
+        self._misses = 0
+        self._stored = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            if self.path != ":memory:":
+                os.makedirs(name=os.path.dirname(self.path) or ".", exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False, timeout=10.0)
+            self._connection.execute(_SCHEMA)
+            self._connection.commit()
+        return self._connection
+
+    def get_variants(self, key: NeighborhoodKey) -> List[Tuple[str, float]]:
+        """Get the fresh variants of a key as (content, score), best first."""
+        with self._lock:
+            rows = (
+                self._connect()
+                .execute(
+                    f"SELECT content, score FROM neighborhood_sections WHERE {_KEY_CLAUSE} AND created_at >= ? "
+                    "ORDER BY score DESC, content",
+                    (*key, time.time() - self.max_age_seconds),
+                )
+                .fetchall()
+            )
+        return [(content, score) for content, score in rows]
+
+    def pick(self, key: NeighborhoodKey, property_data: Mapping[str, Any]) -> Optional[str]:
+        """
+        Get the variant served to a listing, if the key holds enough fresh variants.
+
+        Args:
+            key: Key from neighborhood_key
+            property_data: Listing data; its identity decides the variant, so a listing keeps the same one
+                when its price or features change
+
+        Returns:
+            The stored section, or None when the section has to be generated
+        """
+        variants = self.get_variants(key=key)
+        if len(variants) < self.variants:
+            self._misses += 1
+            return None
+        self._hits += 1
+        index = int(listing_identity(property_data)[:8], 16) % len(variants)
+        return variants[index][0]
+
+    def add(self, key: NeighborhoodKey, content: str, score: float) -> None:
+        """
+        Keep a section that passed evaluation, dropping stale variants and the lowest-scored extras.
+
+        Args:
+            key: Key from neighborhood_key
+            content: Section text
+            score: Section evaluation score
+        """
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    "DELETE FROM neighborhood_sections WHERE created_at < ?", (now - self.max_age_seconds,)
+                )
+                connection.execute(
+                    # A variant stored again keeps its age, so it still expires max_age_days after it was first stored
+                    "INSERT INTO neighborhood_sections VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (city, neighborhood, language, tone, model, content) DO UPDATE SET score = excluded.score",
+                    (*key, content, float(score), now),
+                )
+                connection.execute(
+                    f"DELETE FROM neighborhood_sections WHERE {_KEY_CLAUSE} AND rowid NOT IN ("
+                    f"SELECT rowid FROM neighborhood_sections WHERE {_KEY_CLAUSE} "
+                    "ORDER BY score DESC, created_at DESC LIMIT ?)",
+                    (*key, *key, self.variants),
+                )
+        self._stored += 1
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get the listings served from the store, the lookups that fell through and the sections stored."""
+        return {"hits": self._hits, "misses": self._misses, "stored": self._stored}
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+_store: Optional[NeighborhoodStore] = None
+
+
+def get_neighborhood_store() -> Optional[NeighborhoodStore]:
+    """Get the process-wide store configured from NEIGHBORHOOD_STORE_OPTIONS (None when disabled)."""
+    global _store
+    if not NEIGHBORHOOD_STORE_OPTIONS["enabled"]:
+        return None
+    if _store is None:
+        _store = NeighborhoodStore(
+            path=NEIGHBORHOOD_STORE_OPTIONS["path"],
+            variants=NEIGHBORHOOD_STORE_OPTIONS["variants"],
+            max_age_days=NEIGHBORHOOD_STORE_OPTIONS["max_age_days"],
+        )
+    return _store
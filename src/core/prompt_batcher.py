@@ -0,0 +1,247 @@
+"""
+Cross-listing batching of the short section prompts.
+
+In batch runs thousands of tiny title, meta and H1 calls each pay the fixed cost of a request and
+of evaluating the prompt prefix. The PromptBatcher collects the initial drafts requested for the
+same (section, language, tone, model) by concurrent generations and sends up to `max_listings` of
+them as one prompt (ContentAgent.build_batch_prompt) whose answer is a JSON array of
+{"id", "text"} objects. Each item is validated on its own: items that are missing, malformed or
+break the section's limits are sent again in a smaller batch, and after `max_retries` rounds
+through the per-listing prompt, so one bad item never costs the whole batch.
+"""
+
+import asyncio
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from config.options import PROMPT_BATCHING_OPTIONS
+from core.property_context import PropertyContext
+
+# Longest text a batched item may have, from the section prompts; longer items are retried
+SECTION_MAX_LENGTHS = {"title": 60, "meta": 155, "h1": 70}
+
+_CODE_FENCE_PATTERN = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+BatchKey = Tuple[str, str, str, str]
+
+
+@dataclass
+class _PendingDraft:
+    """One listing waiting for its batched draft."""
+
+    agent: Any
+    property_data: Dict[str, Any]
+    context: PropertyContext
+    future: "asyncio.Future[str]" = field(repr=False)
+
+
+def parse_batch_response(response: str) -> Dict[str, str]:
+    """
+    Read the items of a batched answer.
+
+    Accepts the requested [{"id", "text"}] array, with or without a code fence, and also an
+    object wrapping that array or mapping IDs to texts, which small models sometimes return.
+
+    Returns:
+        Text keyed by listing ID; empty when the answer is not JSON
+    """
+    try:
+        data = json.loads(_CODE_FENCE_PATTERN.sub("", response.strip()))
+    except ValueError:
+        return {}
+    if isinstance(data, dict):
+        arrays = [value for value in data.values() if isinstance(value, list)]
+        if not arrays:
+            return {str(key): value for key, value in data.items() if isinstance(value, str)}
+        data = arrays[0]
+    if not isinstance(data, list):
+        return {}
+    return {
+        str(item["id"]): item["text"]
+        for item in data
+        if isinstance(item, dict) and "id" in item and isinstance(item.get("text"), str)
+    }
+
+
+def is_valid_item(section: str, text: str) -> bool:
+    """Whether a batched item can stand in for a per-listing draft: one non-empty line within the section's limit."""
+    text = text.strip()
+    return bool(text) and "\n" not in text and len(text) <= SECTION_MAX_LENGTHS.get(section, len(text))
+
+
+class PromptBatcher:
+    """
+    Collect concurrent initial drafts per (section, language, tone, model) into shared prompts.
+
+    A batch is sent as soon as it holds `max_listings` drafts or `max_wait_ms` after its first
+    draft arrived, whichever comes first.
+    """
+
+    def __init__(self, max_listings: int = 8, max_wait_ms: float = 50.0, max_retries: int = 1):
+        """
+        Initialize the batcher.
+
+        Args:
+            max_listings: Listings per prompt
+            max_wait_ms: Time a draft waits for other listings before its batch is sent anyway
+            max_retries: Batched rounds for the items that fail validation before they go one by one
+        """
+        if max_listings < 1:
+            raise ValueError("max_listings must be at least 1")
+        self.max_listings = max_listings
+        self.max_wait_seconds = max_wait_ms / 1000
+        self.max_retries = max_retries
+        self.logger = logging.getLogger(__name__)
+        self._pending: Dict[BatchKey, List[_PendingDraft]] = {}
+        self._timers: Dict[BatchKey, asyncio.TimerHandle] = {}
+        # Batches in flight; the event loop only keeps weak references to tasks
+        self._tasks: Set["asyncio.Future[None]"] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Metrics
+        self._drafts = 0
+        self._batched_calls = 0
+        self._single_calls = 0
+        self._retried_items = 0
+
+    async def generate_initial(
+        self,
+        agent: Any,
+        section: str,
+        property_data: Dict[str, Any],
+        language: str = "en",
+        tone: str = "family-oriented",
+        context: Optional[PropertyContext] = None,
+    ) -> str:
+        """
+        Get the initial draft of one listing's section, batched with concurrent drafts of other listings.
+
+        Args:
+            agent: ContentAgent of the section
+            section: Section name
+            property_data: Property data of the listing
+            language: Target language
+            tone: Target tone
+            context: Shared per-listing PropertyContext
+
+        Returns:
+            The draft, as agent.generate_initial would return it
+        """
+        loop = self._bind_loop()
+        context = context or PropertyContext.build(property_data=property_data, language=language, tone=tone)
+        key = (section, language, tone, agent.model)
+        future = loop.create_future()
+        self._pending.setdefault(key, []).append(
+            _PendingDraft(agent=agent, property_data=property_data, context=context, future=future)
+        )
+        self._drafts += 1
+        if len(self._pending[key]) >= self.max_listings:
+            self._flush(key=key)
+        elif key not in self._timers:
+            self._timers[key] = loop.call_later(self.max_wait_seconds, self._flush, key)
+        return await future
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get the drafts requested, the batched and per-listing calls made and the items retried."""
+        return {
+            "drafts": self._drafts,
+            "batched_calls": self._batched_calls,
+            "single_calls": self._single_calls,
+            "retried_items": self._retried_items,
+        }
+
+    def _flush(self, key: BatchKey) -> None:
+        """Send the drafts collected for a key."""
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        pending = self._pending.pop(key, [])
+        if pending:
+            task = asyncio.ensure_future(self._run_batch(section=key[0], pending=pending, retries_left=self.max_retries))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, section: str, pending: List[_PendingDraft], retries_left: int) -> None:
+        """Draft a batch, resolve the valid items and send the others through a retry or one by one."""
+        if len(pending) == 1:
+            await self._run_single(pending=pending[0])
+            return
+        agent = pending[0].agent
+        contexts = {f"L{index}": draft.context for index, draft in enumerate(pending, start=1)}
+        try:
+            self._batched_calls += 1
+            items = parse_batch_response(await agent.run_task(task=agent.build_batch_prompt(contexts=contexts)))
+        except Exception as e:
+            # Ollama itself failed: the per-listing prompts would fail the same way
+            for draft in pending:
+                if not draft.future.done():
+                    draft.future.set_exception(e)
+            return
+        failed = self._resolve(section=section, drafts=dict(zip(contexts, pending)), items=items)
+        if not failed:
+            return
+        self._retried_items += len(failed)
+        self.logger.info(f"Retrying {len(failed)} of {len(pending)} batched {section} drafts")
+        if retries_left > 0 and len(failed) > 1:
+            await self._run_batch(section=section, pending=failed, retries_left=retries_left - 1)
+        else:
+            await asyncio.gather(*[self._run_single(pending=draft) for draft in failed])
+
+    @staticmethod
+    def _resolve(section: str, drafts: Dict[str, _PendingDraft], items: Dict[str, str]) -> List[_PendingDraft]:
+        """Resolve the drafts whose batched item is valid and return the others."""
+        failed = []
+        for listing_id, draft in drafts.items():
+            text = items.get(listing_id)
+            if text is None or not is_valid_item(section=section, text=text):
+                failed.append(draft)
+            elif not draft.future.done():
+                draft.future.set_result(text.strip())
+        return failed
+
+    async def _run_single(self, pending: _PendingDraft) -> None:
+        """Draft one listing with its own prompt."""
+        self._single_calls += 1
+        try:
+            text = await pending.agent.generate_initial(
+                property_data=pending.property_data,
+                language=pending.context.language,
+                tone=pending.context.tone,
+                context=pending.context,
+            )
+        except Exception as e:
+            if not pending.future.done():
+                pending.future.set_exception(e)
+            return
+        if not pending.future.done():
+            pending.future.set_result(text)
+
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        """Start with empty queues on a new event loop (futures and timers belong to one loop)."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._pending.clear()
+            self._timers.clear()
+            self._tasks.clear()
+        return loop
+
+
+_batcher: Optional[PromptBatcher] = None
+
+
+def get_prompt_batcher() -> Optional[PromptBatcher]:
+    """Get the process-wide batcher configured from PROMPT_BATCHING_OPTIONS (None when disabled)."""
+    global _batcher
+    if not PROMPT_BATCHING_OPTIONS["enabled"]:
+        return None
+    if _batcher is None:
+        _batcher = PromptBatcher(
+            max_listings=PROMPT_BATCHING_OPTIONS["max_listings"],
+            max_wait_ms=PROMPT_BATCHING_OPTIONS["max_wait_ms"],
+            max_retries=PROMPT_BATCHING_OPTIONS["max_retries"],
+        )
+    return _batcher
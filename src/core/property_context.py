@@ -0,0 +1,174 @@
+"""
+Per-listing context shared by every agent working on the same (listing, language, tone).
+
+Option lookups, the localized feature list, the neighborhood line, the compact facts and the
+prompt fragments are derived once here, so building a prompt on each initial or refinement
+call is a constant-time string join no matter how many iterations run.
+"""
+
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Mapping
+
+from config.options import LANGUAGE_OPTIONS, TONE_OPTIONS
+from core.property_facts import FEATURE_ORDER, serialize_property_facts
+from agents.content_generation.prompts import build_static_prefix, get_payload_labels
+
+# Language-specific feature descriptions
+FEATURE_TRANSLATIONS = {
+    "en": {
+        "bedrooms": "bedrooms",
+        "bathrooms": "bathrooms",
+        "area_sqm": "square meters",
+        "balcony": "balcony",
+        "parking": "parking",
+        "elevator": "elevator access",
+        "floor": "floor",
+        "year_built": "built in",
+    },
+    "es": {
+        "bedrooms": "dormitorios",
+        "bathrooms": "baños",
+        "area_sqm": "metros cuadrados",
+        "balcony": "balcón",
+        "parking": "estacionamiento",
+        "elevator": "acceso por ascensor",
+        "floor": "piso",
+        "year_built": "construido en",
+    },
+    "pt": {
+        "bedrooms": "quartos",
+        "bathrooms": "banheiros",
+        "area_sqm": "metros quadrados",
+        "balcony": "varanda",
+        "parking": "estacionamento",
+        "elevator": "acesso por elevador",
+        "floor": "andar",
+        "year_built": "construído em",
+    },
+}
+
+# How each feature is phrased: value first, label only, or label first
+_VALUE_FIRST = {"bedrooms", "bathrooms", "area_sqm"}
+_LABEL_ONLY = {"balcony", "parking", "elevator"}
+_LABEL_FIRST = {"floor", "year_built"}
+
+
+def extract_features_list(property_data: Dict[str, Any], language: str = "en") -> str:
+    """Extract and format available features from property data as a hyphenated list."""
+    translations = FEATURE_TRANSLATIONS.get(language, FEATURE_TRANSLATIONS["en"])
+    features = property_data.get("features", {})
+    features_list = []
+    for key in FEATURE_ORDER:
+        value = features.get(key)
+        if not value:
+            continue
+        if key in _VALUE_FIRST:
+            features_list.append(f"{value} {translations[key]}")
+        elif key in _LABEL_ONLY:
+            features_list.append(translations[key])
+        elif key in _LABEL_FIRST:
+            features_list.append(f"{translations[key]} {value}")
+    return "\n".join([f"- {feature}" for feature in features_list])
+
+
+def extract_neighborhood_info(property_data: Dict[str, Any]) -> str:
+    """Extract only neighborhood-relevant information from property data."""
+    relevant_fields = []
+
+    # Extract location information from the nested location object
+    location = property_data.get("location", {})
+
+    if "neighborhood" in location:
+        relevant_fields.append(f"Neighborhood: {location['neighborhood']}")
+    if "city" in location:
+        relevant_fields.append(f"City: {location['city']}")
+
+    # If no specific neighborhood info found, return basic location
+    if not relevant_fields:
+        return "Property location information not specified"
+
+    return ", ".join(relevant_fields)
+
+
+@dataclass(frozen=True, slots=True)
+class PropertyContext:
+    """
+    Immutable, precomputed view of one listing for one language and tone.
+
+    Attributes:
+        property_data: The listing data (a private copy; treat as read-only)
+        language: Target language code
+        tone: Target tone code
+        language_name: Display name of the language
+        tone_name: Display name of the tone
+        tone_description: Tone guidance given to the model
+        property_facts: Compact, localized facts line
+        features_list: Localized hyphenated feature list
+        neighborhood_info: Neighborhood and city line
+        static_prefix: Rendered (language, tone) prompt prefix
+        labels: Localized payload labels
+        payloads: Rendered payload blocks keyed by kind ("property_data", "features", "neighborhood")
+    """
+
+    property_data: Mapping[str, Any]
+    language: str
+    tone: str
+    language_name: str
+    tone_name: str
+    tone_description: str
+    property_facts: str
+    features_list: str
+    neighborhood_info: str
+    static_prefix: str
+    labels: Mapping[str, str]
+    payloads: Mapping[str, str]
+
+    @classmethod
+    def build(
+        cls, property_data: Dict[str, Any], language: str = "en", tone: str = "family-oriented"
+    ) -> "PropertyContext":
+        """
+        Get the context for a listing, building it only the first time it is requested.
+
+        Args:
+            property_data: Structured property data
+            language: Target language code (en, es, pt)
+            tone: Target tone code
+
+        Returns:
+            The shared PropertyContext
+        """
+        canonical_data = json.dumps(obj=property_data, sort_keys=True, ensure_ascii=False, default=str)
+        return _build_context(canonical_data, language, tone)
+
+
+@lru_cache(maxsize=256)
+def _build_context(canonical_data: str, language: str, tone: str) -> PropertyContext:
+    property_data = json.loads(canonical_data)
+    tone_options = TONE_OPTIONS.get(tone, {})
+    labels = get_payload_labels(language)
+    property_facts = serialize_property_facts(property_data=property_data, language=language)
+    features_list = extract_features_list(property_data=property_data, language=language)
+    neighborhood_info = extract_neighborhood_info(property_data=property_data)
+    payloads = {
+        "property_data": f"{labels['property_data']}: {property_facts}",
+        "features": f"{labels['features']}:\n{features_list}",
+        "neighborhood": f"{labels['neighborhood']}: {neighborhood_info}",
+    }
+    return PropertyContext(
+        property_data=MappingProxyType(property_data),
+        language=language,
+        tone=tone,
+        language_name=LANGUAGE_OPTIONS.get(language, {}).get("name", language),
+        tone_name=tone_options.get("name", tone),
+        tone_description=tone_options.get("description", ""),
+        property_facts=property_facts,
+        features_list=features_list,
+        neighborhood_info=neighborhood_info,
+        static_prefix=build_static_prefix(language=language, tone=tone),
+        labels=MappingProxyType(dict(labels)),
+        payloads=MappingProxyType(payloads),
+    )
@@ -0,0 +1,159 @@
+"""
+Compact, language-localized serialization of listing facts for LLM prompts.
+
+Interpolating the raw property dict (or pretty-printed JSON) spends most of the payload
+tokens on braces, quotes, whitespace and key names. The serializer renders the same facts
+as a short localized line, e.g.:
+
+    Modern home in San Francisco · for sale · price 850,000 · 3 bedrooms · 2 baths · 167 m² · ...
+"""
+
+import json
+from functools import lru_cache
+from typing import Any, Dict, List
+
+SEPARATOR = " · "
+
+FACT_LABELS = {
+    "en": {
+        "bedrooms": "{value} bedrooms",
+        "bathrooms": "{value} baths",
+        "area_sqm": "{value} m²",
+        "floor": "floor {value}",
+        "year_built": "built {value}",
+        "balcony": "balcony",
+        "parking": "parking",
+        "elevator": "elevator",
+        "negation": "no {feature}",
+        "price": "price {value}",
+        "sale": "for sale",
+        "rent": "for rent",
+        "thousands_separator": ",",
+    },
+    "es": {
+        "bedrooms": "{value} dormitorios",
+        "bathrooms": "{value} baños",
+        "area_sqm": "{value} m²",
+        "floor": "planta {value}",
+        "year_built": "construido en {value}",
+        "balcony": "balcón",
+        "parking": "estacionamiento",
+        "elevator": "ascensor",
+        "negation": "sin {feature}",
+        "price": "precio {value}",
+        "sale": "en venta",
+        "rent": "en alquiler",
+        "thousands_separator": ".",
+    },
+    "pt": {
+        "bedrooms": "{value} quartos",
+        "bathrooms": "{value} banheiros",
+        "area_sqm": "{value} m²",
+        "floor": "andar {value}",
+        "year_built": "construído em {value}",
+        "balcony": "varanda",
+        "parking": "estacionamento",
+        "elevator": "elevador",
+        "negation": "sem {feature}",
+        "price": "preço {value}",
+        "sale": "à venda",
+        "rent": "para arrendar",
+        "thousands_separator": ".",
+    },
+}
+
+# Features are rendered in this order, followed by any other feature in alphabetical order
+FEATURE_ORDER = ["bedrooms", "bathrooms", "area_sqm", "floor", "year_built", "balcony", "parking", "elevator"]
+
+# Top-level fields rendered explicitly (or deliberately skipped); anything else is appended as "key value"
+_KNOWN_FIELDS = {"title", "listing_type", "price", "features", "location", "language", "tone"}
+
+
+def _format_number(value: Any, thousands_separator: str) -> str:
+    """Format integers with the language's thousands separator, leave anything else as is."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, float) and not value.is_integer():
+        return str(value)
+    return f"{int(value):,}".replace(",", thousands_separator)
+
+
+def render_fact(key: str, value: Any, language: str = "en") -> str:
+    """
+    Render a single listing fact as its localized phrase, e.g. ("bedrooms", 3) -> "3 bedrooms".
+
+    Args:
+        key: Feature key, or "price"
+        value: Fact value; booleans render as the feature or its negation
+        language: Target language code (en, es, pt)
+
+    Returns:
+        The localized phrase
+    """
+    labels = FACT_LABELS.get(language, FACT_LABELS["en"])
+    if isinstance(value, bool):
+        feature = labels.get(key) or key.replace("_", " ")
+        return feature if value else labels["negation"].format(feature=feature)
+    if key == "price":
+        return labels["price"].format(value=_format_number(value, labels["thousands_separator"]))
+    template = labels.get(key)
+    return template.format(value=value) if template else f"{key.replace('_', ' ')} {value}"
+
+
+def _feature_facts(features: Dict[str, Any], language: str) -> List[str]:
+    """Render the features dict in FEATURE_ORDER."""
+    keys = [key for key in FEATURE_ORDER if key in features] + sorted(set(features) - set(FEATURE_ORDER))
+    return [
+        render_fact(key=key, value=features[key], language=language)
+        for key in keys
+        if features[key] is not None and features[key] != ""
+    ]
+
+
+@lru_cache(maxsize=1024)
+def _serialize(canonical_data: str, language: str) -> str:
+    property_data = json.loads(canonical_data)
+    labels = FACT_LABELS.get(language, FACT_LABELS["en"])
+    facts = []
+
+    if property_data.get("title"):
+        facts.append(str(property_data["title"]))
+    listing_type = property_data.get("listing_type")
+    if listing_type:
+        facts.append(labels.get(listing_type, str(listing_type)))
+    if property_data.get("price") is not None:
+        facts.append(render_fact(key="price", value=property_data["price"], language=language))
+
+    features = property_data.get("features", {})
+    if isinstance(features, dict):
+        facts.extend(_feature_facts(features=features, language=language))
+
+    location = property_data.get("location", {})
+    if isinstance(location, dict):
+        place = ", ".join(str(location[key]) for key in ("neighborhood", "city") if location.get(key))
+        if place:
+            facts.append(place)
+
+    for key, value in property_data.items():
+        if key not in _KNOWN_FIELDS and value not in (None, "", [], {}):
+            facts.append(f"{key.replace('_', ' ')} {value}")
+
+    return SEPARATOR.join(facts)
+
+
+def serialize_property_facts(property_data: Dict[str, Any], language: str = "en") -> str:
+    """
+    Render the listing facts as one compact, localized line.
+
+    The result is cached per (listing, language), so every agent working on the same listing
+    shares a single rendering.
+
+    Args:
+        property_data: Structured property data
+        language: Target language code (en, es, pt)
+
+    Returns:
+        The facts joined with " · "
+    """
+    canonical_data = json.dumps(obj=property_data, sort_keys=True, ensure_ascii=False, default=str)
+    return _serialize(canonical_data, language)
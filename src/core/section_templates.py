@@ -0,0 +1,282 @@
+"""
+Deterministic, localized templates for the key features and H1 sections.
+
+KeyFeaturesAgent sends the structured feature list to the model only to have it rephrased, and
+H1Agent mostly echoes the title. Here both sections are rendered from property_data with
+tone-specific phrasing tables per language, in microseconds and without an LLM call. The phrases
+keep every number next to the word the rule-based fact check looks for ("3 elegant bedrooms",
+"floor 4", "built in 2019"), and only features the listing actually has are mentioned.
+"""
+
+from typing import Any, Callable, Dict, List, Mapping, Tuple
+
+# Sections that have a template renderer
+TEMPLATE_SECTIONS = ("key_features", "h1")
+
+# Key features shown at most, in this order: amenities the listing has rank above floor and year
+KEY_FEATURE_ORDER = ["bedrooms", "bathrooms", "area_sqm", "balcony", "parking", "elevator", "floor", "year_built"]
+MAX_KEY_FEATURES = 5
+
+# Feature phrases per language: "default" covers every feature, tones override some of them.
+# "{s}" is the plural ending, left out when the value is 1.
+KEY_FEATURE_PHRASES: Dict[str, Dict[str, Dict[str, str]]] = {
+    "en": {
+        "default": {
+            "bedrooms": "{value} bedroom{s}",
+            "bathrooms": "{value} bathroom{s}",
+            "area_sqm": "{value} m² of living space",
+            "floor": "Set on floor {value}",
+            "year_built": "Built in {value}",
+            "balcony": "Private balcony",
+            "parking": "Parking included",
+            "elevator": "Elevator access",
+        },
+        "luxury": {
+            "bedrooms": "{value} elegant bedroom{s}",
+            "bathrooms": "{value} refined bathroom{s}",
+            "area_sqm": "{value} m² of exclusive living space",
+            "balcony": "Private balcony for refined outdoor living",
+            "parking": "Private parking",
+        },
+        "investor-focused": {
+            "bedrooms": "{value} rentable bedroom{s}",
+            "area_sqm": "{value} m² of income-ready space",
+            "parking": "Parking space that adds rental appeal",
+            "elevator": "Elevator access that widens the tenant pool",
+        },
+        "family-oriented": {
+            "bedrooms": "{value} comfortable bedroom{s}",
+            "area_sqm": "{value} m² of room for the whole family",
+            "balcony": "Private balcony for family time outdoors",
+            "parking": "Easy parking for the family car",
+        },
+        "modern": {
+            "bedrooms": "{value} contemporary bedroom{s}",
+            "bathrooms": "{value} sleek bathroom{s}",
+            "area_sqm": "{value} m² of open, modern space",
+            "elevator": "Convenient elevator access",
+        },
+        "classic": {
+            "bedrooms": "{value} well-proportioned bedroom{s}",
+            "area_sqm": "{value} m² of timeless living space",
+            "balcony": "Classic private balcony",
+        },
+        "youthful": {
+            "bedrooms": "{value} bright bedroom{s}",
+            "area_sqm": "{value} m² to live and hang out",
+            "balcony": "Balcony for sunny afternoons with friends",
+            "parking": "Parking for your ride",
+        },
+    },
+    "es": {
+        "default": {
+            "bedrooms": "{value} dormitorio{s}",
+            "bathrooms": "{value} baño{s}",
+            "area_sqm": "{value} m² de espacio habitable",
+            "floor": "Situado en la planta {value}",
+            "year_built": "Construido en {value}",
+            "balcony": "Balcón privado",
+            "parking": "Estacionamiento incluido",
+            "elevator": "Acceso por ascensor",
+        },
+        "luxury": {
+            "bedrooms": "{value} elegante{s} dormitorio{s}",
+            "bathrooms": "{value} baño{s} refinado{s}",
+            "area_sqm": "{value} m² de espacio exclusivo",
+            "balcony": "Balcón privado para disfrutar al aire libre",
+            "parking": "Estacionamiento privado",
+        },
+        "investor-focused": {
+            "bedrooms": "{value} dormitorio{s} listo{s} para alquilar",
+            "area_sqm": "{value} m² con potencial de rentabilidad",
+            "parking": "Estacionamiento que suma atractivo para el alquiler",
+        },
+        "family-oriented": {
+            "bedrooms": "{value} dormitorio{s} cómodo{s}",
+            "area_sqm": "{value} m² para toda la familia",
+            "balcony": "Balcón privado para disfrutar en familia",
+        },
+        "modern": {
+            "bedrooms": "{value} dormitorio{s} contemporáneo{s}",
+            "area_sqm": "{value} m² de espacio abierto y moderno",
+            "elevator": "Cómodo acceso por ascensor",
+        },
+        "classic": {
+            "bedrooms": "{value} dormitorio{s} bien proporcionado{s}",
+            "area_sqm": "{value} m² de espacio atemporal",
+        },
+        "youthful": {
+            "bedrooms": "{value} dormitorio{s} luminoso{s}",
+            "area_sqm": "{value} m² para vivir y compartir",
+            "balcony": "Balcón para las tardes de sol con amigos",
+        },
+    },
+    "pt": {
+        "default": {
+            "bedrooms": "{value} quarto{s}",
+            "bathrooms": "{value} banheiro{s}",
+            "area_sqm": "{value} m² de área habitável",
+            "floor": "Localizado no andar {value}",
+            "year_built": "Construído em {value}",
+            "balcony": "Varanda privativa",
+            "parking": "Estacionamento incluído",
+            "elevator": "Acesso por elevador",
+        },
+        "luxury": {
+            "bedrooms": "{value} quarto{s} elegante{s}",
+            "bathrooms": "{value} banheiro{s} requintado{s}",
+            "area_sqm": "{value} m² de espaço exclusivo",
+            "balcony": "Varanda privativa para momentos ao ar livre",
+            "parking": "Estacionamento privativo",
+        },
+        "investor-focused": {
+            "bedrooms": "{value} quarto{s} pronto{s} para arrendar",
+            "area_sqm": "{value} m² com potencial de rentabilidade",
+            "parking": "Estacionamento que valoriza o arrendamento",
+        },
+        "family-oriented": {
+            "bedrooms": "{value} quarto{s} aconchegante{s}",
+            "area_sqm": "{value} m² para toda a família",
+            "balcony": "Varanda privativa para aproveitar em família",
+        },
+        "modern": {
+            "bedrooms": "{value} quarto{s} contemporâneo{s}",
+            "area_sqm": "{value} m² de espaço aberto e moderno",
+            "elevator": "Acesso prático por elevador",
+        },
+        "classic": {
+            "bedrooms": "{value} quarto{s} bem proporcionado{s}",
+            "area_sqm": "{value} m² de espaço intemporal",
+        },
+        "youthful": {
+            "bedrooms": "{value} quarto{s} luminoso{s}",
+            "area_sqm": "{value} m² para viver e receber amigos",
+            "balcony": "Varanda para tardes de sol com amigos",
+        },
+    },
+}
+
+# H1 phrases per language and tone: (with a bedroom count, without one); the location is appended
+H1_PHRASES: Dict[str, Dict[str, Tuple[str, str]]] = {
+    "en": {
+        "default": ("{bedrooms}-bedroom home", "Home"),
+        "luxury": ("Exquisite {bedrooms}-bedroom residence", "Exquisite residence"),
+        "investor-focused": ("Income-ready {bedrooms}-bedroom property", "Income-ready property"),
+        "family-oriented": ("Spacious {bedrooms}-bedroom family home", "Spacious family home"),
+        "modern": ("Contemporary {bedrooms}-bedroom home", "Contemporary home"),
+        "classic": ("Timeless {bedrooms}-bedroom home", "Timeless home"),
+        "youthful": ("Bright {bedrooms}-bedroom home", "Bright home"),
+    },
+    "es": {
+        "default": ("Vivienda de {bedrooms} dormitorio{s}", "Vivienda"),
+        "luxury": ("Exclusiva residencia de {bedrooms} dormitorio{s}", "Exclusiva residencia"),
+        "investor-focused": ("Inmueble rentable de {bedrooms} dormitorio{s}", "Inmueble rentable"),
+        "family-oriented": ("Amplia casa familiar de {bedrooms} dormitorio{s}", "Amplia casa familiar"),
+        "modern": ("Vivienda moderna de {bedrooms} dormitorio{s}", "Vivienda moderna"),
+        "classic": ("Vivienda clásica de {bedrooms} dormitorio{s}", "Vivienda clásica"),
+        "youthful": ("Vivienda luminosa de {bedrooms} dormitorio{s}", "Vivienda luminosa"),
+    },
+    "pt": {
+        "default": ("Imóvel de {bedrooms} quarto{s}", "Imóvel"),
+        "luxury": ("Residência exclusiva de {bedrooms} quarto{s}", "Residência exclusiva"),
+        "investor-focused": ("Imóvel rentável de {bedrooms} quarto{s}", "Imóvel rentável"),
+        "family-oriented": ("Casa familiar espaçosa de {bedrooms} quarto{s}", "Casa familiar espaçosa"),
+        "modern": ("Imóvel moderno de {bedrooms} quarto{s}", "Imóvel moderno"),
+        "classic": ("Imóvel clássico de {bedrooms} quarto{s}", "Imóvel clássico"),
+        "youthful": ("Imóvel luminoso de {bedrooms} quarto{s}", "Imóvel luminoso"),
+    },
+}
+
+# Location and listing type suffixes of the H1
+H1_SUFFIXES = {
+    "en": {"place": " in {place}", "sale": " for sale", "rent": " for rent"},
+    "es": {"place": " en {place}", "sale": " en venta", "rent": " en alquiler"},
+    "pt": {"place": " em {place}", "sale": " à venda", "rent": " para arrendar"},
+}
+
+# The H1 agent keeps headings under this length
+MAX_H1_LENGTH = 70
+
+
+def _plural(value: Any) -> str:
+    return "" if value == 1 else "s"
+
+
+def _feature_phrases(language: str, tone: str) -> Dict[str, str]:
+    tables = KEY_FEATURE_PHRASES.get(language, KEY_FEATURE_PHRASES["en"])
+    return {**tables["default"], **tables.get(tone, {})}
+
+
+def render_key_features(property_data: Mapping[str, Any], language: str = "en", tone: str = "family-oriented") -> str:
+    """
+    Render the key features as a hyphenated list, like the key features agent's output.
+
+    Args:
+        property_data: Structured property data
+        language: Target language code (en, es, pt)
+        tone: Target tone code
+
+    Returns:
+        Up to MAX_KEY_FEATURES lines in KEY_FEATURE_ORDER; false or missing features are left out
+    """
+    phrases = _feature_phrases(language=language, tone=tone)
+    features = property_data.get("features") or {}
+    lines: List[str] = []
+    for key in KEY_FEATURE_ORDER:
+        value = features.get(key)
+        # 0 is a value (a ground floor), unlike None, "" and False
+        if value is None or value is False or value == "":
+            continue
+        lines.append(f"- {phrases[key].format(value=value, s=_plural(value))}")
+    return "\n".join(lines[:MAX_KEY_FEATURES])
+
+
+def render_h1(property_data: Mapping[str, Any], language: str = "en", tone: str = "family-oriented") -> str:
+    """
+    Render the H1 from the tone phrase, the bedroom count, the location and the listing type.
+
+    The first of these that fits in MAX_H1_LENGTH characters is returned: neighborhood and city,
+    neighborhood only, city only, then no location, each tried with the listing type first. So the
+    listing type goes before any location detail, then the city, then the neighborhood.
+
+    Args:
+        property_data: Structured property data
+        language: Target language code (en, es, pt)
+        tone: Target tone code
+
+    Returns:
+        The heading text, without HTML tags
+    """
+    tables = H1_PHRASES.get(language, H1_PHRASES["en"])
+    suffixes = H1_SUFFIXES.get(language, H1_SUFFIXES["en"])
+    with_bedrooms, without_bedrooms = tables.get(tone, tables["default"])
+    bedrooms = (property_data.get("features") or {}).get("bedrooms")
+    heading = with_bedrooms.format(bedrooms=bedrooms, s=_plural(bedrooms)) if bedrooms else without_bedrooms
+    location = property_data.get("location") or {}
+    places = [
+        ", ".join(str(location[key]) for key in keys if location.get(key))
+        for keys in (("neighborhood", "city"), ("neighborhood",), ("city",))
+    ]
+    listing_type = suffixes.get(str(property_data.get("listing_type") or ""), "")
+    candidates = [
+        heading + (suffixes["place"].format(place=place) if place else "") + suffix
+        for place in places + [""]
+        for suffix in (listing_type, "")
+    ]
+    return next((candidate for candidate in candidates if len(candidate) <= MAX_H1_LENGTH), heading)
+
+
+TEMPLATE_RENDERERS: Dict[str, Callable[..., str]] = {
+    "key_features": render_key_features,
+    "h1": render_h1,
+}
+
+
+def render_section(section: str, property_data: Mapping[str, Any], language: str = "en", tone: str = "family-oriented") -> str:
+    """
+    Render a section from its template.
+
+    Raises:
+        KeyError: If the section has no template (see TEMPLATE_SECTIONS)
+    """
+    return TEMPLATE_RENDERERS[section](property_data=property_data, language=language, tone=tone)
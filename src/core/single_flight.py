@@ -0,0 +1,123 @@
+"""
+In-flight deduplication ("single flight") of identical concurrent work.
+
+Re-saves in the CMS, double clicks in the Gradio UI and retried webhooks submit the same listing
+several times while the first generation is still running, and every submission used to run the
+whole multi-minute pipeline. A SingleFlight group runs one job per key at a time: callers that
+arrive while a job with their key is in flight await the same task instead of starting their own.
+Nothing is cached once the job settles, so a later request always starts fresh work.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+def canonical_key(*parts: Any) -> str:
+    """
+    Hash JSON-like values into a key that does not depend on dict ordering.
+
+    Args:
+        parts: Values identifying the work (property data, language, tone, model...)
+
+    Returns:
+        Hex SHA-256 digest of the canonical JSON encoding of the parts
+    """
+    encoded = json.dumps(list(parts), sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """
+    Group of in-flight jobs keyed by canonical_key.
+
+    The job runs in its own task, so a caller that is cancelled (a closed browser tab) does not
+    cancel the work other callers are waiting on; the task is only cancelled once every caller
+    waiting on it has gone.
+    """
+
+    def __init__(self, name: str):
+        """
+        Initialize an empty group.
+
+        Args:
+            name: Name used in logs and stats
+        """
+        self.name = name
+        self.logger = logging.getLogger(__name__)
+        self._in_flight: Dict[str, "asyncio.Task[Any]"] = {}
+        self._waiters: Dict[str, int] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Metrics
+        self._calls = 0
+        self._coalesced = 0
+
+    async def run(self, key: str, job: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run the job, or join the identical job already in flight.
+
+        Args:
+            key: Identity of the work, usually from canonical_key
+            job: Zero-argument coroutine factory performing the work
+
+        Returns:
+            Whatever the job returns; every caller of a coalesced job gets the same object, and
+            the same exception if it fails
+        """
+        self._bind_loop()
+        self._calls += 1
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(job())
+            self._in_flight[key] = task
+            self._waiters[key] = 0
+            task.add_done_callback(lambda _: self._forget(key=key, task=task))
+        else:
+            self._coalesced += 1
+            self.logger.info(f"Joining in-flight {self.name} job {key[:12]}")
+        self._waiters[key] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done() and self._waiters.get(key) == 1:
+                task.cancel()
+            raise
+        finally:
+            if self._in_flight.get(key) is task:
+                self._waiters[key] -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the calls seen so far and how many of them joined a job already in flight."""
+        return {"calls": self._calls, "coalesced": self._coalesced, "in_flight": len(self._in_flight)}
+
+    def _forget(self, key: str, task: "asyncio.Task[Any]") -> None:
+        """Drop a settled job so the next request for its key starts new work."""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+            del self._waiters[key]
+        if not task.cancelled():
+            # Retrieve the exception so a job nobody awaits any more does not log "never retrieved"
+            task.exception()
+
+    def _bind_loop(self) -> None:
+        """Start with an empty group on a new event loop (tasks cannot be awaited across loops)."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._in_flight.clear()
+            self._waiters.clear()
+
+
+_groups: Dict[str, SingleFlight] = {}
+
+
+def get_single_flight(name: str) -> SingleFlight:
+    """Get the process-wide group of the given name, shared by every generator and agent."""
+    if name not in _groups:
+        _groups[name] = SingleFlight(name=name)
+    return _groups[name]
@@ -0,0 +1,180 @@
+"""
+Process-pool offload of the CPU-bound evaluation of many listings.
+
+LLM calls are I/O and share one event loop well, but seokar parsing, dictionary lookups,
+readability and the rule-based fact check are pure CPU and, in one process, compete with the loop
+for a single core. ProcessPoolEvaluator runs those checks (every check outside LLM_CHECKS) for many
+listings in parallel worker processes. Workers are warmed up by an initializer that maps the spell
+dictionaries and builds the language profile and the evaluators once; jobs ship only the section
+text and the listing facts, and results come back as compact named tuples.
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from config.options import BATCH_EVALUATION_OPTIONS, LANGUAGE_OPTIONS, get_language_name
+from core.finding_router import normalize_finding
+from core.listing_document import ListingDocument
+from .complete_evaluator import CompleteEvaluator
+from .language_id import get_language_identifier
+from .spell_dictionary import get_spell_dictionary
+
+
+class EvaluationJob(NamedTuple):
+    """One listing to evaluate: its section texts and the facts the rule checks need."""
+
+    listing_id: str
+    sections: Dict[str, str]
+    language: str = "en"
+    property_data: Optional[Dict[str, Any]] = None
+
+
+class CompactFinding(NamedTuple):
+    """A finding reduced by normalize_finding."""
+
+    type: str
+    severity: str
+    message: str
+
+
+class SectionResult(NamedTuple):
+    """Outcome of one section's local checks."""
+
+    section: str
+    score: float
+    passed: bool
+    # (check name, score, passed) in run order
+    checks: Tuple[Tuple[str, float, bool], ...]
+    findings: Tuple[CompactFinding, ...]
+
+
+class ListingResult(NamedTuple):
+    """Outcome of one listing's local checks."""
+
+    listing_id: str
+    passed: bool
+    failed_sections: Tuple[str, ...]
+    sections: Tuple[SectionResult, ...]
+
+
+# Evaluator of the current worker process, built by _initialize_worker
+_WORKER_EVALUATOR: Optional[CompleteEvaluator] = None
+
+
+def _initialize_worker(languages: Sequence[str], short_circuit: str) -> None:
+    """Build the worker's evaluator and load everything its first job would otherwise pay for."""
+    global _WORKER_EVALUATOR
+    _WORKER_EVALUATOR = CompleteEvaluator(short_circuit=short_circuit)
+    get_language_identifier()
+    for language in languages:
+        get_spell_dictionary(language=LANGUAGE_OPTIONS.get(language, {}).get("spell_check_code", language))
+
+
+def _compact_section(section: str, result: Dict[str, Any]) -> SectionResult:
+    findings = []
+    for finding in result["findings"]:
+        compact = normalize_finding(finding=finding)
+        findings.append(CompactFinding(type=compact["type"], severity=compact["severity"], message=compact["message"]))
+    return SectionResult(
+        section=section,
+        score=float(result["score"]),
+        passed=bool(result["passed"]),
+        checks=tuple(
+            (name, float(check.get("score", 0.0)), bool(check.get("passed", True)))
+            for name, check in result["evaluations"].items()
+        ),
+        findings=tuple(findings),
+    )
+
+
+def evaluate_job(job: EvaluationJob, evaluator: Optional[CompleteEvaluator] = None) -> ListingResult:
+    """
+    Run the local checks of one listing; this is what each worker executes.
+
+    Args:
+        job: Listing to evaluate
+        evaluator: Evaluator to use (the worker's own when omitted)
+
+    Must not be called from a running event loop; use ProcessPoolEvaluator.evaluate_listings there.
+
+    Returns:
+        The compact listing result
+    """
+    if evaluator is None:
+        if _WORKER_EVALUATOR is None:
+            # Running in-process: warm up once, like a worker
+            _initialize_worker(languages=[job.language], short_circuit="never")
+        if _WORKER_EVALUATOR is None:
+            raise RuntimeError("The worker evaluator was not initialized")
+        evaluator = _WORKER_EVALUATOR
+    evaluation = asyncio.run(
+        evaluator.evaluate_sections(
+            document=ListingDocument(sections=job.sections, language=job.language),
+            property_data=job.property_data,
+            language=job.language,
+            language_name=get_language_name(code=job.language),
+            sections=list(job.sections),
+            local_only=True,
+        )
+    )
+    return ListingResult(
+        listing_id=job.listing_id,
+        passed=not evaluation["needs_improvement"],
+        failed_sections=tuple(evaluation["failed_sections"]),
+        sections=tuple(_compact_section(section, result) for section, result in evaluation["sections"].items()),
+    )
+
+
+class ProcessPoolEvaluator:
+    """
+    Evaluate many listings with the non-LLM checks across all cores.
+
+    Use it as a context manager, or call close() when the batch is done.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        languages: Optional[Sequence[str]] = None,
+        short_circuit: str = "never",
+        start_method: Optional[str] = None,
+    ) -> None:
+        """
+        Start the worker processes.
+
+        Args:
+            max_workers: Number of worker processes (default from BATCH_EVALUATION_OPTIONS, 0 = one per core)
+            languages: Languages whose dictionaries the workers preload (all supported languages if omitted)
+            short_circuit: Short-circuit policy of the workers' evaluators; "never" reports every check
+            start_method: multiprocessing start method (default from BATCH_EVALUATION_OPTIONS)
+        """
+        max_workers = BATCH_EVALUATION_OPTIONS["max_workers"] if max_workers is None else max_workers
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context(start_method or str(BATCH_EVALUATION_OPTIONS["start_method"])),
+            initializer=_initialize_worker,
+            initargs=(list(languages or LANGUAGE_OPTIONS), short_circuit),
+        )
+
+    async def evaluate_listings(self, jobs: Sequence[EvaluationJob]) -> List[ListingResult]:
+        """Evaluate the jobs in the worker processes without blocking the event loop; results keep job order."""
+        loop = asyncio.get_running_loop()
+        return list(await asyncio.gather(*[loop.run_in_executor(self.executor, evaluate_job, job) for job in jobs]))
+
+    def map(self, jobs: Sequence[EvaluationJob], chunksize: int = 1) -> List[ListingResult]:
+        """Evaluate the jobs from synchronous code (scripts, audits); results keep job order."""
+        return list(self.executor.map(evaluate_job, jobs, chunksize=chunksize))
+
+    def close(self) -> None:
+        """Shut the worker processes down."""
+        self.executor.shutdown(wait=True)
+
+    def __enter__(self) -> "ProcessPoolEvaluator":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
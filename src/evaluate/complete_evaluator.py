@@ -1,13 +1,62 @@
-from typing import Dict, Any, List
-import re
+from typing import Dict, Any, List, Optional, Awaitable, Callable, Set, Tuple, Type, Union
+from dataclasses import dataclass
+import asyncio
+import time
+from config.options import EVALUATION_OPTIONS, LANGUAGE_MATCH_OPTIONS
+from core.listing_document import ListingDocument
+from core.finding_router import SEO_ELEMENT_SECTIONS
 from .seo import SeoEvaluator
 from .language import (
     LanguageMatchEvaluator2,
+    NgramLanguageMatchEvaluator,
     ToneMatchEvaluator,
     SpellingEvaluator,
     ReadabilityEvaluator,
 )
-from .fact import FactEvaluator
+from .fact import FactEvaluator, RuleFactEvaluator
+from .spelling_whitelist import build_spelling_whitelist
+
+# Cost tier of every check: rule validators, the language check, readability, seokar, then the
+# checks that may call an LLM. Checks run cheapest first.
+CHECK_COSTS = {"facts": 0, "language_match": 1, "readability": 2, "seo": 3, "tone_match": 4}
+
+# Checks that may call an LLM
+LLM_CHECKS = {"tone_match"}
+
+# Language check implementations selectable through LANGUAGE_MATCH_OPTIONS["method"]
+LANGUAGE_MATCH_METHODS: Dict[str, Type[Union[NgramLanguageMatchEvaluator, LanguageMatchEvaluator2]]] = {"ngram": NgramLanguageMatchEvaluator, "spellchecker": LanguageMatchEvaluator2}
+
+# Checks run on each section when it is evaluated on its own, in cost order. Headings are too short
+# for a reliable language check; SEO is judged from the document-level issues routed to the
+# section. The rule-based fact check costs microseconds and runs on every section that can state facts.
+SECTION_CHECKS = {
+    "title": ["facts", "seo"],
+    "meta": ["facts", "language_match", "seo"],
+    "h1": ["facts", "seo"],
+    "description": ["facts", "language_match", "readability", "seo", "tone_match"],
+    "key_features": ["facts", "language_match"],
+    "neighborhood": ["language_match", "readability"],
+    "call_to_action": ["facts", "language_match", "tone_match"],
+}
+
+# Short-circuit policies, from the most to the least thorough
+SHORT_CIRCUIT_POLICIES = ("never", "llm", "always")
+
+# Checks of the final whole-document evaluation
+DOCUMENT_CHECKS = ["facts", "language_match", "readability", "seo", "tone_match"]
+
+# Element types that depend on the whole document rather than on the section that owns them
+DOCUMENT_SEO_ELEMENTS = {"Headings Hierarchy", "Content Readability", "Content Quality"}
+
+
+@dataclass(frozen=True)
+class EvaluatorCheck:
+    """A registered check with the metadata used to order and skip it."""
+
+    name: str
+    run: Callable[..., Awaitable[Optional[Dict[str, Any]]]]
+    cost: int
+    uses_llm: bool = False
 
 
 class CompleteEvaluator:
@@ -16,66 +65,376 @@ class CompleteEvaluator:
     This replaces the evaluation logic from EvaluatorAgent to separate concerns.
     """
 
-    def __init__(self):
-        """Initialize all sub-evaluators."""
+    def __init__(
+        self, llm_fact_check: bool = False, short_circuit: Optional[str] = None, language_match: Optional[str] = None
+    ):
+        """
+        Initialize all sub-evaluators.
+
+        Args:
+            llm_fact_check: Send claims the rule-based fact checker cannot settle to the LLM fact checker
+            short_circuit: What to skip once a section check has failed and refinement is certain:
+                "never", "llm" (the LLM checks) or "always" (every remaining check). Defaults to
+                EVALUATION_OPTIONS["short_circuit"].
+            language_match: Language check implementation, "ngram" or "spellchecker". Defaults to
+                LANGUAGE_MATCH_OPTIONS["method"].
+        """
         self.seo_evaluator = SeoEvaluator()
         # self.language_match = LanguageMatchEvaluator()
-        self.language_match = LanguageMatchEvaluator2()
+        language_match = language_match or str(LANGUAGE_MATCH_OPTIONS["method"])
+        if language_match not in LANGUAGE_MATCH_METHODS:
+            raise ValueError(
+                f"Unsupported language match method: {language_match}. "
+                f"Supported methods are: {list(LANGUAGE_MATCH_METHODS)}"
+            )
+        self.language_match: Union[NgramLanguageMatchEvaluator, LanguageMatchEvaluator2] = LANGUAGE_MATCH_METHODS[language_match]()
         self.tone_match = ToneMatchEvaluator()
         self.spelling = SpellingEvaluator()
         self.readability = ReadabilityEvaluator()
         self.fact_evaluator = FactEvaluator()
+        self.rule_fact_evaluator = RuleFactEvaluator(
+            llm_second_stage=llm_fact_check, fact_checker_agent=self.fact_evaluator.fact_checker_agent
+        )
+        self.short_circuit = short_circuit or EVALUATION_OPTIONS["short_circuit"]
+        if self.short_circuit not in SHORT_CIRCUIT_POLICIES:
+            raise ValueError(
+                f"Unsupported short-circuit policy: {self.short_circuit}. "
+                f"Supported policies are: {list(SHORT_CIRCUIT_POLICIES)}"
+            )
+        self.checks: Dict[str, EvaluatorCheck] = {}
+        self.check_stats: Dict[str, Dict[str, Any]] = {}
+        self.cascade_stats = {"evaluations": 0, "short_circuited": 0}
+        # Sections that passed only because the spelling whitelist spared their listing words
+        self.whitelist_stats = {"section_evaluations": 0, "refinements_avoided": 0}
+        for name, cost in CHECK_COSTS.items():
+            self.register_check(
+                name=name, run=getattr(self, f"_check_{name}"), cost=cost, uses_llm=name in LLM_CHECKS
+            )
 
     async def evaluate_html_complete(
         self,
-        html_content: str,
-        property_data: Dict[str, Any],
+        html_content: Optional[str] = None,
+        property_data: Optional[Dict[str, Any]] = None,
         language: str = "en",
         language_name: str = "English",
         tone: str = "professional",
+        document: Optional[ListingDocument] = None,
     ) -> Dict[str, Any]:
         """
         Simplified: Only compile findings from sub-evaluators if relevant.
+
+        Sub-evaluators read the document's cached views (HTML, plain text, tokens), so the
+        HTML is never re-parsed per evaluator. Pass `document` when the sections are at hand;
+        `html_content` is only stripped once into a document otherwise. This is the final report,
+        so every check runs whatever the short-circuit policy.
+        """
+        document = document or ListingDocument.from_html(html_content=html_content or "", language=language)
+        evaluations, _ = await self._run_checks(
+            check_names=DOCUMENT_CHECKS,
+            short_circuit="never",
+            document=document,
+            target=document,
+            section=None,
+            property_data=property_data or {},
+            language=language,
+            language_name=language_name,
+            tone=tone,
+        )
+        findings = [finding for name in DOCUMENT_CHECKS for finding in evaluations[name].get("findings", [])]
+        evaluation: Dict[str, Any] = dict(evaluations)
+        evaluation.update(
+            all_findings=findings,
+            needs_improvement=not all(result.get("passed", True) for result in evaluations.values()),
+        )
+        return evaluation
+
+    async def evaluate_sections(
+        self,
+        document: ListingDocument,
+        property_data: Optional[Dict[str, Any]] = None,
+        language: str = "en",
+        language_name: str = "English",
+        tone: str = "professional",
+        sections: Optional[List[str]] = None,
+        local_only: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Evaluate each section on its own with the checks listed in SECTION_CHECKS.
+
+        Args:
+            document: Listing document holding the sections
+            property_data: Property data for the fact checks (skipped when omitted)
+            language: Target language code
+            language_name: Target language display name
+            tone: Target tone
+            sections: Sections to evaluate (all sections in SECTION_CHECKS if omitted)
+            local_only: Leave out the checks that may call an LLM (LLM_CHECKS), e.g. in worker processes
+
+        Returns:
+            Dict with per-section results under "sections" (each with "score", "passed",
+            "evaluations", "findings" and "content"), plus "all_findings" tagged with their
+            section, "failed_sections" and "needs_improvement"
+        """
+        sections = [section for section in (sections or SECTION_CHECKS) if section in SECTION_CHECKS]
+
+        # SEO needs the whole document; run it once and route each issue to its section
+        seo_findings: Dict[str, List[Dict[str, Any]]] = {}
+        if any("seo" in SECTION_CHECKS[section] for section in sections):
+            seo_findings = await self._route_seo_findings(document=document)
+
+        results = await asyncio.gather(
+            *[
+                self._evaluate_section(
+                    document=document,
+                    section=section,
+                    property_data=property_data,
+                    language=language,
+                    language_name=language_name,
+                    tone=tone,
+                    seo_findings=seo_findings.get(section, []),
+                    local_only=local_only,
+                )
+                for section in sections
+            ]
+        )
+        section_results = dict(zip(sections, results))
+        failed_sections = [section for section, result in section_results.items() if not result["passed"]]
+        return {
+            "sections": section_results,
+            "all_findings": [finding for result in results for finding in result["findings"]],
+            "failed_sections": failed_sections,
+            "needs_improvement": bool(failed_sections),
+        }
+
+    async def evaluate_section(
+        self,
+        document: ListingDocument,
+        section: str,
+        language: str = "en",
+        language_name: str = "English",
+        tone: str = "professional",
+        document_findings: Optional[List[Dict[str, Any]]] = None,
+        property_data: Optional[Dict[str, Any]] = None,
+        local_only: bool = False,
+    ) -> Dict[str, Any]:
         """
+        Evaluate one section as soon as it is ready, without waiting for the other sections.
+
+        Only SEO issues local to the section's own element are checked here; issues that depend on
+        the whole document come from evaluate_document_checks once every section has settled and are
+        passed back in through `document_findings`.
 
-        seo_results = await self.seo_evaluator.evaluate(html_content=html_content)
-        # Extraer texto plano
-        text = re.sub(pattern=r"<[^>]+>", repl="", string=html_content)
-        text = " ".join(text.split())
+        Args:
+            document: Current listing document (other sections may still be drafts)
+            section: Section to evaluate
+            language: Target language code
+            language_name: Target language display name
+            tone: Target tone
+            document_findings: Document-level findings already routed to this section
+            property_data: Property data for the fact check (skipped when omitted)
+            local_only: Leave out the checks that may call an LLM (LLM_CHECKS)
 
-        # language_results = await self.language_match.evaluate(text=text, target_language=language_name)
-        language_results = self.language_match.evaluate(
-            text=text, language_code=language, target_language=language_name
+        Returns:
+            The section result, shaped like the entries of evaluate_sections()["sections"]
+        """
+        return await self._evaluate_section(
+            document=document,
+            section=section,
+            property_data=property_data,
+            language=language,
+            language_name=language_name,
+            tone=tone,
+            seo_findings=None,
+            document_findings=document_findings,
+            local_only=local_only,
         )
-        tone_results = await self.tone_match.evaluate(text=text, target_tone=tone)
-        # spelling_results = self.spelling.evaluate(text=text, language_code=language)
-        readability_results = self.readability.evaluate(text=text, language_code=language)
-        # fact_results = await self.fact_evaluator.evaluate(html_content=html_content, property_data=property_data)
-
-        findings = (
-            language_results.get("findings", [])
-            + tone_results.get("findings", [])
-            # + spelling_results.get("findings", [])
-            + readability_results.get("findings", [])
-            # + fact_results.get("findings", []),
-            + seo_results.get("findings", [])
+
+    async def evaluate_document_checks(self, document: ListingDocument) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Run the checks that need the complete document and route their findings to sections.
+
+        Returns:
+            Findings keyed by the section that should fix them
+        """
+        return await self._route_seo_findings(document=document, element_types=DOCUMENT_SEO_ELEMENTS)
+
+    async def _route_seo_findings(
+        self, document: ListingDocument, element_types: Optional[Set[str]] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Run seokar on the document and group its issues by owning section."""
+        routed: Dict[str, List[Dict[str, Any]]] = {}
+        seo_results = await self.seo_evaluator.evaluate(document=document)
+        for finding in seo_results.get("findings", []):
+            element_type = finding.get("element_type")
+            section = SEO_ELEMENT_SECTIONS.get(element_type)
+            if section and (element_types is None or element_type in element_types):
+                routed.setdefault(section, []).append(finding)
+        return routed
+
+    async def _evaluate_section(
+        self,
+        document: ListingDocument,
+        section: str,
+        property_data: Optional[Dict[str, Any]],
+        language: str,
+        language_name: str,
+        tone: str,
+        seo_findings: Optional[List[Dict[str, Any]]],
+        document_findings: Optional[List[Dict[str, Any]]] = None,
+        local_only: bool = False,
+    ) -> Dict[str, Any]:
+        """Run the section's checks on its own text, cheapest first, and combine them."""
+        evaluations, skipped = await self._run_checks(
+            check_names=[name for name in SECTION_CHECKS[section] if not (local_only and name in LLM_CHECKS)],
+            short_circuit=self.short_circuit,
+            document=document,
+            target=document.section_document(section_name=section),
+            section=section,
+            property_data=property_data,
+            language=language,
+            language_name=language_name,
+            tone=tone,
+            seo_findings=seo_findings,
+            document_findings=document_findings,
         )
-        needs_improvement = not (
-            language_results.get("passed", True)
-            and tone_results.get("passed", True)
-            # and spelling_results.get("passed", True)
-            and readability_results.get("passed", True)
-            # and fact_results.get("passed", True)
-            and seo_results.get("passed", True)
+        findings = [
+            dict(finding, section=section) for result in evaluations.values() for finding in result.get("findings", [])
+        ]
+        passed = all(result.get("passed", True) for result in evaluations.values())
+        self.whitelist_stats["section_evaluations"] += 1
+        self.whitelist_stats["refinements_avoided"] += int(
+            passed and any(result.get("whitelist_rescued") for result in evaluations.values())
         )
-        evaluation = {
-            "seo": seo_results,
-            "language_match": language_results,
-            "tone_match": tone_results,
-            # "spelling": spelling_results,
-            "readability": readability_results,
-            # "facts": fact_results,
-            "all_findings": findings,
-            "needs_improvement": needs_improvement,
+        return {
+            "section": section,
+            "content": document.section_text.get(section, ""),
+            "score": sum(result.get("score", 0.0) for result in evaluations.values()) / max(1, len(evaluations)),
+            "passed": passed,
+            "evaluations": evaluations,
+            "skipped_checks": skipped,
+            "findings": findings,
         }
-        return evaluation
+
+    def register_check(
+        self, name: str, run: Callable[..., Awaitable[Optional[Dict[str, Any]]]], cost: int, uses_llm: bool = False
+    ) -> None:
+        """
+        Register a check that SECTION_CHECKS and DOCUMENT_CHECKS can refer to.
+
+        Args:
+            name: Check name
+            run: Coroutine function taking the check inputs as keyword arguments and returning a
+                standardized result, or None when the check does not apply
+            cost: Cost tier (see CHECK_COSTS); cheaper checks run first
+            uses_llm: Whether the check calls an LLM (skipped first by the "llm" policy)
+        """
+        self.checks[name] = EvaluatorCheck(name=name, run=run, cost=cost, uses_llm=uses_llm)
+        self.check_stats[name] = {"runs": 0, "failures": 0, "skipped": 0, "seconds": 0.0}
+
+    async def _run_checks(
+        self, check_names: List[str], short_circuit: str, **inputs: Any
+    ) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+        """
+        Run checks in cost order, skipping the remaining ones when the policy says the target will be
+        refined anyway.
+
+        Returns:
+            The results keyed by check name (in run order) and the names of the skipped checks
+        """
+        evaluations: Dict[str, Dict[str, Any]] = {}
+        skipped: List[str] = []
+        failed = False
+        for check in sorted((self.checks[name] for name in check_names), key=lambda check: check.cost):
+            stats = self.check_stats[check.name]
+            if failed and (short_circuit == "always" or (short_circuit == "llm" and check.uses_llm)):
+                skipped.append(check.name)
+                stats["skipped"] += 1
+                continue
+            start = time.perf_counter()
+            result = await check.run(**inputs)
+            if result is None:
+                continue
+            stats["seconds"] += time.perf_counter() - start
+            stats["runs"] += 1
+            passed = result.get("passed", True)
+            stats["failures"] += int(not passed)
+            evaluations[check.name] = result
+            failed = failed or not passed
+        self.cascade_stats["evaluations"] += 1
+        self.cascade_stats["short_circuited"] += int(bool(skipped))
+        return evaluations, skipped
+
+    def get_check_stats(self) -> Dict[str, Any]:
+        """Get each check's run count, mean wall-clock latency, failure count and short-circuit rate."""
+        checks = {}
+        for name, stats in self.check_stats.items():
+            considered = stats["runs"] + stats["skipped"]
+            checks[name] = {
+                "runs": stats["runs"],
+                "failures": stats["failures"],
+                "skipped": stats["skipped"],
+                "mean_ms": 1000 * stats["seconds"] / stats["runs"] if stats["runs"] else None,
+                "short_circuit_rate": stats["skipped"] / considered if considered else None,
+            }
+        return dict(self.cascade_stats, policy=self.short_circuit, checks=checks)
+
+    def get_whitelist_stats(self) -> Dict[str, Any]:
+        """
+        Get how often the spelling whitelist changed a verdict, accumulated over every listing evaluated.
+
+        "refinements_avoided" counts section evaluations that passed only because whitelisted words were
+        not reported as unknown, each of which would otherwise have started a refinement round.
+        """
+        return dict(self.whitelist_stats, checks={"language_match": dict(self.language_match.whitelist_stats)})
+
+    async def _check_facts(
+        self, target: ListingDocument, property_data: Optional[Dict[str, Any]], language: str, **kwargs: Any
+    ) -> Optional[Dict[str, Any]]:
+        if property_data is None:
+            return None
+        return await self.rule_fact_evaluator.evaluate(document=target, property_data=property_data, language=language)
+
+    async def _check_language_match(
+        self,
+        target: ListingDocument,
+        language: str,
+        language_name: str,
+        property_data: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        return self.language_match.evaluate(
+            document=target,
+            language_code=language,
+            target_language=language_name,
+            whitelist=build_spelling_whitelist(property_data=property_data, language=language),
+        )
+
+    async def _check_readability(self, target: ListingDocument, language: str, **kwargs: Any) -> Dict[str, Any]:
+        return self.readability.evaluate(document=target, language_code=language)
+
+    async def _check_seo(
+        self,
+        document: ListingDocument,
+        section: Optional[str] = None,
+        seo_findings: Optional[List[Dict[str, Any]]] = None,
+        document_findings: Optional[List[Dict[str, Any]]] = None,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        if section is None:
+            return await self.seo_evaluator.evaluate(document=document)
+        if seo_findings is None:
+            # Only issues local to the section's own element; document-level ones arrive as document_findings
+            local_findings = await self._route_seo_findings(
+                document=document, element_types=set(SEO_ELEMENT_SECTIONS) - DOCUMENT_SEO_ELEMENTS
+            )
+            seo_findings = local_findings.get(section, [])
+        findings = seo_findings + list(document_findings or [])
+        return {
+            "evaluator": "SeoEvaluator",
+            "score": max(0.0, 1.0 - 0.25 * len(findings)),
+            "passed": not findings,
+            "findings": findings,
+        }
+
+    async def _check_tone_match(self, target: ListingDocument, language: str, tone: str, **kwargs: Any) -> Dict[str, Any]:
+        return await self.tone_match.evaluate(document=target, target_tone=tone, language=language)
@@ -1,8 +1,156 @@
-from typing import Dict, List, Any
-import asyncio
+from typing import Dict, Any, List, Optional, Pattern, Tuple
+import re
 from agents.evaluation.fact_checker_agent import FactCheckerAgent
+from core.listing_document import ListingDocument
+from core.property_facts import render_fact
 from .base_evaluator import BaseEvaluator
 
+# Spelled-out numbers and ordinals the rules understand (lowercase)
+NUMBER_WORDS = {
+    "en": {"one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10},
+    "es": {
+        "un": 1,
+        "uno": 1,
+        "una": 1,
+        "dos": 2,
+        "tres": 3,
+        "cuatro": 4,
+        "cinco": 5,
+        "seis": 6,
+        "siete": 7,
+        "ocho": 8,
+        "nueve": 9,
+        "diez": 10,
+    },
+    "pt": {
+        "um": 1,
+        "uma": 1,
+        "dois": 2,
+        "duas": 2,
+        "três": 3,
+        "quatro": 4,
+        "cinco": 5,
+        "seis": 6,
+        "sete": 7,
+        "oito": 8,
+        "nove": 9,
+        "dez": 10,
+    },
+}
+ORDINAL_WORDS = {
+    "en": {"first": 1, "second": 2, "third": 3, "fourth": 4, "fifth": 5, "sixth": 6, "seventh": 7, "eighth": 8},
+    "es": {"primer": 1, "primero": 1, "segundo": 2, "tercer": 3, "tercero": 3, "cuarto": 4, "quinto": 5, "sexto": 6},
+    "pt": {"primeiro": 1, "segundo": 2, "terceiro": 3, "quarto": 4, "quinto": 5, "sexto": 6},
+}
+
+# Words for "one" that double as indefinite articles: "un baño en suite" names a feature, it does not
+# count bathrooms, so they are never read as numbers
+ARTICLE_WORDS = {"en": (), "es": ("un", "una"), "pt": ("um", "uma")}
+
+# Numeric fact patterns per language; every pattern captures the claimed number as "value" ("one" as
+# "one"). {count} is a number before the noun with at most one word in between ("3 spacious bedrooms");
+# a word meaning one must sit directly before the noun ("one bedroom", not "one spacious bedroom suite").
+_NUMBER = r"\d+(?:[.,]\d+)*"
+_YEAR = r"(?:18|19|20)\d{2}"
+_SCALE = r"(?P<scale>k|mil|m|million|millones|millón|milhões|milhão)"
+_PRICE_PATTERNS = [
+    rf"(?:US\$|R\$|[$€£])\s?(?P<value>{_NUMBER})(?:\s?{_SCALE})?\b",
+    rf"\b(?P<value>{_NUMBER})(?:\s?{_SCALE})?\s?(?:€|euros?|dollars|dólares|reais|usd|eur)\b",
+]
+FACT_PATTERNS = {
+    "en": {
+        "bedrooms": [r"\b{count}(?:bed(?:room)?s?|br)\b"],
+        "bathrooms": [r"\b{count}bath(?:room)?s?\b"],
+        "area_sqm": [r"\b(?P<value>{number})\s*(?:m²|m2\b|sq\.?\s?m\b|sqm\b|square\s+met(?:er|re)s?)"],
+        "floor": [
+            r"\b(?P<value>\d+)(?:st|nd|rd|th)?[\s-]+floor\b",
+            r"\bfloor\s+(?P<value>\d+)\b",
+            r"\b(?P<value>{ordinal})[\s-]+floor\b",
+        ],
+        "year_built": [rf"\b(?:built|constructed|completed)\s+(?:in\s+)?(?P<value>{_YEAR})\b"],
+        "price": _PRICE_PATTERNS,
+    },
+    "es": {
+        "bedrooms": [r"\b{count}(?:dormitorios?|habitaciones?|recámaras?)\b"],
+        "bathrooms": [r"\b{count}baños?\b"],
+        "area_sqm": [r"\b(?P<value>{number})\s*(?:m²|m2\b|metros\s+cuadrados)"],
+        "floor": [
+            r"\b(?:piso|planta)\s+(?P<value>\d+)\b",
+            r"\b(?P<value>\d+)\s*[ºª°o]?\s+(?:piso|planta)\b",
+            r"\b(?P<value>{ordinal})\s+(?:piso|planta)\b",
+        ],
+        "year_built": [rf"\bconstruid[oa]s?\s+en\s+(?:el\s+(?:año\s+)?)?(?P<value>{_YEAR})\b"],
+        "price": _PRICE_PATTERNS,
+    },
+    "pt": {
+        "bedrooms": [r"\b{count}(?:quartos?|dormitórios?)\b"],
+        "bathrooms": [r"\b{count}(?:banheiros?|casas\s+de\s+banho)\b"],
+        "area_sqm": [r"\b(?P<value>{number})\s*(?:m²|m2\b|metros\s+quadrados)"],
+        "floor": [
+            r"\bandar\s+(?P<value>\d+)\b",
+            r"\b(?P<value>\d+)\s*[ºª°o]?\s+andar\b",
+            r"\b(?P<value>{ordinal})\s+andar\b",
+        ],
+        "year_built": [rf"\bconstruíd[oa]s?\s+em\s+(?P<value>{_YEAR})\b"],
+        "price": _PRICE_PATTERNS,
+    },
+}
+
+# Boolean feature mentions and the words that negate them
+BOOLEAN_PATTERNS = {
+    "en": {"balcony": r"balcon(?:y|ies)", "parking": r"parking|garage", "elevator": r"elevators?"},
+    "es": {
+        "balcony": r"balc[oó]n(?:es)?",
+        "parking": r"estacionamiento|aparcamiento|garaje|cochera",
+        "elevator": r"ascensor(?:es)?|elevador(?:es)?",
+    },
+    "pt": {"balcony": r"varandas?|sacadas?", "parking": r"estacionamento|garagem", "elevator": r"elevador(?:es)?"},
+}
+# Negation cues, the words that make a cue something else ("not just a balcony") and the
+# conjunctions that close its scope ("no garden but a balcony")
+NEGATION_WORDS = {"en": ("no", "without", "not", "lacks?"), "es": ("sin", "no"), "pt": ("sem", "não")}
+NEGATION_EXCEPTIONS = {"en": ("just", "only"), "es": ("solo", "sólo", "solamente"), "pt": ("só", "apenas", "somente")}
+SCOPE_CONJUNCTIONS = {"en": ("but", "yet"), "es": ("pero", "sino"), "pt": ("mas", "porém")}
+# A negation covers a mention at most two words later, within the same clause: sentence ends,
+# semicolons, commas and the conjunctions above close it
+NEGATION_PATTERNS = {
+    language: (
+        rf"\b(?:{'|'.join(NEGATION_WORDS[language])})\b(?!\s+(?:{'|'.join(NEGATION_EXCEPTIONS[language])})\b)"
+        rf"(?:[^\w.!?;,]+(?!(?:{'|'.join(SCOPE_CONJUNCTIONS[language])})\b)\w+){{0,2}}[^\w.!?;,]*$"
+    )
+    for language in NEGATION_WORDS
+}
+
+# Relative tolerance when comparing claimed and actual values (exact match otherwise)
+FACT_TOLERANCES = {"area_sqm": 0.05, "price": 0.01}
+_SCALES = {"k": 1e3, "mil": 1e3, "m": 1e6, "million": 1e6, "millones": 1e6, "millón": 1e6, "milhões": 1e6, "milhão": 1e6}
+_THOUSANDS_PATTERN = re.compile(r"^\d{1,3}(?:([.,])\d{3})(?:\1\d{3})*$")
+
+
+def _compile_patterns(language: str) -> Tuple[Dict[str, List[Pattern[str]]], Dict[str, Pattern[str]], Pattern[str]]:
+    """Compile the fact, boolean and negation patterns of one language."""
+    words = {word: value for word, value in NUMBER_WORDS[language].items() if word not in ARTICLE_WORDS[language]}
+    number = "|".join([_NUMBER, *words])
+    ones = "|".join(word for word, value in words.items() if value == 1)
+    many = "|".join([_NUMBER, *(word for word, value in words.items() if value != 1)])
+    count = rf"(?:(?P<value>{many})(?:\s*-\s*|\s+)(?:\w+\s+)?" + (rf"|(?P<one>{ones})(?:\s*-\s*|\s+)" if ones else "") + ")"
+    ordinals = "|".join(ORDINAL_WORDS[language])
+    facts = {
+        key: [
+            re.compile(
+                pattern.replace("{count}", count).replace("{number}", number).replace("{ordinal}", ordinals), re.IGNORECASE
+            )
+            for pattern in patterns
+        ]
+        for key, patterns in FACT_PATTERNS[language].items()
+    }
+    booleans = {key: re.compile(rf"\b(?:{pattern})\b", re.IGNORECASE) for key, pattern in BOOLEAN_PATTERNS[language].items()}
+    return facts, booleans, re.compile(NEGATION_PATTERNS[language], re.IGNORECASE)
+
+
+# Compiled once at import so a check is a handful of regex scans
+_COMPILED = {language: _compile_patterns(language) for language in FACT_PATTERNS}
+
 
 class FactEvaluator(BaseEvaluator):
     """Evaluator for fact accuracy using LLM-based fact checking."""
@@ -10,25 +158,177 @@ class FactEvaluator(BaseEvaluator):
     def __init__(self):
         self.fact_checker_agent = FactCheckerAgent()
 
-    async def evaluate(self, html_content: str, property_data: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+    async def evaluate(
+        self,
+        html_content: Optional[str] = None,
+        property_data: Optional[Dict[str, Any]] = None,
+        document: Optional[ListingDocument] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
         """
         Evaluate factual accuracy of HTML content against property data.
 
         Args:
-            html_content: HTML content to verify
+            html_content: HTML content to verify (ignored when document is given)
             property_data: Property data to compare against
+            document: Listing document whose plain text is verified
             **kwargs: Additional parameters
 
         Returns:
             Standardized evaluation results dictionary
         """
-        # Extract text content from HTML
-        import re
-
-        text = re.sub(pattern=r"<[^>]+>", repl="", string=html_content)
-        text = " ".join(text.split())  # Clean whitespace
+        document = document or ListingDocument.from_html(html_content=html_content)
 
         # Run async evaluation using the agent
-        result = await self.fact_checker_agent.evaluate(content=text, property_data=property_data)
+        result = await self.fact_checker_agent.evaluate(content=document.plain_text, property_data=property_data)
 
         return result
+
+
+def _parse_number(text: str, language: str, scale: Optional[str] = None) -> float:
+    """Parse a claimed number: digits with thousands or decimal separators, or a number word."""
+    text = text.lower()
+    if text in NUMBER_WORDS[language]:
+        return float(NUMBER_WORDS[language][text])
+    if text in ORDINAL_WORDS[language]:
+        return float(ORDINAL_WORDS[language][text])
+    if _THOUSANDS_PATTERN.match(text) and not scale:
+        value = float(re.sub(pattern=r"[.,]", repl="", string=text))
+    else:
+        value = float(text.replace(",", "."))
+    return value * _SCALES.get((scale or "").lower(), 1)
+
+
+def _matches(claimed: float, actual: Any, key: str) -> bool:
+    """Compare a claimed value with the listing value, within the fact's tolerance."""
+    try:
+        actual_value = float(actual)
+    except (TypeError, ValueError):
+        return True
+    tolerance = FACT_TOLERANCES.get(key, 0.0)
+    return abs(claimed - actual_value) <= tolerance * abs(actual_value)
+
+
+class RuleFactEvaluator(BaseEvaluator):
+    """
+    Deterministic fact checker for the numbers and features stated in the listing text.
+
+    Bedrooms, bathrooms, area, floor, year built and price mentions are extracted with per-language
+    patterns (en, es, pt) and compared with property_data; balcony, parking and elevator mentions are
+    checked against their boolean features, taking negations ("no parking") into account. Claims the
+    rules cannot settle (the listing has no value for that fact) are reported as "uncertain"; only
+    those are sent to the LLM FactCheckerAgent, and only when llm_second_stage is enabled.
+    """
+
+    def __init__(self, llm_second_stage: bool = False, fact_checker_agent: Optional[FactCheckerAgent] = None):
+        """
+        Initialize the evaluator.
+
+        Args:
+            llm_second_stage: Ask the LLM fact checker about the sections with uncertain claims
+            fact_checker_agent: Agent used for the second stage (created on first use if omitted)
+        """
+        self.llm_second_stage = llm_second_stage
+        self.fact_checker_agent = fact_checker_agent
+
+    def check(self, text: str, property_data: Dict[str, Any], language: str = "en") -> Dict[str, Any]:
+        """
+        Check one text against the listing data with the rules only.
+
+        Args:
+            text: Plain text to check
+            property_data: Listing data (source of truth)
+            language: Language code of the text
+
+        Returns:
+            Standardized evaluation results, plus the "uncertain" claims
+        """
+        facts, booleans, negation = _COMPILED.get(language, _COMPILED["en"])
+        features = property_data.get("features", {}) or {}
+        actual_values = dict(features, price=property_data.get("price"))
+        findings: List[Dict[str, Any]] = []
+        uncertain: List[str] = []
+        checked = 0
+
+        for key, patterns in facts.items():
+            for pattern in patterns:
+                for match in pattern.finditer(text):
+                    value_text: str = match.group("value") or match.groupdict().get("one") or ""
+                    claimed_value: float = _parse_number(value_text, language, match.groupdict().get("scale"))
+                    actual = actual_values.get(key)
+                    if actual is None or isinstance(actual, bool):
+                        uncertain.append(match.group(0))
+                        continue
+                    checked += 1
+                    if not _matches(claimed=claimed_value, actual=actual, key=key):
+                        findings.append(self._finding(key=key, claimed=match.group(0), actual=actual, language=language))
+
+        for key, pattern in booleans.items():
+            for match in pattern.finditer(text):
+                actual = features.get(key)
+                if not isinstance(actual, bool):
+                    uncertain.append(match.group(0))
+                    continue
+                checked += 1
+                # Only negations within the same clause, at most two words before the mention (NEGATION_PATTERNS)
+                negation_match = negation.search(text, 0, match.start())
+                if bool(negation_match) == actual:
+                    start, end = (negation_match or match).start(), match.end()
+                    claimed_text: str = text[start:end]
+                    findings.append(self._finding(key=key, claimed=claimed_text, actual=actual, language=language))
+
+        return {
+            "evaluator": "RuleFactEvaluator",
+            "score": 1.0 - len(findings) / max(1, checked),
+            "passed": not findings,
+            "findings": findings,
+            "uncertain": uncertain,
+        }
+
+    @staticmethod
+    def _finding(key: str, claimed: str, actual: Any, language: str) -> Dict[str, Any]:
+        correct = render_fact(key=key, value=actual, language=language)
+        return {
+            "type": "fact",
+            "severity": "high",
+            "fact": key,
+            "claimed": claimed,
+            "correct": correct,
+            "message": f'"{claimed}" contradicts the listing data ({correct}).',
+        }
+
+    async def evaluate(
+        self,
+        property_data: Optional[Dict[str, Any]] = None,
+        document: Optional[ListingDocument] = None,
+        text: Optional[str] = None,
+        language: str = "en",
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        """
+        Check the text with the rules, then with the LLM when enabled and the rules are unsure.
+
+        Args:
+            property_data: Listing data (source of truth); without it every claim is uncertain
+            document: Listing document whose plain text is checked
+            text: Plain text to check when no document is given
+            language: Language code of the text
+            **kwargs: Additional parameters
+
+        Returns:
+            Standardized evaluation results dictionary
+        """
+        text = document.plain_text if document is not None else text or ""
+        property_data = property_data or {}
+        result = self.check(text=text, property_data=property_data, language=language)
+        if not (self.llm_second_stage and result["uncertain"]):
+            return result
+
+        self.fact_checker_agent = self.fact_checker_agent or FactCheckerAgent()
+        llm_result = await self.fact_checker_agent.evaluate(content=text, property_data=property_data)
+        return dict(
+            result,
+            score=min(result["score"], llm_result.get("score", 1.0)),
+            passed=result["passed"] and llm_result.get("passed", True),
+            findings=result["findings"] + llm_result.get("findings", []),
+        )
@@ -1,10 +1,15 @@
-from typing import Dict, Any
-import re
+from typing import AbstractSet, Dict, Any, List, Optional, Sequence, Set, Tuple, Union
+import random
 from .base_evaluator import BaseEvaluator
-from spellchecker import SpellChecker
+from .tone import ToneLexiconClassifier
+from .language_id import get_language_identifier
+from .spelling_whitelist import build_spelling_whitelist, split_checkable
+from .readability import flesch_scores
+from .spell_dictionary import MappedWordList, get_spell_dictionary
+from config.options import TONE_CLASSIFIER_OPTIONS, LANGUAGE_MATCH_OPTIONS
+from core.listing_document import ListingDocument
 from agents.evaluation.language_evaluator_agent import LanguageEvaluatorAgent
 from agents.evaluation.tone_evaluator_agent import ToneEvaluatorAgent
-import textstat
 
 
 class LanguageMatchEvaluator(BaseEvaluator):
@@ -30,13 +35,48 @@ class LanguageMatchEvaluator(BaseEvaluator):
         }
 
 
+def _unknown_words(
+    spell_checker: MappedWordList, tokens: List[str], whitelist: Optional[AbstractSet[str]]
+) -> Tuple[Set[str], Set[str]]:
+    """
+    Look up the tokens that are not whitelisted.
+
+    Returns:
+        The unknown words, and the whitelisted words the dictionary would have flagged as unknown
+    """
+    checkable, whitelisted = split_checkable(tokens=tokens, whitelist=whitelist)
+    return spell_checker.unknown(words=checkable), spell_checker.unknown(words=whitelisted)
+
+
+def _new_whitelist_stats() -> Dict[str, int]:
+    """Counters of the whitelist's effect; "rescued" counts checks that pass only because of it."""
+    return {"checks": 0, "whitelisted_words": 0, "rescued": 0}
+
+
 class LanguageMatchEvaluator2(BaseEvaluator):
 
-    def evaluate(self, text: str, language_code: str, target_language: str) -> Dict[str, Any]:
-        """Evaluate if content matches target language."""
+    def __init__(self):
+        self.whitelist_stats = _new_whitelist_stats()
+
+    def evaluate(
+        self,
+        text: Optional[str] = None,
+        language_code: str = "en",
+        target_language: str = "English",
+        document: Optional[ListingDocument] = None,
+        whitelist: Optional[AbstractSet[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Evaluate if content matches target language.
+
+        Args:
+            whitelist: Words not to count as unknown (see build_spelling_whitelist); defaults to the
+                language's domain lexicon
+        """
+        document = document or ListingDocument.from_text(text=text)
         try:
-            # Use the spell checker for the specified language
-            spell_checker = SpellChecker(language=language_code)
+            # Use the shared, memory-mapped dictionary for the specified language
+            spell_checker = get_spell_dictionary(language=language_code)
         except Exception as e:
             return {
                 "evaluator": "LanguageMatchEvaluator2",
@@ -44,10 +84,17 @@ class LanguageMatchEvaluator2(BaseEvaluator):
                 "passed": True,
                 "findings": [{"type": "spelling", "message": f"Error: {str(e)}"}],
             }
-        words = re.findall(pattern=r"\b\w+\b", string=text.lower())
-        misspelled = spell_checker.unknown(words=words)
+        if whitelist is None:
+            whitelist = build_spelling_whitelist(language=language_code)
+        words = document.tokens
+        misspelled, whitelisted = _unknown_words(spell_checker=spell_checker, tokens=words, whitelist=whitelist)
         findings = []
         score = 1.0 - (len(misspelled) / max(1, len(words)))
+        raw_score = 1.0 - ((len(misspelled) + len(whitelisted)) / max(1, len(words)))
+        self.whitelist_stats["checks"] += 1
+        self.whitelist_stats["whitelisted_words"] += len(whitelisted)
+        rescued = score > 0.8 >= raw_score
+        self.whitelist_stats["rescued"] += int(rescued)
         if score < 0.98:
             findings.append(
                 {
@@ -61,37 +108,226 @@ class LanguageMatchEvaluator2(BaseEvaluator):
             "score": score,
             "passed": score > 0.8,
             "findings": findings,
+            "whitelist_rescued": rescued,
         }
 
 
-class ToneMatchEvaluator(BaseEvaluator):
-    def __init__(self):
-        self.agent = ToneEvaluatorAgent()
+class NgramLanguageMatchEvaluator(BaseEvaluator):
+    """
+    Drop-in replacement for LanguageMatchEvaluator2 backed by the character n-gram identifier.
+
+    The score is the probability of the target language. Street and neighborhood names and
+    numbers barely move it, unlike the share of words a spellchecker does not know.
+    """
 
-    async def evaluate(self, text: str, target_tone: str) -> Dict[str, Any]:
-        result = await self.agent.evaluate(content=text, expected_tone=target_tone)
+    def __init__(self, min_probability: Optional[float] = None):
+        """
+        Initialize the evaluator.
+
+        Args:
+            min_probability: Target-language probability needed to pass (default from LANGUAGE_MATCH_OPTIONS)
+        """
+        self.identifier = get_language_identifier()
+        self.min_probability = (
+            LANGUAGE_MATCH_OPTIONS["min_probability"] if min_probability is None else min_probability
+        )
+        self.whitelist_stats = _new_whitelist_stats()
+
+    def evaluate(
+        self,
+        text: Optional[str] = None,
+        language_code: str = "en",
+        target_language: str = "English",
+        document: Optional[ListingDocument] = None,
+        whitelist: Optional[AbstractSet[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Evaluate if content matches target language.
+
+        Args:
+            whitelist: Words left out of the identification, such as the listing's own names
+                (see build_spelling_whitelist)
+        """
+        document = document or ListingDocument.from_text(text=text)
+        if language_code not in self.identifier.languages:
+            return {
+                "evaluator": "NgramLanguageMatchEvaluator",
+                "score": 1.0,
+                "passed": True,
+                "findings": [{"type": "language_mismatch", "message": f"Error: no profile for '{language_code}'"}],
+            }
+        tokens = document.tokens
+        whitelisted = [token for token in tokens if token in whitelist] if whitelist else []
+        if whitelisted:
+            tokens = [token for token in tokens if token not in whitelisted]
+        identified = self.identifier.score(tokens=tokens)
+        score = self._probability(identified=identified, language_code=language_code)
+        passed = score >= self.min_probability
+        rescued = False
+        if passed and whitelisted:
+            # Rescued when the text would have failed with the listing's own words left in
+            unfiltered = self.identifier.score(tokens=document.tokens)
+            rescued = self._probability(identified=unfiltered, language_code=language_code) < self.min_probability
+        self.whitelist_stats["checks"] += 1
+        self.whitelist_stats["whitelisted_words"] += len(whitelisted)
+        self.whitelist_stats["rescued"] += int(rescued)
         findings = []
-        if not result.get("passed", True):
+        if not passed:
             findings.append(
                 {
-                    "type": "tone",
-                    "message": f"Text should have a '{target_tone}' tone.",
+                    "type": "language_mismatch",
+                    "severity": "medium",
+                    "message": f"Text should be in {target_language}.",
                 }
             )
+        return {
+            "evaluator": "NgramLanguageMatchEvaluator",
+            "score": score,
+            "passed": passed,
+            "findings": findings,
+            "detected_language": identified["language"],
+            "whitelist_rescued": rescued,
+        }
+
+    @staticmethod
+    def _probability(identified: Dict[str, Any], language_code: str) -> float:
+        """Probability of the target language in an identifier result."""
+        # Text without any profiled trigram (numbers, a bare name) cannot be judged
+        return float(identified["probabilities"][language_code]) if identified["ngrams"] else 1.0
+
+
+class ToneMatchEvaluator(BaseEvaluator):
+    """
+    Tone check gated by the lexicon pre-classifier.
+
+    The local score decides on its own below uncertain_low (fail) and from uncertain_high (pass);
+    texts in between, with too little tone vocabulary, or in a tone the lexicon does not know go to
+    the LLM ToneEvaluatorAgent. Every LLM call is compared with the local verdict so the band can
+    be tuned from get_agreement_stats().
+    """
+
+    def __init__(
+        self,
+        uncertain_low: Optional[float] = None,
+        uncertain_high: Optional[float] = None,
+        audit_rate: Optional[float] = None,
+    ):
+        """
+        Initialize the evaluator.
+
+        Args:
+            uncertain_low: Local scores below this fail without the LLM (default from TONE_CLASSIFIER_OPTIONS)
+            uncertain_high: Local scores from this pass without the LLM (default from TONE_CLASSIFIER_OPTIONS)
+            audit_rate: Share of confident local decisions also sent to the LLM to measure agreement
+        """
+        self.agent = ToneEvaluatorAgent()
+        self.classifier = ToneLexiconClassifier()
+        self.uncertain_low = TONE_CLASSIFIER_OPTIONS["uncertain_low"] if uncertain_low is None else uncertain_low
+        self.uncertain_high = TONE_CLASSIFIER_OPTIONS["uncertain_high"] if uncertain_high is None else uncertain_high
+        self.min_evidence = TONE_CLASSIFIER_OPTIONS["min_evidence"]
+        self.audit_rate = TONE_CLASSIFIER_OPTIONS["audit_rate"] if audit_rate is None else audit_rate
+        self.stats = {"checks": 0, "local_decisions": 0, "llm_calls": 0}
+        # LLM comparisons per local region: "below" and "above" come from audits, "uncertain" from the band
+        self.agreement = {region: {"comparisons": 0, "agreements": 0} for region in ("below", "uncertain", "above")}
+
+    def _region(self, local: Dict[str, Any]) -> str:
+        """Place a local classification below, inside or above the uncertainty band."""
+        if not local["known"] or local["evidence"] < self.min_evidence:
+            return "uncertain"
+        if local["score"] < self.uncertain_low:
+            return "below"
+        if local["score"] >= self.uncertain_high:
+            return "above"
+        return "uncertain"
+
+    async def evaluate(
+        self,
+        text: Optional[str] = None,
+        target_tone: str = "professional",
+        document: Optional[ListingDocument] = None,
+        language: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        document = document or ListingDocument.from_text(text=text or "", language=language or "en")
+        local = self.classifier.classify(
+            tokens=document.tokens, target_tone=target_tone, language=language or document.language
+        )
+        region = self._region(local=local)
+        self.stats["checks"] += 1
+        audited = region != "uncertain" and random.random() < self.audit_rate
+        if region != "uncertain" and not audited:
+            self.stats["local_decisions"] += 1
+            return self._result(
+                score=local["score"], passed=region == "above", target_tone=target_tone, local=local, source="lexicon"
+            )
+
+        self.stats["llm_calls"] += 1
+        result = await self.agent.evaluate(content=document.plain_text, expected_tone=target_tone)
+        passed = result.get("passed", True)
+        local_passed = region == "above" or (
+            region == "uncertain" and local["score"] >= (self.uncertain_low + self.uncertain_high) / 2
+        )
+        self.agreement[region]["comparisons"] += 1
+        self.agreement[region]["agreements"] += int(local_passed == passed)
+        return self._result(
+            score=result.get("score", 0.0), passed=passed, target_tone=target_tone, local=local, source="llm"
+        )
+
+    @staticmethod
+    def _result(score: float, passed: bool, target_tone: str, local: Dict[str, Any], source: str) -> Dict[str, Any]:
+        findings = []
+        if not passed:
+            message = f"Text should have a '{target_tone}' tone."
+            if local["dominant"] not in (None, target_tone):
+                message += f" Its vocabulary reads as '{local['dominant']}'."
+            findings.append({"type": "tone", "message": message})
         return {
             "evaluator": "ToneMatchEvaluator",
-            "score": result.get("score", 0.0),
-            "passed": result.get("passed", True),
+            "score": score,
+            "passed": passed,
             "findings": findings,
+            "source": source,
+            "lexicon_score": local["score"],
         }
 
+    def get_agreement_stats(self) -> Dict[str, Any]:
+        """Get how many checks the lexicon settled and how often it agreed with the LLM, per region."""
+        regions = {
+            region: dict(counts, rate=counts["agreements"] / counts["comparisons"] if counts["comparisons"] else None)
+            for region, counts in self.agreement.items()
+        }
+        comparisons = sum(counts["comparisons"] for counts in self.agreement.values())
+        agreements = sum(counts["agreements"] for counts in self.agreement.values())
+        return dict(
+            self.stats,
+            local_rate=self.stats["local_decisions"] / self.stats["checks"] if self.stats["checks"] else None,
+            agreement_rate=agreements / comparisons if comparisons else None,
+            regions=regions,
+        )
+
 
 class SpellingEvaluator(BaseEvaluator):
 
-    def evaluate(self, text: str, language_code: str) -> Dict[str, Any]:
+    def __init__(self):
+        self.whitelist_stats = _new_whitelist_stats()
+
+    def evaluate(
+        self,
+        text: Optional[str] = None,
+        language_code: str = "en",
+        document: Optional[ListingDocument] = None,
+        whitelist: Optional[AbstractSet[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Evaluate the spelling of the content.
+
+        Args:
+            whitelist: Words not to count as misspelled (see build_spelling_whitelist); defaults to the
+                language's domain lexicon
+        """
+        document = document or ListingDocument.from_text(text=text)
         try:
-            # Use the spell checker for the specified language
-            spell_checker = SpellChecker(language=language_code)
+            # Use the shared, memory-mapped dictionary for the specified language
+            spell_checker = get_spell_dictionary(language=language_code)
         except Exception as e:
             return {
                 "evaluator": "SpellingEvaluator",
@@ -99,8 +335,14 @@ class SpellingEvaluator(BaseEvaluator):
                 "passed": True,
                 "findings": [{"type": "spelling", "message": f"Error: {str(e)}"}],
             }
-        words = re.findall(pattern=r"\b\w+\b", string=text.lower())
-        misspelled = spell_checker.unknown(words=words)
+        if whitelist is None:
+            whitelist = build_spelling_whitelist(language=language_code)
+        words = document.tokens
+        misspelled, whitelisted = _unknown_words(spell_checker=spell_checker, tokens=words, whitelist=whitelist)
+        self.whitelist_stats["checks"] += 1
+        self.whitelist_stats["whitelisted_words"] += len(whitelisted)
+        rescued = not misspelled and bool(whitelisted)
+        self.whitelist_stats["rescued"] += int(rescued)
         findings = []
         if misspelled:
             findings.append(
@@ -115,6 +357,7 @@ class SpellingEvaluator(BaseEvaluator):
             "score": score,
             "passed": not bool(misspelled),
             "findings": findings,
+            "whitelist_rescued": rescued,
         }
 
 
@@ -137,29 +380,38 @@ class ReadabilityEvaluator(BaseEvaluator):
                 return difficulty
         return "Very Confusing"  # fallback
 
-    def evaluate(self, text: str, language_code: str) -> Dict[str, Any]:
-        try:
-            textstat.set_lang(language_code)
-            flesch_score = textstat.flesch_reading_ease(text)
-            difficulty = self._get_difficulty_level(flesch_score)
+    def evaluate(
+        self, text: Optional[str] = None, language_code: str = "en", document: Optional[ListingDocument] = None
+    ) -> Dict[str, Any]:
+        return self.evaluate_batch(
+            texts=[document if document is not None else text or ""], language_codes=language_code
+        )[0]
+
+    def evaluate_batch(
+        self, texts: Sequence[Union[str, ListingDocument]], language_codes: Union[str, Sequence[str]] = "en"
+    ) -> List[Dict[str, Any]]:
+        """
+        Evaluate the readability of many texts at once, for batch runs and audits.
+
+        Scoring keeps no global state, so batches in different languages can run in parallel threads.
 
-            findings = [{"type": "readability", "message": f"Flesch Reading Ease: {flesch_score:.2f} ({difficulty})"}]
+        Args:
+            texts: Plain texts or ListingDocuments
+            language_codes: One language code for every text, or one per text
 
+        Returns:
+            One standardized result per text, in order
+        """
+        return [self._result(flesch_score=float(score)) for score in flesch_scores(texts=texts, languages=language_codes)]
+
+    def _result(self, flesch_score: float) -> Dict[str, Any]:
+        difficulty = self._get_difficulty_level(flesch_score)
+        findings = [{"type": "readability", "message": f"Flesch Reading Ease: {flesch_score:.2f} ({difficulty})"}]
+        return {
+            "evaluator": "ReadabilityEvaluator",
             # Score: normalize to 0-1 (100 = 1.0, 0 = 0.0)
-            score = max(0.0, min(1.0, flesch_score / 100.0))
+            "score": max(0.0, min(1.0, flesch_score / 100.0)),
             # Passed: at least Standard (>=60)
-            passed = flesch_score >= 60
-
-            return {
-                "evaluator": "ReadabilityEvaluator",
-                "score": score,
-                "passed": passed,
-                "findings": findings,
-            }
-        except Exception as e:
-            return {
-                "evaluator": "ReadabilityEvaluator",
-                "score": 1.0,
-                "passed": True,
-                "findings": [],
-            }
+            "passed": flesch_score >= 60,
+            "findings": findings,
+        }
@@ -0,0 +1,231 @@
+"""
+Character n-gram language identifier for the content languages.
+
+Each language has a small profile of character trigram log-probabilities learned from the
+embedded LANGUAGE_SAMPLES when the module is imported. The profile is array-backed: one
+trigram -> row index dict shared by all languages and one array of log-probabilities per
+language, so scoring a section is a dict lookup per trigram plus one C-level sum per language.
+Digits are ignored, and names such as "Campo de Ourique" only contribute a handful of trigrams,
+so streets and neighborhoods do not flip the verdict the way unknown dictionary words do.
+"""
+
+import math
+from array import array
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Sequence
+from core.listing_document import ListingDocument
+
+# Training text per language: general and real-estate prose, written for this profile and kept
+# out of the benchmark samples
+LANGUAGE_SAMPLES = {
+    "en": [
+        "This bright apartment is located in a quiet street close to the city centre, with shops, "
+        "restaurants and public transport within walking distance.",
+        "The property has three bedrooms, two bathrooms and a spacious living room that opens onto a "
+        "sunny balcony with views over the park.",
+        "The kitchen was fully renovated last year and comes with new appliances, plenty of storage "
+        "and a breakfast bar where the whole family can gather.",
+        "Residents enjoy a private parking space, an elevator and a shared garden that is perfect for "
+        "children to play in the afternoon.",
+        "Schedule a visit today and discover why so many buyers are choosing this neighborhood for "
+        "their next home.",
+        "It is an excellent opportunity for investors looking for steady rental income and strong "
+        "capital growth in a popular area.",
+        "Each room receives natural light throughout the day, and the large windows make the whole "
+        "space feel open and welcoming.",
+        "The building was built with high quality materials and has been carefully maintained by the "
+        "owners over the years.",
+        "Contact our team for more information about the price, the floor plan and the available "
+        "financing options.",
+        "The neighborhood offers schools, parks, a weekly market and several cafes where you can "
+        "relax with friends.",
+        "We would be happy to show you around and answer any questions you have about the house and "
+        "what makes this location so special.",
+        "There are good connections to the airport, the beach is only a short drive away and the old "
+        "town is just around the corner.",
+        "Modern flat with river views, close to the metro and to good schools, ideal for young couples.",
+        "The master bedroom has its own bathroom and a large wardrobe, and the other rooms are bright "
+        "and quiet.",
+        "Heating, air conditioning and double glazing keep the home comfortable in every season.",
+        "On the ground floor there is a storage room and a bicycle room for all the neighbours.",
+        "The house sits on a large plot with a swimming pool, a barbecue area and fruit trees.",
+        "Do not miss this chance to live in one of the most sought after streets of the area.",
+        "It is sold furnished and is ready to move into, with no works needed.",
+        "From the terrace you can watch the sunset over the sea and the hills.",
+        "Call us now or send us a message to book your private viewing this week.",
+    ],
+    "es": [
+        "Este luminoso piso se encuentra en una calle tranquila cerca del centro de la ciudad, con "
+        "tiendas, restaurantes y transporte público a pocos minutos a pie.",
+        "La vivienda cuenta con tres dormitorios, dos baños y un amplio salón que da a un balcón "
+        "soleado con vistas al parque.",
+        "La cocina fue totalmente reformada el año pasado y dispone de electrodomésticos nuevos, "
+        "mucho espacio de almacenamiento y una barra donde toda la familia puede reunirse.",
+        "Los vecinos disfrutan de una plaza de garaje privada, ascensor y un jardín comunitario "
+        "perfecto para que los niños jueguen por la tarde.",
+        "Solicite una visita hoy mismo y descubra por qué tantos compradores eligen este barrio para "
+        "su próximo hogar.",
+        "Es una excelente oportunidad para inversores que buscan ingresos de alquiler estables y una "
+        "fuerte revalorización en una zona muy demandada.",
+        "Cada habitación recibe luz natural durante todo el día, y los grandes ventanales hacen que "
+        "el espacio resulte abierto y acogedor.",
+        "El edificio se construyó con materiales de alta calidad y los propietarios lo han cuidado "
+        "con esmero a lo largo de los años.",
+        "Póngase en contacto con nuestro equipo para obtener más información sobre el precio, el "
+        "plano y las opciones de financiación disponibles.",
+        "El barrio ofrece colegios, parques, un mercado semanal y varias cafeterías donde relajarse "
+        "con los amigos.",
+        "Estaremos encantados de enseñarle la casa y de responder a todas sus preguntas sobre lo que "
+        "hace tan especial esta ubicación.",
+        "Hay buenas conexiones con el aeropuerto, la playa está a pocos minutos en coche y el casco "
+        "antiguo queda a la vuelta de la esquina.",
+        "Piso moderno con vistas al río, cerca del metro y de buenos colegios, ideal para parejas "
+        "jóvenes.",
+        "El dormitorio principal tiene su propio baño y un gran armario, y las demás habitaciones son "
+        "luminosas y silenciosas.",
+        "La calefacción, el aire acondicionado y las ventanas de doble cristal mantienen la casa "
+        "confortable en cualquier estación.",
+        "En la planta baja hay un trastero y un cuarto de bicicletas para todos los vecinos.",
+        "La casa está en una gran parcela con piscina, zona de barbacoa y árboles frutales.",
+        "No pierda la oportunidad de vivir en una de las calles más buscadas de la zona.",
+        "Se vende amueblado y está listo para entrar a vivir, sin necesidad de obras.",
+        "Desde la terraza se puede ver la puesta de sol sobre el mar y las colinas.",
+        "Llámenos ahora o envíenos un mensaje para reservar su visita privada esta semana.",
+    ],
+    "pt": [
+        "Este apartamento luminoso fica numa rua tranquila perto do centro da cidade, com lojas, "
+        "restaurantes e transportes públicos a poucos minutos a pé.",
+        "O imóvel tem três quartos, duas casas de banho e uma sala ampla que dá para uma varanda "
+        "soalheira com vista para o parque.",
+        "A cozinha foi totalmente remodelada no ano passado e conta com eletrodomésticos novos, muito "
+        "espaço de arrumação e um balcão onde toda a família se pode reunir.",
+        "Os moradores têm lugar de garagem privado, elevador e um jardim comum perfeito para as "
+        "crianças brincarem à tarde.",
+        "Marque já a sua visita e descubra porque é que tantos compradores escolhem este bairro para "
+        "a sua próxima casa.",
+        "É uma excelente oportunidade para investidores que procuram um rendimento de arrendamento "
+        "estável e uma forte valorização numa zona muito procurada.",
+        "Cada divisão recebe luz natural durante todo o dia, e as grandes janelas tornam o espaço "
+        "aberto e acolhedor.",
+        "O edifício foi construído com materiais de alta qualidade e os proprietários cuidaram dele "
+        "com atenção ao longo dos anos.",
+        "Entre em contacto com a nossa equipa para obter mais informações sobre o preço, a planta e "
+        "as opções de financiamento disponíveis.",
+        "O bairro oferece escolas, parques, um mercado semanal e vários cafés onde pode descontrair "
+        "com os amigos.",
+        "Teremos todo o gosto em mostrar-lhe a casa e em responder às suas perguntas sobre o que "
+        "torna esta localização tão especial.",
+        "Há boas ligações ao aeroporto, a praia fica a poucos minutos de carro e a zona histórica "
+        "está logo ali ao virar da esquina.",
+        "Você vai adorar morar neste apartamento, que não precisa de obras e está pronto para entrar.",
+        "Apartamento moderno com vista para o rio, perto do metro e de boas escolas, ideal para "
+        "casais jovens.",
+        "O quarto principal tem casa de banho privativa e um grande roupeiro, e os restantes quartos "
+        "são luminosos e silenciosos.",
+        "O aquecimento, o ar condicionado e as janelas com vidro duplo mantêm a casa confortável em "
+        "todas as estações.",
+        "No rés do chão há uma arrecadação e uma sala de bicicletas para todos os vizinhos.",
+        "A moradia está num terreno grande com piscina, zona de churrasco e árvores de fruto.",
+        "Não perca a oportunidade de viver numa das ruas mais procuradas da zona.",
+        "Vende-se mobilado e pronto a habitar, sem necessidade de obras.",
+        "Do terraço pode ver o pôr do sol sobre o mar e as colinas.",
+        "Ligue-nos já ou envie-nos uma mensagem para marcar a sua visita privada esta semana.",
+    ],
+}
+
+# Character n-gram length
+NGRAM_ORDER = 3
+
+# Most frequent trigrams kept per language; the profile is the union of these
+PROFILE_SIZE = 1000
+
+# Weight of the mean per-trigram log-likelihood in the language posterior, so the confidence
+# depends on how typical the trigrams are rather than on the length of the text
+POSTERIOR_SHARPNESS = 25.0
+
+
+def extract_ngrams(tokens: Iterable[str], order: int = NGRAM_ORDER) -> List[str]:
+    """Get the character n-grams of the alphabetic tokens, with word boundaries marked by spaces."""
+    text = " " + " ".join(token for token in tokens if token.isalpha()) + " "
+    return [text[position : position + order] for position in range(len(text) - order + 1)]
+
+
+class NgramLanguageIdentifier:
+    """
+    Trigram language identifier with an array-backed profile.
+
+    Row i of each language's array holds log P(trigram i | language); the last row is shared by
+    every trigram outside the profile and is zero for all languages, so unknown trigrams (names,
+    typos) carry no evidence either way.
+    """
+
+    def __init__(self, samples: Dict[str, Sequence[str]] = LANGUAGE_SAMPLES, profile_size: int = PROFILE_SIZE):
+        """
+        Build the profile.
+
+        Args:
+            samples: Training sentences per language code
+            profile_size: Most frequent trigrams kept per language
+        """
+        counts = {
+            language: Counter(extract_ngrams(tokens=ListingDocument.from_text(text=" ".join(texts)).tokens))
+            for language, texts in samples.items()
+        }
+        vocabulary = sorted(
+            {gram for language_counts in counts.values() for gram, _ in language_counts.most_common(profile_size)}
+        )
+        self.languages = tuple(counts)
+        self.index = {gram: row for row, gram in enumerate(vocabulary)}
+        self.unknown_row = len(vocabulary)
+        self.weights: Dict[str, array] = {}
+        for language, language_counts in counts.items():
+            # Add-one smoothing over the shared vocabulary
+            total = sum(language_counts[gram] for gram in vocabulary) + len(vocabulary)
+            weights = array("d", (math.log((language_counts[gram] + 1) / total) for gram in vocabulary))
+            weights.append(0.0)
+            self.weights[language] = weights
+
+    def score(self, tokens: Sequence[str]) -> Dict[str, Any]:
+        """
+        Identify the language of lowercased word tokens.
+
+        Args:
+            tokens: Lowercased word tokens (e.g. ListingDocument.tokens)
+
+        Returns:
+            The "probabilities" of every profiled language, the most likely "language" (None when
+            the text has no trigram in the profile) and the number of "ngrams" that carried evidence
+        """
+        get_row, unknown_row = self.index.get, self.unknown_row
+        rows = [get_row(gram, unknown_row) for gram in extract_ngrams(tokens=tokens)]
+        known = len(rows) - rows.count(unknown_row)
+        if not known:
+            return {
+                "probabilities": dict.fromkeys(self.languages, 1.0 / len(self.languages)),
+                "language": None,
+                "ngrams": 0,
+            }
+        likelihoods = {
+            language: POSTERIOR_SHARPNESS * sum(map(weights.__getitem__, rows)) / known
+            for language, weights in self.weights.items()
+        }
+        best = max(likelihoods.values())
+        exponents = {language: math.exp(likelihood - best) for language, likelihood in likelihoods.items()}
+        normalizer = sum(exponents.values())
+        probabilities = {language: value / normalizer for language, value in exponents.items()}
+        return {
+            "probabilities": probabilities,
+            "language": max(probabilities, key=probabilities.get),
+            "ngrams": known,
+        }
+
+
+_IDENTIFIER = None
+
+
+def get_language_identifier() -> NgramLanguageIdentifier:
+    """Get the process-wide identifier, building its profile on first use."""
+    global _IDENTIFIER
+    if _IDENTIFIER is None:
+        _IDENTIFIER = NgramLanguageIdentifier()
+    return _IDENTIFIER
@@ -0,0 +1,151 @@
+"""
+Flesch-style readability without global state.
+
+textstat keeps the language in a module-level setting (textstat.set_lang), so two evaluations
+in different languages running in a thread pool can score each other's text with the wrong
+formula. Here every language has its own cached syllable counter and formula coefficients, and
+the counts of a whole batch of texts are scored at once as NumPy arrays, which also lets a batch
+mix languages.
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, Sequence, Tuple, Union
+
+import numpy as np
+
+from core.listing_document import ListingDocument
+
+
+@dataclass(frozen=True)
+class FleschFormula:
+    """score = base - sentence_length * words/sentences - syllables_per_word * syllables/words"""
+
+    base: float
+    sentence_length: float
+    syllables_per_word: float
+
+
+# Flesch Reading Ease (en) and Fernández Huerta (es) with the coefficients textstat used for them,
+# and the Portuguese adaptation of Flesch Reading Ease by Martins et al. (1996), which shifts the
+# English base by +42 (pt)
+FLESCH_FORMULAS = {
+    "en": FleschFormula(base=206.835, sentence_length=1.015, syllables_per_word=84.6),
+    "es": FleschFormula(base=206.84, sentence_length=1.02, syllables_per_word=60.0),
+    "pt": FleschFormula(base=248.835, sentence_length=1.015, syllables_per_word=84.6),
+}
+
+_SENTENCE_END_PATTERN = re.compile(r"[.!?]+")
+_EN_SILENT_ENDING_PATTERN = re.compile(r"(?:[^laeiouycsxzg]es|[^laeiouytd]ed|[^laeiouy]e)$")
+_EN_VOWEL_GROUP_PATTERN = re.compile(r"[aeiouy]+")
+_ES_VOWEL_GROUP_PATTERN = re.compile(r"[aeiouáéíóúü]+")
+_PT_VOWEL_GROUP_PATTERN = re.compile(r"[aeiouáéíóúâêôãõàü]+")
+# Nasal diphthongs are one syllable although both vowels are strong
+_PT_NASAL_DIPHTHONG_PATTERN = re.compile(r"ão|ãe|õe")
+
+# Vowels that form their own syllable when next to another vowel (hiatus); unaccented i/u glide
+_ES_STRONG_VOWELS = frozenset("aeoáéíóú")
+_PT_STRONG_VOWELS = frozenset("aeoáéíóúâêôãõà")
+
+
+@lru_cache(maxsize=65536)
+def count_syllables_en(word: str) -> int:
+    """Count English syllables from vowel groups, dropping silent endings ("homes", "parked", "home")."""
+    if len(word) <= 3:
+        return 1
+    word = _EN_SILENT_ENDING_PATTERN.sub("", word)
+    if word.startswith("y"):
+        word = word[1:]
+    return max(1, len(_EN_VOWEL_GROUP_PATTERN.findall(word)))
+
+
+def _count_romance_syllables(word: str, vowel_group_pattern: re.Pattern, strong_vowels: frozenset) -> int:
+    """Count syllables as vowel groups, splitting a group at every strong vowel after the first."""
+    syllables = 0
+    for group in vowel_group_pattern.findall(word):
+        syllables += max(1, sum(1 for vowel in group if vowel in strong_vowels))
+    return max(1, syllables)
+
+
+@lru_cache(maxsize=65536)
+def count_syllables_es(word: str) -> int:
+    """Count Spanish syllables: diphthongs with an unaccented i/u are one syllable, strong pairs two."""
+    return _count_romance_syllables(
+        word=word, vowel_group_pattern=_ES_VOWEL_GROUP_PATTERN, strong_vowels=_ES_STRONG_VOWELS
+    )
+
+
+@lru_cache(maxsize=65536)
+def count_syllables_pt(word: str) -> int:
+    """Count Portuguese syllables like Spanish ones, with ão/ãe/õe as one syllable."""
+    return _count_romance_syllables(
+        word=_PT_NASAL_DIPHTHONG_PATTERN.sub("ã", word),
+        vowel_group_pattern=_PT_VOWEL_GROUP_PATTERN,
+        strong_vowels=_PT_STRONG_VOWELS,
+    )
+
+
+SYLLABLE_COUNTERS: Dict[str, Callable[[str], int]] = {
+    "en": count_syllables_en,
+    "es": count_syllables_es,
+    "pt": count_syllables_pt,
+}
+
+
+def count_text(text: Union[str, ListingDocument], language: str = "en") -> Tuple[int, int, int]:
+    """
+    Count the sentences, words and syllables of a text.
+
+    Args:
+        text: Plain text, or a ListingDocument whose cached sentences and tokens are reused
+        language: Language code selecting the syllable counter
+
+    Returns:
+        (sentences, words, syllables); words are tokens with at least one letter
+    """
+    if isinstance(text, ListingDocument):
+        sentences, tokens = len(text.sentences), text.tokens
+    else:
+        sentences = sum(1 for part in _SENTENCE_END_PATTERN.split(text) if part.strip())
+        tokens = ListingDocument.from_text(text=text).tokens
+    count_syllables = SYLLABLE_COUNTERS.get(language, count_syllables_en)
+    words = [token for token in tokens if any(character.isalpha() for character in token)]
+    return sentences, len(words), sum(count_syllables(word) for word in words)
+
+
+def flesch_scores(
+    texts: Sequence[Union[str, ListingDocument]], languages: Union[str, Sequence[str]] = "en"
+) -> np.ndarray:
+    """
+    Score a batch of texts with the Flesch-style formula of each text's language.
+
+    Args:
+        texts: Plain texts or ListingDocuments
+        languages: One language code for the whole batch, or one per text
+
+    Returns:
+        Array of reading-ease scores, one per text; texts without words get the formula's base score
+    """
+    if isinstance(languages, str):
+        languages = [languages] * len(texts)
+    counts = np.array(
+        [count_text(text=text, language=language) for text, language in zip(texts, languages)], dtype=float
+    ).reshape(-1, 3)
+    formulas = [FLESCH_FORMULAS.get(language, FLESCH_FORMULAS["en"]) for language in languages]
+    coefficients = np.array(
+        [(formula.base, formula.sentence_length, formula.syllables_per_word) for formula in formulas], dtype=float
+    ).reshape(-1, 3)
+    sentences, words, syllables = counts.T
+    words_safe = np.maximum(words, 1.0)
+    scores = (
+        coefficients[:, 0]
+        - coefficients[:, 1] * words / np.maximum(sentences, 1.0)
+        - coefficients[:, 2] * syllables / words_safe
+    )
+    return np.where(words > 0, scores, coefficients[:, 0])
+
+
+def flesch_score(text: Union[str, ListingDocument], language: str = "en") -> float:
+    """Score one text; see flesch_scores."""
+    return float(flesch_scores(texts=[text], languages=language)[0])
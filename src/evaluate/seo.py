@@ -1,8 +1,9 @@
-from typing import Any, Dict, List, Set
+from typing import Any, Dict, List, Optional, Set
 
 from .base_evaluator import BaseEvaluator
 from seokar import Seokar
 import logging
+from core.listing_document import ListingDocument
 
 
 def _extract_content_issues(report_data: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -28,11 +29,15 @@ def _extract_content_issues(report_data: Dict[str, Any]) -> List[Dict[str, Any]]
 
 
 class SeoEvaluator(BaseEvaluator):
-    async def evaluate(self, html_content: str, **kwargs) -> Dict[str, Any]:
+    async def evaluate(
+        self, html_content: Optional[str] = None, document: Optional[ListingDocument] = None, **kwargs
+    ) -> Dict[str, Any]:
         """
         Evaluate SEO aspects of HTML content using seokar.
         Returns score and findings from the report, without exception handling.
         """
+        if document is not None:
+            html_content = document.html
         logging.disable(level=logging.ERROR)
         analyzer = Seokar(html_content=html_content)
         report = analyzer.analyze()
@@ -0,0 +1,157 @@
+"""
+Read-only, memory-mapped spell dictionaries shared by every worker process.
+
+pyspellchecker loads each language's word-frequency list into a Python dict per process (and
+SpellChecker() reloads it on every instantiation). Here the word list of each language is
+compiled once into a sorted on-disk array and memory-mapped read-only, so all uvicorn and batch
+workers on a host share the same page-cache pages and a process only pays for the pages it
+touches. Lookups are a binary search over the mapped array.
+
+File layout (native byte order; files are compiled on the host that maps them):
+    header   magic (8 bytes), word count (uint32), longest word length (uint32)
+    offsets  word count + 1 uint32 offsets into the data block
+    data     the UTF-8 words, sorted bytewise and concatenated
+"""
+
+import mmap
+import os
+import string
+import struct
+import threading
+from array import array
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Set
+
+from spellchecker import SpellChecker, __version__ as spellchecker_version
+
+from config.options import LANGUAGE_OPTIONS, SPELL_DICTIONARY_OPTIONS
+
+MAGIC = b"SPWLIST1"
+_HEADER = struct.Struct("=8sII")
+
+_DICTIONARIES: Dict[str, "MappedWordList"] = {}
+_LOCK = threading.Lock()
+
+
+def compile_word_list(words: Iterable[str], path: str) -> None:
+    """
+    Write words to path in the mapped format.
+
+    The file is written under a temporary name and renamed into place, so processes compiling
+    the same dictionary at the same time never map a partial file.
+    """
+    encoded = sorted({word.encode("utf-8") for word in words})
+    offsets = array("I", [0])
+    for word in encoded:
+        offsets.append(offsets[-1] + len(word))
+    longest = max((len(word.decode("utf-8")) for word in encoded), default=0)
+    os.makedirs(name=os.path.dirname(path) or ".", exist_ok=True)
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(file=temporary_path, mode="wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(encoded), longest))
+        f.write(offsets.tobytes())
+        f.write(b"".join(encoded))
+    os.replace(temporary_path, path)
+
+
+class MappedWordList:
+    """
+    Sorted word list memory-mapped read-only from a compiled file.
+
+    unknown() follows SpellChecker.unknown: words are lowercased, and single punctuation
+    characters, numbers and words far longer than any dictionary word are never reported.
+    """
+
+    def __init__(self, path: str, cache_size: int = 65536):
+        """
+        Map a compiled word list.
+
+        Args:
+            path: File written by compile_word_list
+            cache_size: Per-process lookup results kept in an LRU cache (0 disables it)
+        """
+        with open(file=path, mode="rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count, self.longest_word_length = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a compiled word list")
+        offsets_end = _HEADER.size + 4 * (self._count + 1)
+        self._offsets = memoryview(self._mmap)[_HEADER.size : offsets_end].cast("I")
+        self._data_start = offsets_end
+        self.path = path
+        self._lookup = lru_cache(maxsize=cache_size)(self._search) if cache_size else self._search
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, word: object) -> bool:
+        return isinstance(word, str) and self._lookup(word)
+
+    def _search(self, word: str) -> bool:
+        key = word.encode("utf-8")
+        offsets, data, start = self._offsets, self._mmap, self._data_start
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            candidate = data[start + offsets[middle] : start + offsets[middle + 1]]
+            if candidate < key:
+                low = middle + 1
+            elif candidate > key:
+                high = middle
+            else:
+                return True
+        return False
+
+    def _should_check(self, word: str) -> bool:
+        if len(word) == 1 and word in string.punctuation:
+            return False
+        if len(word) > self.longest_word_length + 3:
+            return False
+        if word in ("nan", "inf", "infinity"):
+            return True
+        try:
+            float(word)
+            return False
+        except ValueError:
+            return True
+
+    def unknown(self, words: Iterable[str]) -> Set[str]:
+        """Get the subset of words that are not in the dictionary."""
+        return {word for word in (word.lower() for word in words) if self._should_check(word) and word not in self}
+
+
+def dictionary_path(language: str, directory: Optional[str] = None) -> str:
+    """Get the compiled file of a language, versioned with pyspellchecker so upgrades recompile."""
+    directory = directory or SPELL_DICTIONARY_OPTIONS["directory"]
+    return os.path.join(directory, f"{language}-{spellchecker_version}.words")
+
+
+def compile_spell_dictionary(language: str, directory: Optional[str] = None) -> str:
+    """Compile pyspellchecker's word list for a language and return the file path."""
+    path = dictionary_path(language=language, directory=directory)
+    compile_word_list(words=SpellChecker(language=language).word_frequency.dictionary.keys(), path=path)
+    return path
+
+
+def get_spell_dictionary(language: str, directory: Optional[str] = None) -> MappedWordList:
+    """
+    Get the mapped dictionary of a language, compiling it first if no worker has done so yet.
+
+    Raises:
+        ValueError: If pyspellchecker has no dictionary for the language
+    """
+    key = f"{directory or ''}:{language}"
+    if key not in _DICTIONARIES:
+        with _LOCK:
+            if key not in _DICTIONARIES:
+                path = dictionary_path(language=language, directory=directory)
+                if not os.path.exists(path):
+                    compile_spell_dictionary(language=language, directory=directory)
+                _DICTIONARIES[key] = MappedWordList(path=path)
+    return _DICTIONARIES[key]
+
+
+if __name__ == "__main__":
+    # Precompile every supported language, e.g. while building the image
+    for options in LANGUAGE_OPTIONS.values():
+        print(compile_spell_dictionary(language=options["spell_check_code"]))
@@ -0,0 +1,145 @@
+"""
+Words the dictionary-based checks should not count as misspelled.
+
+Listing text is full of proper nouns (city, neighborhood, words of the listing title) and
+real-estate units and jargon ("sqm", "ensuite", "trastero", "T2") that pyspellchecker does not
+know. Counting them as unknown pushes LanguageMatchEvaluator2 and SpellingEvaluator below their
+thresholds and starts a refinement round that cannot fix anything, so they are removed before
+the unknown-word check: the per-listing words come from property_data, the rest from a shared
+domain lexicon per language. Tokens containing a digit ("m²", "3rd", "m2", "t3") are never checked.
+"""
+
+import json
+from functools import lru_cache
+from typing import AbstractSet, Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from core.listing_document import ListingDocument
+
+# Real-estate terms and units missing from the pyspellchecker dictionaries, per language
+DOMAIN_LEXICON = {
+    "en": [
+        "sqm",
+        "sq",
+        "ft",
+        "sqft",
+        "ensuite",
+        "aircon",
+        "hvac",
+        "bbq",
+        "wifi",
+        "hoa",
+        "airbnb",
+        "airbnbs",
+        "walkable",
+        "walkability",
+        "rooftop",
+        "townhome",
+        "duplex",
+        "triplex",
+        "condo",
+        "condos",
+        "kitchenette",
+        "usd",
+        "eur",
+    ],
+    "es": [
+        "ático",
+        "dúplex",
+        "tríplex",
+        "trastero",
+        "domótica",
+        "amueblado",
+        "amueblada",
+        "ubicado",
+        "ubicada",
+        "metros",
+        "ibi",
+        "wifi",
+        "loft",
+        "parking",
+        "bbq",
+        "suite",
+        "usd",
+        "eur",
+    ],
+    "pt": [
+        "kitchenette",
+        "open",
+        "space",
+        "suite",
+        "suites",
+        "imi",
+        "wifi",
+        "loft",
+        "duplex",
+        "rooftop",
+        "condomínio",
+        "arrecadação",
+        "logradouro",
+        "marquise",
+        "usd",
+        "eur",
+    ],
+}
+
+_DOMAIN_WORDS = {language: frozenset(words) for language, words in DOMAIN_LEXICON.items()}
+
+# property_data fields whose words are listing-specific proper nouns
+LISTING_TEXT_FIELDS = ("title",)
+
+
+def _listing_strings(property_data: Dict[str, Any]) -> List[str]:
+    """Collect the free-text values of the listing: its title and every location field."""
+    strings = [str(property_data[field]) for field in LISTING_TEXT_FIELDS if property_data.get(field)]
+    location = property_data.get("location", {})
+    if isinstance(location, dict):
+        strings.extend(str(value) for value in location.values() if isinstance(value, str))
+    elif isinstance(location, str):
+        strings.append(location)
+    return strings
+
+
+def build_spelling_whitelist(property_data: Optional[Dict[str, Any]] = None, language: str = "en") -> FrozenSet[str]:
+    """
+    Get the words exempt from the unknown-word check for a listing.
+
+    Args:
+        property_data: Structured property data (only the domain lexicon applies when omitted)
+        language: Language code of the text
+
+    Returns:
+        Lowercased tokens from the listing's title and location plus the language's domain lexicon
+    """
+    canonical_data = json.dumps(obj=property_data or {}, sort_keys=True, ensure_ascii=False, default=str)
+    return _build_whitelist(canonical_data, language)
+
+
+@lru_cache(maxsize=256)
+def _build_whitelist(canonical_data: str, language: str) -> FrozenSet[str]:
+    listing_words = {
+        token
+        for text in _listing_strings(property_data=json.loads(canonical_data))
+        for token in ListingDocument.from_text(text=text).tokens
+    }
+    return _DOMAIN_WORDS.get(language, _DOMAIN_WORDS["en"]) | frozenset(listing_words)
+
+
+def split_checkable(
+    tokens: Iterable[str], whitelist: Optional[AbstractSet[str]] = None
+) -> Tuple[List[str], Set[str]]:
+    """
+    Separate the tokens to look up in the dictionary from the whitelisted ones.
+
+    Returns:
+        The tokens to check and the distinct whitelisted tokens found in the text
+    """
+    whitelist = whitelist or frozenset()
+    checkable, whitelisted = [], set()
+    for token in tokens:
+        if any(character.isdigit() for character in token):
+            continue
+        if token in whitelist:
+            whitelisted.add(token)
+        else:
+            checkable.append(token)
+    return checkable, whitelisted
@@ -0,0 +1,549 @@
+"""
+Lexicon-based tone pre-classifier.
+
+Each tone in TONE_OPTIONS has weighted per-language word and phrase lists. A text is scored for
+the target tone from how much of its tone vocabulary belongs to that tone (share) and how dense
+that vocabulary is (strength). ToneMatchEvaluator trusts the score outside an uncertainty band and
+asks the LLM ToneEvaluatorAgent only inside it.
+"""
+
+from typing import Any, Dict, List, Sequence, Tuple
+
+# Weight of each lexicon tier
+TERM_WEIGHTS = {"strong": 1.5, "normal": 1.0, "weak": 0.5}
+
+# Tone vocabulary per language, as lowercase words or space-separated phrases (hyphens split words)
+TONE_LEXICONS = {
+    "en": {
+        "luxury": {
+            "strong": ["luxury", "luxurious", "exclusive", "prestigious", "prestige", "exquisite", "upscale", "high end"],
+            "normal": [
+                "opulent",
+                "lavish",
+                "bespoke",
+                "sophisticated",
+                "premium",
+                "refined",
+                "finest",
+                "marble",
+                "concierge",
+                "penthouse",
+                "gourmet",
+                "impeccable",
+                "unparalleled",
+                "world class",
+                "spa",
+            ],
+            "weak": ["elegant", "private", "panoramic", "designer"],
+        },
+        "investor-focused": {
+            "strong": [
+                "investment",
+                "investor",
+                "investors",
+                "roi",
+                "return on investment",
+                "yield",
+                "cash flow",
+                "appreciation",
+                "capital growth",
+                "portfolio",
+                "profitable",
+            ],
+            "normal": [
+                "rental",
+                "income",
+                "market growth",
+                "demand",
+                "tenant",
+                "tenants",
+                "profit",
+                "revenue",
+                "occupancy",
+                "asset",
+                "returns",
+                "valuation",
+            ],
+            "weak": ["market", "price per"],
+        },
+        "family-oriented": {
+            "strong": ["family", "families", "children", "kids", "school", "schools", "playground", "daycare"],
+            "normal": [
+                "park",
+                "parks",
+                "safe",
+                "safety",
+                "quiet street",
+                "community",
+                "neighbors",
+                "neighbours",
+                "backyard",
+                "welcoming",
+                "nursery",
+                "play area",
+            ],
+            "weak": ["garden", "spacious", "cozy", "cosy"],
+        },
+        "modern": {
+            "strong": [
+                "modern",
+                "contemporary",
+                "sleek",
+                "smart home",
+                "innovative",
+                "minimalist",
+                "state of the art",
+                "cutting edge",
+            ],
+            "normal": [
+                "smart",
+                "technology",
+                "open plan",
+                "open concept",
+                "urban",
+                "stylish",
+                "floor to ceiling",
+                "brand new",
+                "energy efficient",
+            ],
+            "weak": ["design", "renovated", "trendy"],
+        },
+        "classic": {
+            "strong": ["classic", "timeless", "traditional", "heritage", "historic", "craftsmanship"],
+            "normal": [
+                "character",
+                "charm",
+                "charming",
+                "elegant",
+                "elegance",
+                "period",
+                "architectural",
+                "moldings",
+                "mouldings",
+                "enduring",
+                "vintage",
+                "colonial",
+                "victorian",
+                "old world",
+            ],
+            "weak": ["original", "fireplace", "hardwood"],
+        },
+        "youthful": {
+            "strong": ["vibrant", "fun", "lively", "affordable", "nightlife", "friends", "young", "first home"],
+            "normal": [
+                "social",
+                "trendy",
+                "cafes",
+                "bars",
+                "first time",
+                "starter",
+                "budget",
+                "energetic",
+                "exciting",
+                "students",
+                "coworking",
+                "cool",
+                "hip",
+                "buzzing",
+            ],
+            "weak": ["casual", "relaxed"],
+        },
+    },
+    "es": {
+        "luxury": {
+            "strong": [
+                "lujo",
+                "lujoso",
+                "lujosa",
+                "lujosos",
+                "lujosas",
+                "exclusivo",
+                "exclusiva",
+                "exclusividad",
+                "prestigio",
+                "prestigioso",
+                "prestigiosa",
+                "alta gama",
+                "exquisito",
+                "exquisita",
+            ],
+            "normal": [
+                "sofisticado",
+                "sofisticada",
+                "premium",
+                "refinado",
+                "refinada",
+                "mármol",
+                "conserje",
+                "ático",
+                "impecable",
+                "selecto",
+                "selecta",
+            ],
+            "weak": ["elegante", "privado", "privada", "panorámicas", "panorámica"],
+        },
+        "investor-focused": {
+            "strong": [
+                "inversión",
+                "inversor",
+                "inversores",
+                "inversionista",
+                "inversionistas",
+                "rentabilidad",
+                "rentable",
+                "rendimiento",
+                "revalorización",
+                "plusvalía",
+                "retorno",
+                "flujo de caja",
+            ],
+            "normal": [
+                "alquiler",
+                "ingresos",
+                "demanda",
+                "inquilino",
+                "inquilinos",
+                "cartera",
+                "beneficio",
+                "beneficios",
+                "ocupación",
+                "activo",
+            ],
+            "weak": ["mercado"],
+        },
+        "family-oriented": {
+            "strong": [
+                "familia",
+                "familias",
+                "familiar",
+                "niños",
+                "hijos",
+                "colegio",
+                "colegios",
+                "escuela",
+                "escuelas",
+                "guardería",
+            ],
+            "normal": [
+                "parque",
+                "parques",
+                "seguro",
+                "segura",
+                "seguridad",
+                "tranquilo",
+                "tranquila",
+                "comunidad",
+                "vecinos",
+                "zona de juegos",
+            ],
+            "weak": ["jardín", "acogedor", "acogedora", "amplio", "amplia"],
+        },
+        "modern": {
+            "strong": [
+                "moderno",
+                "moderna",
+                "modernos",
+                "modernas",
+                "contemporáneo",
+                "contemporánea",
+                "vanguardista",
+                "innovador",
+                "innovadora",
+                "minimalista",
+                "domótica",
+                "última generación",
+            ],
+            "normal": [
+                "tecnología",
+                "inteligente",
+                "concepto abierto",
+                "urbano",
+                "urbana",
+                "estiloso",
+                "a estrenar",
+                "eficiencia energética",
+            ],
+            "weak": ["diseño", "reformado", "reformada"],
+        },
+        "classic": {
+            "strong": [
+                "clásico",
+                "clásica",
+                "atemporal",
+                "tradicional",
+                "señorial",
+                "histórico",
+                "histórica",
+                "patrimonio",
+            ],
+            "normal": [
+                "carácter",
+                "encanto",
+                "elegante",
+                "elegancia",
+                "época",
+                "arquitectónico",
+                "arquitectónicos",
+                "molduras",
+                "artesanal",
+                "noble",
+            ],
+            "weak": ["original", "chimenea"],
+        },
+        "youthful": {
+            "strong": [
+                "vibrante",
+                "divertido",
+                "divertida",
+                "animado",
+                "animada",
+                "asequible",
+                "vida nocturna",
+                "vida social",
+                "amigos",
+                "joven",
+                "jóvenes",
+                "primera vivienda",
+            ],
+            "normal": [
+                "social",
+                "económico",
+                "económica",
+                "cafeterías",
+                "bares",
+                "estudiantes",
+                "dinámico",
+                "dinámica",
+                "ocio",
+                "buen precio",
+            ],
+            "weak": ["informal", "desenfadado"],
+        },
+    },
+    "pt": {
+        "luxury": {
+            "strong": [
+                "luxo",
+                "luxuoso",
+                "luxuosa",
+                "exclusivo",
+                "exclusiva",
+                "exclusividade",
+                "prestígio",
+                "alto padrão",
+                "requintado",
+                "requintada",
+            ],
+            "normal": [
+                "sofisticado",
+                "sofisticada",
+                "sofisticação",
+                "premium",
+                "refinado",
+                "refinada",
+                "mármore",
+                "cobertura",
+                "concierge",
+                "impecável",
+            ],
+            "weak": ["elegante", "privativo", "privativa", "panorâmica"],
+        },
+        "investor-focused": {
+            "strong": [
+                "investimento",
+                "investidor",
+                "investidores",
+                "rentabilidade",
+                "rentável",
+                "rendimento",
+                "valorização",
+                "retorno",
+                "fluxo de caixa",
+            ],
+            "normal": [
+                "aluguel",
+                "aluguer",
+                "renda",
+                "demanda",
+                "inquilinos",
+                "locatários",
+                "lucro",
+                "ocupação",
+                "ativo",
+                "portfólio",
+            ],
+            "weak": ["mercado", "procura"],
+        },
+        "family-oriented": {
+            "strong": [
+                "família",
+                "famílias",
+                "familiar",
+                "crianças",
+                "filhos",
+                "escola",
+                "escolas",
+                "creche",
+                "playground",
+            ],
+            "normal": [
+                "parque",
+                "parques",
+                "seguro",
+                "segura",
+                "segurança",
+                "tranquilo",
+                "tranquila",
+                "comunidade",
+                "vizinhos",
+                "quintal",
+            ],
+            "weak": ["jardim", "aconchegante", "amplo", "ampla"],
+        },
+        "modern": {
+            "strong": [
+                "moderno",
+                "moderna",
+                "modernos",
+                "modernas",
+                "contemporâneo",
+                "contemporânea",
+                "inovador",
+                "inovadora",
+                "minimalista",
+                "automação",
+                "última geração",
+            ],
+            "normal": [
+                "tecnologia",
+                "inteligente",
+                "conceito aberto",
+                "urbano",
+                "urbana",
+                "eficiência energética",
+            ],
+            "weak": ["design", "estilo", "reformado", "reformada"],
+        },
+        "classic": {
+            "strong": [
+                "clássico",
+                "clássica",
+                "atemporal",
+                "tradicional",
+                "histórico",
+                "histórica",
+                "patrimônio",
+                "património",
+            ],
+            "normal": [
+                "charme",
+                "encanto",
+                "elegante",
+                "elegância",
+                "época",
+                "arquitetônico",
+                "arquitetónico",
+                "molduras",
+                "artesanal",
+                "colonial",
+                "nobre",
+            ],
+            "weak": ["original", "lareira"],
+        },
+        "youthful": {
+            "strong": [
+                "vibrante",
+                "divertido",
+                "divertida",
+                "animado",
+                "animada",
+                "acessível",
+                "vida noturna",
+                "vida social",
+                "amigos",
+                "jovem",
+                "jovens",
+                "primeiro imóvel",
+            ],
+            "normal": [
+                "social",
+                "econômico",
+                "económico",
+                "cafés",
+                "bares",
+                "estudantes",
+                "dinâmico",
+                "dinâmica",
+                "lazer",
+            ],
+            "weak": ["descontraído", "descontraída"],
+        },
+    },
+}
+
+# Weighted tone vocabulary per 100 words at which a text counts as fully in its tone
+FULL_STRENGTH_DENSITY = 4.0
+
+
+def _compile_lexicon(lexicon: Dict[str, Dict[str, List[str]]]) -> Tuple[Dict[Tuple[str, ...], list], int]:
+    """Index a language's lexicon by term tokens; a term may count for several tones."""
+    index: Dict[Tuple[str, ...], List[Tuple[str, float]]] = {}
+    for tone, tiers in lexicon.items():
+        for tier, terms in tiers.items():
+            for term in terms:
+                index.setdefault(tuple(term.split()), []).append((tone, TERM_WEIGHTS[tier]))
+    return index, max(len(term) for term in index)
+
+
+_COMPILED = {language: _compile_lexicon(lexicon) for language, lexicon in TONE_LEXICONS.items()}
+
+
+class ToneLexiconClassifier:
+    """
+    Local tone scorer built from TONE_LEXICONS.
+
+    The score for the target tone is the mean of its share of all the tone vocabulary found in the
+    text and its density relative to FULL_STRENGTH_DENSITY, so a text passes only when it uses the
+    target tone's words and not mostly another tone's.
+    """
+
+    def classify(self, tokens: Sequence[str], target_tone: str, language: str = "en") -> Dict[str, Any]:
+        """
+        Score lowercased word tokens for the target tone.
+
+        Args:
+            tokens: Lowercased word tokens (e.g. ListingDocument.tokens)
+            target_tone: Tone code from TONE_OPTIONS
+            language: Language code of the text
+
+        Returns:
+            "score" (0-1) for the target tone, the weighted "tone_scores" of every tone, the total
+            tone "evidence", the "dominant" tone, and whether the target tone is "known" to the lexicon
+        """
+        index, max_length = _COMPILED.get(language, _COMPILED["en"])
+        tone_scores = dict.fromkeys(TONE_LEXICONS.get(language, TONE_LEXICONS["en"]), 0.0)
+        position = 0
+        while position < len(tokens):
+            # Longest phrase first, so "smart home" does not also count as "smart"
+            for end in range(min(position + max_length, len(tokens)), position, -1):
+                matches = index.get(tuple(tokens[position:end]))
+                if matches:
+                    for tone, weight in matches:
+                        tone_scores[tone] += weight
+                    position = end
+                    break
+            else:
+                position += 1
+
+        evidence = sum(tone_scores.values())
+        target = tone_scores.get(target_tone, 0.0)
+        share = target / evidence if evidence else 0.0
+        strength = min(1.0, 100 * target / (FULL_STRENGTH_DENSITY * max(1, len(tokens))))
+        dominant = max(tone_scores, key=tone_scores.get) if evidence else None
+        return {
+            "score": (share + strength) / 2,
+            "tone_scores": tone_scores,
+            "evidence": evidence,
+            "dominant": dominant,
+            "known": target_tone in tone_scores,
+        }
@@ -24,6 +24,8 @@ async def generate_html_content(
     tone: str = "professional",
     model: str = "gemma3n:e2b",
     max_iterations: int = 3,
+    cascade: bool = False,
+    templates: str = "off",
 ) -> str:
     """
     Generate HTML content for a real estate listing based on property data.
@@ -34,6 +36,8 @@ async def generate_html_content(
         tone: Tone for content generation (professional, friendly, luxury, etc.)
         model: Model to use for content generation
         max_iterations: Maximum number of refinement iterations
+        cascade: Draft with the fastest model and escalate failing sections to the selected model
+        templates: Template fast path for key features and H1 ("off", "template" or "fallback")
 
     Returns:
         str: Generated HTML content
@@ -48,7 +52,7 @@ async def generate_html_content(
             del data["tone"]
 
         # Create HTML generator with specified model and max_iterations
-        html_generator = HTMLGenerator(model=model, max_iterations=max_iterations)
+        html_generator = HTMLGenerator(model=model, max_iterations=max_iterations, cascade=cascade, templates=templates)
 
         # Generate HTML content with language and tone parameters
         html_content = await html_generator.generate_html(property_data=data, language=language, tone=tone)
@@ -131,6 +135,17 @@ with gr.Blocks(
                     label="Max Iterations",
                     info="Maximum number of refinement iterations (higher values = better quality but slower)",
                 )
+                cascade_checkbox = gr.Checkbox(
+                    value=False,
+                    label="Model Cascade",
+                    info="Draft with the fastest model and use the selected model only for sections that need refinement",
+                )
+                templates_dropdown = gr.Dropdown(
+                    choices=["off", "template", "fallback"],
+                    value="off",
+                    label="Section Templates",
+                    info="Render key features and H1 from templates: always (no LLM) or only when the LLM fails",
+                )
 
             run_btn = gr.Button("Generate HTML Content", variant="primary")
 
@@ -140,7 +155,15 @@ with gr.Blocks(
 
     run_btn.click(
         fn=generate_html_content,
-        inputs=[property_input, language_dropdown, tone_dropdown, model_dropdown, max_iterations_slider],
+        inputs=[
+            property_input,
+            language_dropdown,
+            tone_dropdown,
+            model_dropdown,
+            max_iterations_slider,
+            cascade_checkbox,
+            templates_dropdown,
+        ],
         outputs=[output_html],
     )
 
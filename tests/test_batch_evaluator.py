@@ -0,0 +1,54 @@
+import pytest
+import sys
+import os
+import pickle
+import asyncio
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from evaluate.batch_evaluator import EvaluationJob, ListingResult, ProcessPoolEvaluator, evaluate_job
+
+
+class TestBatchEvaluator:
+    """Test the process-pool offload of the local checks"""
+
+    property_data = {
+        "title": "Modern home in San Francisco",
+        "location": {"city": "San Francisco", "neighborhood": "Nob Hill"},
+        "features": {"bedrooms": 3, "bathrooms": 2, "area_sqm": 167},
+        "price": 850000,
+    }
+    sections = {
+        "title": "Modern 3-Bedroom Home in Nob Hill, San Francisco",
+        "description": "This bright home in Nob Hill has 3 bedrooms and 2 bathrooms. It offers 167 m² of living space.",
+        "call_to_action": "Call us today to visit this 5-bedroom home!",
+    }
+
+    def make_jobs(self, count):
+        return [
+            EvaluationJob(listing_id=f"listing-{index}", sections=self.sections, property_data=self.property_data)
+            for index in range(count)
+        ]
+
+    def test_job_result_is_compact(self):
+        """Test a job returns plain, picklable tuples without the LLM checks"""
+        result = evaluate_job(job=self.make_jobs(1)[0])
+        assert isinstance(result, ListingResult)
+        assert [section.section for section in result.sections] == list(self.sections)
+        assert "call_to_action" in result.failed_sections
+        checks = {name for section in result.sections for name, _, _ in section.checks}
+        assert "tone_match" not in checks and {"facts", "seo"} <= checks
+        call_to_action = result.sections[-1]
+        assert any(finding.type == "fact" for finding in call_to_action.findings)
+        assert pickle.loads(pickle.dumps(result)) == result
+
+    @pytest.mark.asyncio
+    async def test_pool_matches_in_process_results(self):
+        """Test worker processes return the same results as an in-process run, in job order"""
+        jobs = self.make_jobs(6)
+        with ProcessPoolEvaluator(max_workers=2, languages=["en"]) as pool:
+            results = await pool.evaluate_listings(jobs=jobs)
+        assert [result.listing_id for result in results] == [job.listing_id for job in jobs]
+        # evaluate_job runs its own event loop, so run it off this one
+        assert results[0] == await asyncio.to_thread(evaluate_job, jobs[0])
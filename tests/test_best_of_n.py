@@ -0,0 +1,112 @@
+import pytest
+import sys
+import os
+import asyncio
+from types import SimpleNamespace
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import core.model_scheduler as model_scheduler
+from agents.content_generation.title_agent import TitleAgent
+from core.best_of_n import BestOfNSampler
+from core.model_scheduler import ModelScheduler
+
+
+async def noop(model):
+    await asyncio.sleep(0)
+
+
+class TestBestOfNSampler:
+    """Test best-of-N sampling of section drafts"""
+
+    def setup_method(self):
+        """Setup test data"""
+        self.drafted = []
+        self.evaluated = []
+
+    def make_draft(self, texts):
+        """Draft function returning texts[seed] for the candidate with that seed"""
+
+        async def draft(options):
+            self.drafted.append(options)
+            await asyncio.sleep(0)
+            text = texts[options["seed"]]
+            if isinstance(text, Exception):
+                raise text
+            return text
+
+        return draft
+
+    async def evaluate(self, candidate):
+        """Pass texts ending with a period, scored by length"""
+        self.evaluated.append(candidate)
+        return {"passed": candidate.endswith("."), "score": len(candidate) / 100}
+
+    def test_invalid_configuration(self):
+        """Test the sampler rejects empty or inverted settings"""
+        with pytest.raises(ValueError):
+            BestOfNSampler(candidates=0)
+        with pytest.raises(ValueError):
+            BestOfNSampler(min_temperature=1.0, max_temperature=0.5)
+
+    def test_sampling_options_spread_temperatures(self):
+        """Test candidates get evenly spread temperatures and distinct seeds"""
+        assert BestOfNSampler(candidates=3, min_temperature=0.2, max_temperature=1.0).sampling_options() == [
+            {"temperature": 0.2, "seed": 0},
+            {"temperature": 0.6, "seed": 1},
+            {"temperature": 1.0, "seed": 2},
+        ]
+        assert BestOfNSampler(candidates=1, min_temperature=0.4).sampling_options() == [{"temperature": 0.4, "seed": 0}]
+
+    @pytest.mark.asyncio
+    async def test_best_passing_candidate_is_kept(self):
+        """Test a passing candidate beats a higher scored failing one, and duplicates are evaluated once"""
+        sampler = BestOfNSampler(candidates=4)
+        texts = ["Short.", "Short.", "A much longer text without a period", "A longer passing text."]
+        text, evaluation = await sampler.sample(draft=self.make_draft(texts), evaluate=self.evaluate)
+        assert text == "A longer passing text." and evaluation["passed"]
+        assert len(self.drafted) == 4 and len(self.evaluated) == 3
+        assert sampler.get_stats() == {"sections": 1, "passed": 1, "drafts": 4, "duplicates": 1}
+
+    @pytest.mark.asyncio
+    async def test_best_failing_candidate_is_returned_for_refinement(self):
+        """Test the best scored candidate is returned when none passes"""
+        sampler = BestOfNSampler(candidates=2)
+        text, evaluation = await sampler.sample(draft=self.make_draft(["No period", "Still no period"]), evaluate=self.evaluate)
+        assert text == "Still no period" and not evaluation["passed"]
+        assert sampler.get_stats()["passed"] == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_drafts(self):
+        """Test failed drafts are left out, and the error is raised only when every draft failed"""
+        sampler = BestOfNSampler(candidates=2)
+        text, _ = await sampler.sample(draft=self.make_draft([ConnectionError("busy"), "Fine."]), evaluate=self.evaluate)
+        assert text == "Fine."
+        with pytest.raises(ConnectionError):
+            await sampler.sample(
+                draft=self.make_draft([ConnectionError("down"), ConnectionError("down")]), evaluate=self.evaluate
+            )
+
+    @pytest.mark.asyncio
+    async def test_sampling_options_reach_ollama_uncoalesced(self, monkeypatch):
+        """Test identical prompts with different sampling options are separate calls carrying their options"""
+        monkeypatch.setattr(model_scheduler, "_scheduler", ModelScheduler(load_model=noop, unload_model=noop))
+        calls = []
+        agent = TitleAgent()
+
+        async def create(messages, extra_create_args=None):
+            calls.append(extra_create_args)
+            await asyncio.sleep(0)
+            return SimpleNamespace(content=f"Title {extra_create_args['options']['seed']}")
+
+        agent.model_client.create = create
+        property_data = {"title": "Flat", "location": {"city": "Porto"}}
+        titles = await asyncio.gather(
+            *[
+                agent.generate_initial(property_data=property_data, language="en", tone="modern", options=options)
+                for options in BestOfNSampler(candidates=3).sampling_options()
+            ]
+        )
+        assert len(set(titles)) == 3
+        assert sorted(call["options"]["seed"] for call in calls) == [0, 1, 2]
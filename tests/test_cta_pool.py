@@ -0,0 +1,58 @@
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.cta_pool import CallToActionPool
+
+
+class TestCallToActionPool:
+    """Test the pre-generated call-to-action pool"""
+
+    def setup_method(self):
+        """Setup test data"""
+        self.pool = CallToActionPool()
+        self.pool.set_variants(
+            language="en",
+            tone="luxury",
+            listing_type="sale",
+            entries=[{"text": f"Variant {index}", "score": 0.5 + index / 10} for index in range(4)],
+        )
+        self.pool.set_variants(
+            language="en", tone="luxury", listing_type="rent", entries=[{"text": "Rent it today.", "score": 0.9}]
+        )
+
+    def test_variants_are_ordered_by_score(self):
+        """Test the best scored variants come first"""
+        assert self.pool.get_variants(language="en", tone="luxury") == ["Variant 3", "Variant 2", "Variant 1", "Variant 0"]
+        assert self.pool.get_variants(language="pt", tone="luxury") == []
+
+    def test_rotation_is_deterministic_and_spreads_listings(self):
+        """Test the same listing gets the same order and listings do not all start at the same variant"""
+        listings = [{"title": f"Home {index}", "listing_type": "sale"} for index in range(20)]
+        orders = [self.pool.candidates(property_data=listing, language="en", tone="luxury") for listing in listings]
+        assert orders[0] == self.pool.candidates(property_data=dict(listings[0]), language="en", tone="luxury")
+        assert all(sorted(order) == sorted(orders[0]) for order in orders)
+        assert len({order[0] for order in orders}) > 1
+        assert len(self.pool.candidates(property_data=listings[0], language="en", tone="luxury", max_tries=2)) == 2
+
+    def test_rotation_follows_the_listing_identity(self):
+        """Test a new price keeps a listing's order"""
+        listing = {"title": "Home", "location": {"city": "Lisbon"}, "price": 850000, "listing_type": "sale"}
+        order = self.pool.candidates(property_data=listing, language="en", tone="luxury")
+        for price in range(700000, 900000, 10000):
+            assert self.pool.candidates(property_data=dict(listing, price=price), language="en", tone="luxury") == order
+
+    def test_listing_type_selects_the_variants(self):
+        """Test rentals get rental variants and a missing listing type defaults to sale"""
+        assert self.pool.candidates(property_data={"listing_type": "rent"}, language="en", tone="luxury") == [
+            "Rent it today."
+        ]
+        assert "Variant 0" in self.pool.candidates(property_data={"title": "Home"}, language="en", tone="luxury")
+
+    def test_save_and_load(self, tmp_path):
+        """Test the pool file round-trips"""
+        path = str(tmp_path / "cta_pool.json")
+        self.pool.save(path=path, model="gemma3n:e2b")
+        assert CallToActionPool.load(path=path).variants == self.pool.variants
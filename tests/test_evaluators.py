@@ -1,11 +1,27 @@
 import pytest
 import sys
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
-from evaluate.language import LanguageMatchEvaluator2, SpellingEvaluator, ReadabilityEvaluator
+from evaluate.language import (
+    LanguageMatchEvaluator2,
+    NgramLanguageMatchEvaluator,
+    SpellingEvaluator,
+    ReadabilityEvaluator,
+    ToneMatchEvaluator,
+)
+from evaluate.language_id import get_language_identifier
+from evaluate.spelling_whitelist import build_spelling_whitelist
+from evaluate.spell_dictionary import MappedWordList, compile_word_list, get_spell_dictionary
+from evaluate.readability import count_syllables_en, count_syllables_es, count_syllables_pt, flesch_scores
+from evaluate.complete_evaluator import CompleteEvaluator
+from evaluate.fact import RuleFactEvaluator
+from evaluate.tone import ToneLexiconClassifier
+from core.listing_document import ListingDocument
 
 
 class TestLanguageEvaluators:
@@ -120,3 +136,409 @@ class TestLanguageEvaluators:
         assert evaluator._get_difficulty_level(55) == "Fairly Difficult"
         assert evaluator._get_difficulty_level(35) == "Difficult"
         assert evaluator._get_difficulty_level(5) == "Very Confusing"
+
+
+class TestSpellDictionary:
+    """Test the compiled, memory-mapped word lists"""
+
+    def test_compiled_lookup(self, tmp_path):
+        """Test lookups and unknown() on a compiled word list"""
+        path = str(tmp_path / "words")
+        compile_word_list(words=["casa", "piso", "baño", "ático", "zona"], path=path)
+        words = MappedWordList(path=path)
+        assert len(words) == 5
+        assert all(word in words for word in ("casa", "baño", "ático", "zona"))
+        assert "casas" not in words and "" not in words
+        assert words.unknown(["Casa", "casas", "85", "!", "baño"]) == {"casas"}
+
+    def test_processes_can_share_a_file(self, tmp_path):
+        """Test independent mappings of one file (as in separate workers) read the same words"""
+        path = str(tmp_path / "words")
+        compile_word_list(words=["one", "two"], path=path)
+        assert [("two" in MappedWordList(path=path, cache_size=0)) for _ in range(2)] == [True, True]
+
+    def test_rejects_other_files(self, tmp_path):
+        """Test a file that is not a compiled word list is refused"""
+        path = tmp_path / "words"
+        path.write_bytes(b"not a word list at all")
+        with pytest.raises(ValueError):
+            MappedWordList(path=str(path))
+
+    def test_matches_pyspellchecker(self, tmp_path):
+        """Test the mapped dictionary reports the same unknown words as SpellChecker"""
+        from spellchecker import SpellChecker
+
+        words = "this beautifull apartmnt has modern features and 3 bedrooms in campo de ourique".split()
+        dictionary = get_spell_dictionary(language="en", directory=str(tmp_path))
+        assert dictionary.unknown(words) == SpellChecker(language="en").unknown(words)
+
+
+class TestReadabilityEngine:
+    """Test the per-language, stateless readability scoring"""
+
+    texts = {
+        "en": "This home is nice. It has two rooms. The kitchen is big. The price is good.",
+        "es": "Esta casa es bonita. Tiene dos habitaciones. La cocina es grande.",
+        "pt": "Esta casa é bonita. Tem dois quartos. A cozinha é grande.",
+    }
+
+    def test_syllable_counters(self):
+        """Test syllables per language, including silent endings, diphthongs and hiatus"""
+        assert [count_syllables_en(word) for word in ("home", "located", "spaces", "beautiful")] == [1, 3, 2, 3]
+        assert [count_syllables_es(word) for word in ("ciudad", "aeropuerto", "maíz", "habitación")] == [2, 5, 2, 4]
+        assert [count_syllables_pt(word) for word in ("cidade", "divisões", "mães", "habitação")] == [3, 3, 1, 4]
+
+    def test_batch_matches_single_scores(self):
+        """Test a mixed-language batch scores each text with its own language's formula"""
+        languages = list(self.texts)
+        batch = flesch_scores(texts=list(self.texts.values()), languages=languages)
+        single = [flesch_scores(texts=[text], languages=language)[0] for language, text in self.texts.items()]
+        assert batch.tolist() == pytest.approx(single)
+        # The same text scores differently under another language's formula
+        assert flesch_scores(texts=[self.texts["pt"]], languages="en")[0] != pytest.approx(batch[2])
+
+    def test_thread_safe_with_mixed_languages(self):
+        """Test concurrent evaluations in different languages do not affect each other"""
+        evaluator = ReadabilityEvaluator()
+        expected = {language: evaluator.evaluate(text=text, language_code=language) for language, text in self.texts.items()}
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            results = list(
+                pool.map(
+                    lambda language: (language, evaluator.evaluate(text=self.texts[language], language_code=language)),
+                    list(self.texts) * 50,
+                )
+            )
+        assert all(result == expected[language] for language, result in results)
+
+    def test_evaluate_batch(self):
+        """Test batch evaluation returns one standardized result per text"""
+        results = ReadabilityEvaluator().evaluate_batch(
+            texts=[ListingDocument.from_text(text=text) for text in self.texts.values()], language_codes=list(self.texts)
+        )
+        assert [result["evaluator"] for result in results] == ["ReadabilityEvaluator"] * 3
+        assert all(0.0 <= result["score"] <= 1.0 and result["findings"] for result in results)
+
+
+class TestNgramLanguageMatchEvaluator:
+    """Test the character n-gram language check"""
+
+    samples = {
+        "en": "Charming 2-bedroom flat in Campo de Ourique, 85 m² on the 3rd floor of Rua Ferreira Borges.",
+        "es": "Encantador piso de 2 dormitorios en Campo de Ourique, 85 m² en la 3ª planta de la Rua Ferreira Borges.",
+        "pt": "Encantador T2 em Campo de Ourique, 85 m² no 3.º andar da Rua Ferreira Borges.",
+    }
+
+    def test_identifies_each_language(self):
+        """Test en/es/pt texts full of place names are identified correctly"""
+        identifier = get_language_identifier()
+        for language, text in self.samples.items():
+            assert identifier.score(tokens=ListingDocument.from_text(text=text).tokens)["language"] == language
+
+    def test_passes_only_for_the_text_language(self):
+        """Test the check passes for the text's language and reports a mismatch for the others"""
+        evaluator = NgramLanguageMatchEvaluator()
+        for language, text in self.samples.items():
+            for target in self.samples:
+                result = evaluator.evaluate(text=text, language_code=target, target_language=target)
+                assert result["evaluator"] == "NgramLanguageMatchEvaluator"
+                assert result["passed"] == (target == language)
+                assert bool(result["findings"]) == (target != language)
+                if result["findings"]:
+                    assert result["findings"][0]["type"] == "language_mismatch"
+
+    def test_text_without_evidence_passes(self):
+        """Test numbers alone cannot fail the check"""
+        result = NgramLanguageMatchEvaluator().evaluate(text="85 m² 2010", language_code="pt")
+        assert result["passed"] and result["score"] == 1.0
+
+    def test_check_is_fast(self):
+        """Test a section is scored in well under a millisecond"""
+        evaluator = NgramLanguageMatchEvaluator()
+        document = ListingDocument.from_text(text=" ".join(self.samples.values()))
+        start = time.perf_counter()
+        for _ in range(200):
+            evaluator.evaluate(document=document, language_code="es", target_language="Español")
+        assert (time.perf_counter() - start) / 200 < 0.001
+
+
+class TestSpellingWhitelist:
+    """Test listing words and domain terms are not counted as misspelled"""
+
+    property_data = {
+        "title": "T3 apartment in Lisbon",
+        "location": {"city": "Lisbon", "neighborhood": "Campo de Ourique"},
+        "features": {"bedrooms": 3},
+    }
+    text = "Bright apartment in Campo de Ourique with an ensuite bedroom, 120 m² and a 3rd floor terrace."
+
+    def test_whitelist_comes_from_property_data_and_lexicon(self):
+        """Test the whitelist holds title and location words plus the domain lexicon"""
+        whitelist = build_spelling_whitelist(property_data=self.property_data, language="en")
+        assert {"ourique", "campo", "lisbon", "t3", "ensuite", "sqm"} <= whitelist
+        assert "ensuite" not in build_spelling_whitelist(language="pt")
+
+    def test_whitelisted_words_are_not_misspelled(self):
+        """Test listing names, units and ordinals do not fail the spelling check"""
+        evaluator = SpellingEvaluator()
+        whitelist = build_spelling_whitelist(property_data=self.property_data, language="en")
+        result = evaluator.evaluate(text=self.text, language_code="en", whitelist=whitelist)
+        assert result["passed"] and result["whitelist_rescued"]
+        assert not evaluator.evaluate(text=self.text, language_code="en", whitelist=frozenset())["passed"]
+        assert evaluator.whitelist_stats == {"checks": 2, "whitelisted_words": 2, "rescued": 1}
+
+    def test_real_misspellings_still_fail(self):
+        """Test the whitelist does not hide genuine misspellings"""
+        whitelist = build_spelling_whitelist(property_data=self.property_data, language="en")
+        result = SpellingEvaluator().evaluate(text=self.text + " Beautifull!", language_code="en", whitelist=whitelist)
+        assert not result["passed"] and "beautifull" in result["findings"][0]["message"]
+
+    @pytest.mark.asyncio
+    async def test_avoided_refinements_are_counted(self):
+        """Test sections that pass thanks to the whitelist are counted as avoided refinements"""
+        evaluator = CompleteEvaluator(language_match="spellchecker")
+        short_text = "Campo de Ourique, Lisbon: ensuite bedrooms."
+        document = ListingDocument(sections={"key_features": short_text})
+        result = await evaluator.evaluate_section(
+            document=document, section="key_features", property_data=self.property_data
+        )
+        assert result["evaluations"]["language_match"]["whitelist_rescued"]
+        assert result["passed"]
+        stats = evaluator.get_whitelist_stats()
+        assert stats["refinements_avoided"] == 1
+        assert stats["checks"]["language_match"]["rescued"] == 1
+
+    def test_ngram_check_reports_rescues(self):
+        """Test the n-gram language check flags passes that only the whitelist made possible"""
+        property_data = {"title": "Apartamento T3 em Campo de Ourique", "location": {"city": "Lisboa"}}
+        whitelist = build_spelling_whitelist(property_data=property_data, language="en")
+        evaluator = NgramLanguageMatchEvaluator()
+        text = "Apartamento T3 in Campo de Ourique, Lisboa, near shops."
+        result = evaluator.evaluate(text=text, language_code="en", whitelist=whitelist)
+        assert result["passed"] and result["whitelist_rescued"]
+        assert not evaluator.evaluate(text=text, language_code="en", whitelist=frozenset())["passed"]
+        result = evaluator.evaluate(text="Bright flat near shops in Lisboa.", language_code="en", whitelist=whitelist)
+        assert result["passed"] and not result["whitelist_rescued"]
+        assert evaluator.whitelist_stats == {"checks": 3, "whitelisted_words": 7, "rescued": 1}
+
+    @pytest.mark.asyncio
+    async def test_avoided_refinements_are_counted_by_default(self):
+        """Test the default language check counts avoided refinements"""
+        evaluator = CompleteEvaluator()
+        property_data = {
+            "title": "Apartamento T3 em Campo de Ourique",
+            "location": {"city": "Lisboa"},
+            "features": {"bedrooms": 3},
+        }
+        document = ListingDocument(sections={"key_features": "Apartamento T3 in Campo de Ourique, Lisboa, near shops."})
+        result = await evaluator.evaluate_section(document=document, section="key_features", property_data=property_data)
+        assert result["passed"]
+        stats = evaluator.get_whitelist_stats()
+        assert stats["refinements_avoided"] == 1
+        assert stats["checks"]["language_match"]["rescued"] == 1
+
+
+class TestRuleFactEvaluator:
+    """Test the rule-based fact checker"""
+
+    def setup_method(self):
+        """Setup test data"""
+        self.evaluator = RuleFactEvaluator()
+        self.sample_property_data = {
+            "title": "Modern home in San Francisco",
+            "features": {
+                "bedrooms": 3,
+                "bathrooms": 2,
+                "area_sqm": 167,
+                "balcony": True,
+                "parking": True,
+                "elevator": False,
+                "floor": 1,
+                "year_built": 2010,
+            },
+            "price": 850000,
+            "listing_type": "sale",
+        }
+
+    def claimed(self, text, language="en"):
+        result = self.evaluator.check(text=text, property_data=self.sample_property_data, language=language)
+        return [(finding["fact"], finding["claimed"]) for finding in result["findings"]]
+
+    def test_correct_facts_pass(self):
+        """Test matching numbers and features in all languages pass"""
+        texts = {
+            "en": "Three bedrooms, 2 full baths and 167 m² on the first floor, built in 2010. Balcony and parking, no elevator. $850,000.",
+            "es": "Tres dormitorios, dos baños, 167 metros cuadrados, balcón y garaje, sin ascensor, construido en 2010. 850.000 €.",
+            "pt": "Três quartos, 2 banheiros, 167 m², 1º andar, varanda e garagem, sem elevador. 850 mil euros.",
+        }
+        for language, text in texts.items():
+            result = self.evaluator.check(text=text, property_data=self.sample_property_data, language=language)
+            assert result["passed"], (language, result["findings"])
+            assert result["score"] == 1.0
+
+    def test_wrong_numbers_are_flagged(self):
+        """Test contradicting numbers are reported with the claimed text"""
+        assert self.claimed("A bright 4-bedroom home built in 2012, floor 2, for $900,000.") == [
+            ("bedrooms", "4-bedroom"),
+            ("floor", "floor 2"),
+            ("year_built", "built in 2012"),
+            ("price", "$900,000"),
+        ]
+        assert self.claimed("Piso de cuatro dormitorios y 3 baños.", language="es") == [
+            ("bedrooms", "cuatro dormitorios"),
+            ("bathrooms", "3 baños"),
+        ]
+
+    def test_area_and_price_tolerance(self):
+        """Test rounded area and scaled prices are accepted"""
+        assert self.claimed("About 170 sqm, yours for $850K.") == []
+        assert self.claimed("200 m² for $1.2 million.") == [("area_sqm", "200 m²"), ("price", "$1.2 million")]
+
+    def test_boolean_features(self):
+        """Test false features that are mentioned and true features that are negated are flagged"""
+        assert self.claimed("Enjoy the elevator and the balcony.") == [("elevator", "elevator")]
+        assert self.claimed("Sorry, no private parking.") == [("parking", "no private parking")]
+        assert self.claimed("Sem varanda.", language="pt") == [("balcony", "Sem varanda")]
+        result = self.evaluator.check(text="Sin ascensor.", property_data=self.sample_property_data, language="es")
+        assert result["findings"] == []
+        assert self.evaluator.check(text="Has an elevator.", property_data=self.sample_property_data, language="en")[
+            "findings"
+        ][0]["correct"] == "no elevator"
+
+    def test_articles_and_feature_phrases_are_not_counts(self):
+        """Test articles and "one" separated from the noun do not become count claims"""
+        assert self.claimed("Dispone de un baño en suite y una habitación de invitados.", language="es") == []
+        assert self.claimed("Com uma casa de banho privativa.", language="pt") == []
+        assert self.claimed("Includes one spacious bedroom suite.") == []
+        assert self.claimed("Only one bedroom.") == [("bedrooms", "one bedroom")]
+        assert self.claimed("Two spacious bedrooms.") == [("bedrooms", "Two spacious bedrooms")]
+
+    def test_negation_scope_ends_at_the_clause(self):
+        """Test commas, contrasting conjunctions and "not just" end or cancel a negation"""
+        features = dict(self.sample_property_data["features"], elevator=True, parking=False)
+        property_data = dict(self.sample_property_data, features=features)
+
+        def findings(text, language="en"):
+            return self.evaluator.check(text=text, property_data=property_data, language=language)["findings"]
+
+        assert findings("No parking worries, elevator access.") == []
+        assert findings("Not just a balcony but a terrace.") == []
+        assert findings("No garden but a balcony.") == []
+        assert findings("No sólo un balcón, también ascensor.", language="es") == []
+        assert [finding["claimed"] for finding in findings("No balcony.")] == ["No balcony"]
+
+    def test_unknown_facts_are_uncertain(self):
+        """Test claims the listing has no value for are left uncertain instead of failing"""
+        result = self.evaluator.check(text="3 bedrooms and a garage.", property_data={"features": {}}, language="en")
+        assert result["passed"]
+        assert result["uncertain"] == ["3 bedrooms", "garage"]
+
+    @pytest.mark.asyncio
+    async def test_llm_second_stage_only_when_uncertain(self):
+        """Test the LLM fact checker is only consulted when enabled and the rules are unsure"""
+        calls = []
+
+        class FakeFactChecker:
+            async def evaluate(self, content, property_data):
+                calls.append(content)
+                return {"score": 0.5, "passed": False, "findings": [{"message": "Wrong view"}]}
+
+        evaluator = RuleFactEvaluator(llm_second_stage=True, fact_checker_agent=FakeFactChecker())
+        certain = await evaluator.evaluate(text="3 bedrooms.", property_data=self.sample_property_data)
+        assert certain["passed"] and calls == []
+        # Words the rules do not know about are not claims
+        unknown = await evaluator.evaluate(text="3 bedrooms and a pool.", property_data={"features": {"bedrooms": 3}})
+        assert unknown["passed"] and calls == []
+        unsure = await evaluator.evaluate(text="3 bedrooms and a garage.", property_data={"features": {"bedrooms": 3}})
+        assert len(calls) == 1
+        assert not unsure["passed"] and unsure["findings"] == [{"message": "Wrong view"}]
+
+    def test_check_is_fast(self):
+        """Test a rule check stays well under a millisecond"""
+        text = "Three bedrooms, 2 baths and 167 m² on the first floor, built in 2010, with a balcony. $850,000. " * 3
+        start = time.perf_counter()
+        for _ in range(200):
+            self.evaluator.check(text=text, property_data=self.sample_property_data, language="en")
+        assert (time.perf_counter() - start) / 200 < 0.001
+
+
+class FakeToneAgent:
+    """LLM tone evaluator stand-in that records its calls"""
+
+    def __init__(self, passed=True):
+        self.passed = passed
+        self.calls = 0
+
+    async def evaluate(self, content, expected_tone="professional"):
+        self.calls += 1
+        return {"score": 0.9 if self.passed else 0.3, "passed": self.passed, "findings": []}
+
+
+class TestToneMatchEvaluator:
+    """Test the lexicon tone pre-classifier and the LLM gate"""
+
+    def setup_method(self):
+        """Setup test data"""
+        self.evaluator = ToneMatchEvaluator(uncertain_low=0.35, uncertain_high=0.65, audit_rate=0.0)
+        self.agent = FakeToneAgent()
+        self.evaluator.agent = self.agent
+        self.luxury_text = {
+            "en": "An exclusive penthouse with exquisite marble finishes, a private spa and a concierge.",
+            "es": "Un ático exclusivo de lujo con acabados de mármol exquisitos y conserje privado.",
+            "pt": "Uma cobertura de luxo exclusiva com acabamentos em mármore requintados e concierge.",
+        }
+        self.youthful_text = "A fun, affordable flat in a lively area full of cafes, bars and nightlife for young friends."
+
+    def test_classifier_scores_target_tone(self):
+        """Test the lexicon scores the matching tone high and other tones low in every language"""
+        classifier = ToneLexiconClassifier()
+        for language, text in self.luxury_text.items():
+            tokens = ListingDocument.from_text(text=text, language=language).tokens
+            assert classifier.classify(tokens=tokens, target_tone="luxury", language=language)["score"] >= 0.65
+            assert classifier.classify(tokens=tokens, target_tone="youthful", language=language)["score"] < 0.35
+
+    def test_longest_phrase_wins(self):
+        """Test a phrase counts once instead of also counting its words"""
+        classifier = ToneLexiconClassifier()
+        result = classifier.classify(tokens=["a", "smart", "home"], target_tone="modern", language="en")
+        assert result["tone_scores"]["modern"] == 1.5
+
+    @pytest.mark.asyncio
+    async def test_confident_scores_skip_the_llm(self):
+        """Test clear matches and clear mismatches are decided locally"""
+        passed = await self.evaluator.evaluate(text=self.luxury_text["en"], target_tone="luxury", language="en")
+        failed = await self.evaluator.evaluate(text=self.youthful_text, target_tone="luxury", language="en")
+        assert passed["passed"] and passed["source"] == "lexicon"
+        assert not failed["passed"] and failed["source"] == "lexicon"
+        assert "'youthful'" in failed["findings"][0]["message"]
+        assert self.agent.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_uncertain_scores_ask_the_llm(self):
+        """Test neutral text and unknown tones go to the LLM and are compared with the local verdict"""
+        neutral = await self.evaluator.evaluate(text="The flat has three rooms.", target_tone="luxury", language="en")
+        unknown = await self.evaluator.evaluate(text=self.luxury_text["en"], target_tone="professional")
+        assert neutral["source"] == unknown["source"] == "llm"
+        assert self.agent.calls == 2
+        stats = self.evaluator.get_agreement_stats()
+        assert stats["llm_calls"] == 2 and stats["regions"]["uncertain"]["comparisons"] == 2
+
+    @pytest.mark.asyncio
+    async def test_audits_measure_agreement(self):
+        """Test audited confident decisions are compared with the LLM"""
+        self.evaluator.audit_rate = 1.0
+        self.agent.passed = False
+        await self.evaluator.evaluate(text=self.luxury_text["en"], target_tone="luxury", language="en")
+        await self.evaluator.evaluate(text=self.youthful_text, target_tone="luxury", language="en")
+        stats = self.evaluator.get_agreement_stats()
+        assert stats["regions"]["above"] == {"comparisons": 1, "agreements": 0, "rate": 0.0}
+        assert stats["regions"]["below"] == {"comparisons": 1, "agreements": 1, "rate": 1.0}
+        assert stats["agreement_rate"] == 0.5
+
+    def test_classifier_is_fast(self):
+        """Test a local tone check takes well under a millisecond"""
+        classifier = ToneLexiconClassifier()
+        tokens = ListingDocument.from_text(text=" ".join([self.luxury_text["en"]] * 5)).tokens
+        start = time.perf_counter()
+        for _ in range(200):
+            classifier.classify(tokens=tokens, target_tone="luxury", language="en")
+        assert (time.perf_counter() - start) / 200 < 0.001
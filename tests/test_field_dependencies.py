@@ -0,0 +1,73 @@
+import pytest
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.field_dependencies import affected_sections, changed_fields, depends_on_changes
+from core.html_generator import HTMLGenerator
+
+
+class TestFieldDependencies:
+    """Test the property_data fields each section depends on"""
+
+    def setup_method(self):
+        """Setup test data"""
+        self.property_data = {
+            "title": "Modern home in San Francisco",
+            "location": {"city": "San Francisco", "neighborhood": "Nob Hill"},
+            "features": {"bedrooms": 3, "bathrooms": 2, "balcony": True},
+            "price": 850000,
+            "listing_type": "sale",
+        }
+        self.agents = HTMLGenerator().agents
+
+    def updated(self, **changes):
+        data = {key: dict(value) if isinstance(value, dict) else value for key, value in self.property_data.items()}
+        for path, value in changes.items():
+            *parents, key = path.split("__")
+            target = data
+            for parent in parents:
+                target = target[parent]
+            target[key] = value
+        return data
+
+    def test_changed_fields_are_dotted_paths(self):
+        """Test nested changes are reported per field, additions and removals included"""
+        new = self.updated(price=799000, location__neighborhood="Russian Hill")
+        new["features"].pop("balcony")
+        new["virtual_tour"] = "https://example.com/tour"
+        assert changed_fields(self.property_data, new) == {
+            "price",
+            "location.neighborhood",
+            "features.balcony",
+            "virtual_tour",
+        }
+        assert changed_fields(self.property_data, self.updated()) == set()
+
+    def test_dependencies_match_parents_and_children(self):
+        """Test a dependency covers the fields inside it and is covered by a replaced parent"""
+        assert depends_on_changes(["features"], ["features.bedrooms"])
+        assert depends_on_changes(["location.city"], ["location"])
+        assert not depends_on_changes(["location.city"], ["location.neighborhood"])
+        assert depends_on_changes(["*"], ["anything"])
+
+    @pytest.mark.parametrize(
+        "changes, untouched",
+        [
+            ({"price": 799000}, {"key_features", "neighborhood"}),
+            ({"features__bedrooms": 4}, {"neighborhood"}),
+            ({"location__neighborhood": "Russian Hill"}, {"key_features"}),
+        ],
+    )
+    def test_affected_sections(self, changes, untouched):
+        """Test only the sections whose agent reads a changed field are redrafted"""
+        affected = affected_sections(
+            agents=self.agents, old_property_data=self.property_data, new_property_data=self.updated(**changes)
+        )
+        assert set(affected) == set(self.agents) - untouched
+
+    def test_unchanged_listing_redrafts_nothing(self):
+        """Test identical data leaves every section in place"""
+        assert affected_sections(self.agents, self.property_data, self.updated()) == []
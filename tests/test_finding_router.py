@@ -0,0 +1,220 @@
+import pytest
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.finding_router import route_section_findings
+from agents.evaluation.improvement_suggestion_agent import ImprovementSuggestionAgent
+
+
+def seo_result(*findings):
+    """Failed SEO evaluation carrying the given seokar issues"""
+    return {"seo": {"passed": False, "score": 0.5, "findings": list(findings)}}
+
+
+TITLE_TOO_SHORT = {
+    "message": "Title Too Short",
+    "element_type": "Title",
+    "details": "Length 12 (optimal 30-60).",
+    "recommendation": "Expand title.",
+}
+
+
+class TestFindingRouter:
+    """Test deterministic routing of findings to section instructions"""
+
+    def test_seo_length_issue(self):
+        """Test a seokar length issue becomes a localized instruction with its numbers"""
+        result = {"section": "title", "content": "Nice home!!", "evaluations": seo_result(TITLE_TOO_SHORT)}
+        instructions, unrouted = route_section_findings(section_result=result, language="en")
+        assert instructions == [
+            "Problem: the title is too short (12 characters). Fix: expand it to 30-60 characters."
+        ]
+        assert unrouted == []
+
+        instructions, _ = route_section_findings(section_result=result, language="es")
+        assert instructions[0].startswith("Problema: el título tiene muy pocos caracteres (12)")
+
+    def test_passing_checks_are_ignored(self):
+        """Test informational findings of passing checks are not turned into instructions"""
+        result = {
+            "section": "description",
+            "content": "Text",
+            "evaluations": {
+                "readability": {"passed": True, "findings": [{"type": "readability", "message": "Flesch 70"}]},
+                "language_match": {
+                    "passed": False,
+                    "findings": [{"type": "language_mismatch", "message": "Text should be in Português."}],
+                },
+            },
+        }
+        instructions, unrouted = route_section_findings(section_result=result, language="pt", language_name="Português")
+        assert instructions == [
+            "Problema: a descrição não está totalmente em Português. Solução: reescreva todo o texto em Português."
+        ]
+        assert unrouted == []
+
+    def test_free_text_findings_are_left_for_the_llm(self):
+        """Test tone feedback and unknown seokar issues are not routed"""
+        tone = {"type": "tone", "message": "Text should have a 'luxury' tone."}
+        unknown = {"message": "Something new", "element_type": "Title"}
+        result = {
+            "section": "call_to_action",
+            "evaluations": {"tone_match": {"passed": False, "findings": [tone]}, **seo_result(unknown)},
+        }
+        instructions, unrouted = route_section_findings(section_result=result)
+        assert instructions == []
+        assert unrouted == [tone, unknown]
+
+    def test_duplicate_instructions_are_merged(self):
+        """Test the same issue reported twice yields one instruction"""
+        result = {"section": "title", "evaluations": seo_result(TITLE_TOO_SHORT, dict(TITLE_TOO_SHORT))}
+        instructions, _ = route_section_findings(section_result=result)
+        assert len(instructions) == 1
+
+    @pytest.mark.asyncio
+    async def test_llm_call_is_skipped_for_routable_findings(self):
+        """Test the improvement agent answers without the LLM when every finding is routable"""
+        agent = ImprovementSuggestionAgent()
+
+        async def fail_run_task(task):
+            raise AssertionError("LLM should not be called")
+
+        agent.run_task = fail_run_task
+        evaluation_results = {
+            "sections": {
+                "title": {"passed": False, "content": "Nice", "evaluations": seo_result(TITLE_TOO_SHORT), "findings": []}
+            }
+        }
+        suggestions = await agent.generate_section_improvements(
+            current_content="Nice", evaluation_results=evaluation_results, property_data={"title": "Nice"}
+        )
+        assert suggestions["title"]["suggestion"].startswith("Problem: the title is too short")
+        assert agent.get_routing_stats()["skipped_llm_calls"] == 1
+
+    @pytest.mark.asyncio
+    async def test_llm_only_sees_unrouted_findings(self):
+        """Test the LLM prompt only carries free-text findings and its answer is merged"""
+        agent = ImprovementSuggestionAgent()
+        prompts = []
+
+        async def fake_run_task(task):
+            prompts.append(task)
+            return '{"title": "Problem: tone is flat. Fix: sound more exclusive."}'
+
+        agent.run_task = fake_run_task
+        tone = {"type": "tone", "message": "Text should have a 'luxury' tone."}
+        evaluations = dict(seo_result(TITLE_TOO_SHORT), tone_match={"passed": False, "findings": [tone]})
+        evaluation_results = {
+            "sections": {"title": {"passed": False, "content": "Nice", "evaluations": evaluations, "findings": [tone]}}
+        }
+        suggestions = await agent.generate_section_improvements(
+            current_content="Nice", evaluation_results=evaluation_results, property_data={"title": "Nice"}
+        )
+        assert len(prompts) == 1
+        assert "luxury" in prompts[0] and "Title Too Short" not in prompts[0]
+        assert suggestions["title"]["suggestion"] == (
+            "Problem: the title is too short (12 characters). Fix: expand it to 30-60 characters. "
+            "Problem: tone is flat. Fix: sound more exclusive."
+        )
+
+
+class TestCompactFindings:
+    """Test the compact findings payload of the improvement prompt"""
+
+    def setup_method(self):
+        """Setup a listing whose evaluation produces verbose seokar issues"""
+        from core.listing_document import ListingDocument
+        from evaluate.seo import SeoEvaluator
+        import asyncio
+
+        self.sample_property_data = {
+            "title": "Modern home in San Francisco",
+            "location": {"city": "San Francisco", "neighborhood": "Nob Hill"},
+            "features": {"bedrooms": 3, "bathrooms": 2, "area_sqm": 167},
+            "price": 850000,
+            "listing_type": "sale",
+        }
+        self.document = ListingDocument(
+            sections={
+                "title": "Home",
+                "meta": "Nice home",
+                "h1": "Home in Nob Hill",
+                "description": "A nice home with three bedrooms. It is close to the park.",
+                "key_features": "- 3 bedrooms\n- 2 bathrooms\n- 167 m²",
+                "neighborhood": "Nob Hill is central and quiet.",
+                "call_to_action": "Call us today.",
+            }
+        )
+        seo_findings = asyncio.run(SeoEvaluator().evaluate(document=self.document))["findings"]
+        tone = {"type": "tone", "message": "Text should have a 'luxury' tone."}
+        language = {"type": "language_mismatch", "severity": "medium", "message": "Text should be in English."}
+        # The same issues reported by the holistic and the final evaluation
+        self.seo_findings = seo_findings
+        self.all_findings = seo_findings + [tone, language] + seo_findings + [tone]
+
+    def test_findings_are_normalized_and_deduplicated(self):
+        """Test findings become unique compact records ranked by severity"""
+        from core.finding_router import compact_findings, SEVERITY_RANKS
+
+        findings = compact_findings(findings=self.all_findings)
+        keys = [(finding["section"], finding["type"], finding["message"]) for finding in findings]
+        assert len(keys) == len(set(keys)) == len(self.seo_findings) + 2
+        assert set(findings[0]) == {"section", "type", "severity", "message"}
+        title = next(finding for finding in findings if finding["section"] == "title")
+        assert title == {
+            "section": "title",
+            "type": "seo",
+            "severity": "warning",
+            "message": "Title Too Short. Length 4 (optimal 30-60). Expand title.",
+        }
+        ranks = [SEVERITY_RANKS[finding["severity"]] for finding in findings]
+        assert ranks == sorted(ranks)
+
+    def test_top_k(self):
+        """Test at most max_findings findings are kept, most severe first"""
+        from core.finding_router import compact_findings
+
+        findings = compact_findings(
+            findings=[
+                {"type": "tone", "message": "low", "severity": "low"},
+                {"type": "tone", "message": "critical", "severity": "critical"},
+                {"type": "tone", "message": "medium"},
+            ],
+            max_findings=2,
+        )
+        assert [finding["message"] for finding in findings] == ["critical.", "medium."]
+
+    def test_prompt_length_before_and_after(self):
+        """Test the improvement prompt shrinks compared to raw finding dicts and the whole HTML"""
+        from agents.evaluation.improvement_suggestion_agent import IMPROVEMENT_PROMPTS, IMPROVEMENT_SECTIONS
+        from core.property_facts import serialize_property_facts
+
+        agent = ImprovementSuggestionAgent(max_findings=4)
+        evaluation_results = {"all_findings": self.all_findings}
+        after = agent._build_improvement_prompt(
+            current_content=self.document.section_text,
+            evaluation_results=evaluation_results,
+            property_data=self.sample_property_data,
+            language="en",
+            tone="luxury",
+        )
+        templates = IMPROVEMENT_PROMPTS["en"]
+        before = templates["prompt"].format(
+            language_name="English",
+            property_data=serialize_property_facts(property_data=self.sample_property_data, language="en"),
+            tone="luxury",
+            scores_text="SEO: 0.00, Language: 0.00, Tone: 0.00\n",
+            current_content=self.document.html,
+            issues_text="\n".join([f"  - {issue}" for issue in self.all_findings]),
+            response_format=",\n".join(
+                templates["section_format"].format(section=section, label=templates["section_labels"][section])
+                for section in IMPROVEMENT_SECTIONS
+            ),
+        )
+        print(f"improvement prompt: {len(before)} -> {len(after)} characters")
+        assert len(after) < 0.75 * len(before)
+        assert "SEOResultLevel" not in after
+        assert "<!DOCTYPE html>" not in after
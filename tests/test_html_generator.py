@@ -83,3 +83,41 @@ class TestHTMLGenerator:
         generator = HTMLGenerator()
         # Should not have sections before generation
         assert not hasattr(generator, "sections") or generator.sections is None
+
+    def test_cascade_drafts_with_fastest_model(self):
+        """Test cascade mode drafts with the fastest model and refines with the selected one"""
+        from config.options import get_fastest_model
+
+        generator = HTMLGenerator(model="gemma3n:e2b", cascade=True)
+        assert generator.draft_model == get_fastest_model() == "gemma3:1b-it-qat"
+        assert generator.draft_agents is not generator.agents
+        assert set(generator.draft_agents) == set(generator.agents)
+        assert all(count == 0 for count in generator.get_escalation_counts().values())
+
+    def test_no_cascade_reuses_agents(self):
+        """Test drafts and refinements share agents when cascade is disabled"""
+        generator = HTMLGenerator(model="gemma3n:e2b")
+        assert generator.draft_model == "gemma3n:e2b"
+        assert generator.draft_agents is generator.agents
+
+    @pytest.mark.asyncio
+    async def test_cascade_counts_escalations(self):
+        """Test refined sections are counted as escalations in cascade mode"""
+
+        class FakeAgent:
+            async def refine(self, **kwargs):
+                return "refined"
+
+        generator = HTMLGenerator(cascade=True)
+        agents = {"title": FakeAgent(), "h1": FakeAgent()}
+        refined = await generator._apply_section_refinements(
+            sections={"title": "draft", "h1": "draft"},
+            section_improvements={"title": {"suggestion": "Make it longer"}, "h1": {"suggestion": None}},
+            property_data=self.sample_property_data,
+            agents=agents,
+            language="en",
+            tone="modern",
+        )
+        assert refined == {"title": "refined", "h1": "draft"}
+        assert generator.get_escalation_counts()["title"] == 1
+        assert generator.get_escalation_counts()["h1"] == 0
@@ -0,0 +1,76 @@
+import sys
+import os
+import re
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.listing_document import ListingDocument
+from evaluate.language import LanguageMatchEvaluator2, SpellingEvaluator
+
+
+class TestListingDocument:
+    """Test the ListingDocument views consumed by the evaluators"""
+
+    def setup_method(self):
+        """Setup test data"""
+        self.sections = {
+            "title": "Modern home in Nob Hill",
+            "meta": "Three bedroom home for sale",
+            "h1": "Your new family home",
+            "description": "Bright rooms. A quiet street!  Close to parks?",
+            "key_features": "- 3 bedrooms\n• balcony\n\n* parking",
+            "neighborhood": "Nob Hill is central.",
+            "call_to_action": "Book a visit today.",
+        }
+
+    def test_plain_text_matches_stripped_html(self):
+        """Test the plain text equals the visible text of the assembled HTML"""
+        document = ListingDocument(sections=self.sections, language="en")
+        stripped = " ".join(re.sub(pattern=r"<[^>]+>", repl="", string=document.html).split())
+        assert document.plain_text == stripped
+        # The meta description is an attribute, not visible text
+        assert "Three bedroom" not in document.plain_text
+
+    def test_section_views(self):
+        """Test per-section text, sentences and word counts"""
+        document = ListingDocument(sections=self.sections)
+        assert document.section_text["key_features"] == "3 bedrooms balcony parking"
+        assert document.section_sentences["description"] == ["Bright rooms.", "A quiet street!", "Close to parks?"]
+        assert document.section_sentences["key_features"] == ["3 bedrooms", "balcony", "parking"]
+        assert document.section_word_counts["meta"] == 5
+        assert document.word_count == len(document.tokens) == sum(
+            count for name, count in document.section_word_counts.items() if name != "meta"
+        )
+        assert document.tokens[:4] == ["modern", "home", "in", "nob"]
+
+    def test_views_are_computed_once(self):
+        """Test derived views are cached on the document"""
+        document = ListingDocument(sections=self.sections)
+        assert document.tokens is document.tokens
+        assert document.html is document.html
+        assert document.section_text is document.section_text
+
+    def test_missing_sections_use_defaults(self):
+        """Test an empty document renders the default content"""
+        document = ListingDocument(sections={})
+        assert "<h1>Property Listing</h1>" in document.html
+        assert document.plain_text.startswith("Property Listing Property Listing Property description")
+
+    def test_from_html(self):
+        """Test a document built from raw HTML keeps the HTML and strips it once"""
+        document = ListingDocument.from_html(html_content="<h1>Hello</h1>\n<p>Nice  world</p>")
+        assert document.html == "<h1>Hello</h1>\n<p>Nice  world</p>"
+        assert document.plain_text == "Hello Nice world"
+        assert document.tokens == ["hello", "nice", "world"]
+
+    def test_evaluators_accept_document(self):
+        """Test document-based and text-based evaluation give the same result"""
+        document = ListingDocument(sections=self.sections)
+        for evaluator, kwargs in (
+            (SpellingEvaluator(), {"language_code": "en"}),
+            (LanguageMatchEvaluator2(), {"language_code": "en", "target_language": "English"}),
+        ):
+            from_document = evaluator.evaluate(document=document, **kwargs)
+            from_text = evaluator.evaluate(text=document.plain_text, **kwargs)
+            assert from_document["score"] == from_text["score"]
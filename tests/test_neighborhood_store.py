@@ -0,0 +1,83 @@
+import pytest
+import sys
+import os
+import time
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.neighborhood_store import NeighborhoodStore, listing_identity, neighborhood_key
+
+
+class TestNeighborhoodStore:
+    """Test the persistent neighborhood section store"""
+
+    def setup_method(self):
+        """Setup test data"""
+        self.property_data = {
+            "title": "Modern home in San Francisco",
+            "location": {"city": "San Francisco", "neighborhood": "Nob Hill"},
+            "price": 850000,
+        }
+        self.key = neighborhood_key(property_data=self.property_data, language="en", tone="luxury", model="gemma3n:e2b")
+
+    def test_key_ignores_case_and_listing_details(self):
+        """Test listings in the same location share a key and listings without a location have none"""
+        other = {"title": "Loft", "location": {"city": "san francisco ", "neighborhood": "NOB HILL"}, "price": 1}
+        assert neighborhood_key(property_data=other, language="en", tone="luxury", model="gemma3n:e2b") == self.key
+        assert neighborhood_key(property_data=self.property_data, language="es", tone="luxury", model="gemma3n:e2b") != self.key
+        assert neighborhood_key(property_data={"title": "Loft"}, language="en", tone="luxury", model="gemma3n:e2b") is None
+
+    def test_serves_only_full_keys_and_keeps_the_best_variants(self):
+        """Test a key is served once it holds enough variants, keeping the highest scores"""
+        store = NeighborhoodStore(path=":memory:", variants=2)
+        store.add(key=self.key, content="First.", score=0.7)
+        assert store.pick(key=self.key, property_data=self.property_data) is None
+        store.add(key=self.key, content="Second.", score=0.9)
+        store.add(key=self.key, content="Third.", score=0.8)
+        assert store.get_variants(key=self.key) == [("Second.", 0.9), ("Third.", 0.8)]
+        picked = store.pick(key=self.key, property_data=self.property_data)
+        assert picked in {"Second.", "Third."}
+        # The same listing always gets the same variant
+        assert store.pick(key=self.key, property_data=dict(self.property_data)) == picked
+
+    def test_variant_follows_the_listing_identity(self):
+        """Test a new price keeps a listing's variant and an explicit ID takes precedence over the title"""
+        store = NeighborhoodStore(path=":memory:", variants=3)
+        for score, content in enumerate(["First.", "Second.", "Third."]):
+            store.add(key=self.key, content=content, score=score)
+        picked = store.pick(key=self.key, property_data=self.property_data)
+        assert store.pick(key=self.key, property_data=dict(self.property_data, price=799000)) == picked
+        assert listing_identity({"id": 7, "title": "Old"}) == listing_identity({"id": 7, "title": "New"})
+        assert listing_identity({"title": "Old"}) != listing_identity({"title": "New"})
+
+    def test_stale_variants_are_not_served(self):
+        """Test variants older than max_age_days are ignored"""
+        store = NeighborhoodStore(path=":memory:", variants=1, max_age_days=1)
+        store.add(key=self.key, content="Old.", score=1.0)
+        store._connect().execute("UPDATE neighborhood_sections SET created_at = ?", (time.time() - 2 * 86400,))
+        assert store.pick(key=self.key, property_data=self.property_data) is None
+
+    def test_storing_a_variant_again_keeps_its_age(self):
+        """Test adding a stored variant again updates its score but not its creation time"""
+        store = NeighborhoodStore(path=":memory:", variants=1, max_age_days=1)
+        store.add(key=self.key, content="Old.", score=0.5)
+        created_at = time.time() - 3600
+        store._connect().execute("UPDATE neighborhood_sections SET created_at = ?", (created_at,))
+        store.add(key=self.key, content="Old.", score=0.9)
+        assert store._connect().execute("SELECT score, created_at FROM neighborhood_sections").fetchall() == [
+            (0.9, created_at)
+        ]
+
+    def test_persists_across_instances(self, tmp_path):
+        """Test variants written by one process are served by another"""
+        path = str(tmp_path / "store" / "neighborhoods.sqlite3")
+        writer = NeighborhoodStore(path=path, variants=1)
+        writer.add(key=self.key, content="Nob Hill is quiet.", score=0.9)
+        writer.close()
+        assert NeighborhoodStore(path=path, variants=1).pick(key=self.key, property_data=self.property_data) == "Nob Hill is quiet."
+
+    def test_invalid_configuration(self):
+        """Test a store needs at least one variant per key"""
+        with pytest.raises(ValueError):
+            NeighborhoodStore(path=":memory:", variants=0)
@@ -0,0 +1,131 @@
+import pytest
+import sys
+import os
+import re
+import json
+import asyncio
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from agents.content_generation.title_agent import TitleAgent
+from core.prompt_batcher import PromptBatcher, parse_batch_response
+
+
+class TestPromptBatcher:
+    """Test cross-listing batching of the short section prompts"""
+
+    def setup_method(self):
+        """Setup test data"""
+        self.listings = [
+            {"title": f"Home {index}", "location": {"city": "Lisboa"}, "features": {"bedrooms": index}, "price": 100000 * index}
+            for index in range(1, 6)
+        ]
+        self.prompts = []
+
+    def make_agent(self, bad_ids=()):
+        """TitleAgent whose model answers from the listing titles found in the prompt"""
+        agent = TitleAgent()
+
+        async def fake_run_task(task, options=None):
+            self.prompts.append(task)
+            await asyncio.sleep(0)
+            ids = re.findall(r"^\[(L\d+)\] .*?: (Home \d+)", task, flags=re.MULTILINE)
+            if not ids:
+                return "Single " + re.search(r"Home \d+", task).group(0)
+            items = [
+                {"id": listing_id, "text": ("x" * 80 if listing_id in bad_ids else f"Batched {title}")}
+                for listing_id, title in ids
+            ]
+            return "```json\n" + json.dumps(items) + "\n```"
+
+        agent.run_task = fake_run_task
+        return agent
+
+    async def draft_all(self, batcher, agent):
+        return await asyncio.gather(
+            *[
+                batcher.generate_initial(agent=agent, section="title", property_data=listing, language="en", tone="modern")
+                for listing in self.listings
+            ]
+        )
+
+    @pytest.mark.asyncio
+    async def test_concurrent_drafts_share_prompts(self):
+        """Test a full batch is sent at once and the remainder when the wait expires"""
+        batcher = PromptBatcher(max_listings=4, max_wait_ms=5)
+        titles = await self.draft_all(batcher, self.make_agent())
+        assert titles == ["Batched Home 1", "Batched Home 2", "Batched Home 3", "Batched Home 4", "Single Home 5"]
+        assert len(self.prompts) == 2
+        assert self.prompts[0].count("\n[L") == 4
+        assert batcher.get_stats() == {"drafts": 5, "batched_calls": 1, "single_calls": 1, "retried_items": 0}
+
+    @pytest.mark.asyncio
+    async def test_only_invalid_items_are_retried(self):
+        """Test items breaking the section limit are drafted again without redoing the valid ones"""
+        batcher = PromptBatcher(max_listings=5, max_wait_ms=5, max_retries=1)
+        titles = await self.draft_all(batcher, self.make_agent(bad_ids={"L2", "L4"}))
+        # L2 and L4 break the 60-character title limit and are retried as L1 and L2 of a smaller batch,
+        # where L2 (Home 4) fails again and is drafted with its own prompt
+        assert titles == ["Batched Home 1", "Batched Home 2", "Batched Home 3", "Single Home 4", "Batched Home 5"]
+        assert batcher.get_stats() == {"drafts": 5, "batched_calls": 2, "single_calls": 1, "retried_items": 3}
+
+    @pytest.mark.asyncio
+    async def test_batches_in_flight_are_kept_until_done(self):
+        """Test each batch task is referenced while it runs and released once it finishes"""
+        batcher = PromptBatcher(max_listings=4, max_wait_ms=5)
+        agent = self.make_agent()
+        run_task = agent.run_task
+        in_flight = []
+
+        async def tracking_run_task(task, options=None):
+            in_flight.append(len(batcher._tasks))
+            return await run_task(task=task, options=options)
+
+        agent.run_task = tracking_run_task
+        await self.draft_all(batcher, agent)
+        await asyncio.sleep(0)
+        assert in_flight == [1, 1]
+        assert not batcher._tasks
+
+    @pytest.mark.asyncio
+    async def test_model_failure_reaches_every_listing(self):
+        """Test a failed batched call fails each waiting draft instead of hanging"""
+        agent = TitleAgent()
+
+        async def unreachable(task, options=None):
+            raise ConnectionError("Ollama is not running")
+
+        agent.run_task = unreachable
+        batcher = PromptBatcher(max_listings=2, max_wait_ms=5)
+        results = await asyncio.gather(
+            *[
+                batcher.generate_initial(agent=agent, section="title", property_data=listing, language="en", tone="modern")
+                for listing in self.listings[:2]
+            ],
+            return_exceptions=True,
+        )
+        assert all(isinstance(result, ConnectionError) for result in results)
+
+    def test_parse_batch_response(self):
+        """Test the array answer and the shapes small models return instead"""
+        assert parse_batch_response('[{"id": "L1", "text": "A"}, {"id": "L2"}]') == {"L1": "A"}
+        assert parse_batch_response('{"items": [{"id": "L1", "text": "A"}]}') == {"L1": "A"}
+        assert parse_batch_response('{"L1": "A", "L2": "B"}') == {"L1": "A", "L2": "B"}
+        assert parse_batch_response("Here are the titles: A, B") == {}
+
+    def test_batch_prompt_layout(self):
+        """Test the batched prompt keeps the shared prefix first and tags every listing payload"""
+        agent = TitleAgent()
+        single = agent.build_user_prompt(property_data=self.listings[0], language="es", tone="luxury")
+        from core.property_context import PropertyContext
+
+        contexts = {
+            f"L{index}": PropertyContext.build(property_data=listing, language="es", tone="luxury")
+            for index, listing in enumerate(self.listings[:2], start=1)
+        }
+        batched = agent.build_batch_prompt(contexts=contexts)
+        prefix = single.rsplit("\n\n", 1)[0]
+        assert batched.startswith(prefix)
+        assert "[L1] Datos de la propiedad: Home 1" in batched and "[L2] Datos de la propiedad: Home 2" in batched
+        assert "array JSON" in batched
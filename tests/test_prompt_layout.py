@@ -0,0 +1,71 @@
+import pytest
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.html_generator import HTMLGenerator
+from core.property_context import PropertyContext
+from agents.content_generation.prompts import build_static_prefix
+
+
+class TestPromptLayout:
+    """Test the KV-cache-friendly prompt layout of the content agents"""
+
+    def setup_method(self):
+        """Setup test data"""
+        self.sample_property_data = {
+            "title": "T3 apartment in Lisbon",
+            "location": {"city": "Lisbon", "neighborhood": "Campo de Ourique"},
+            "features": {"bedrooms": 3, "bathrooms": 2, "area_sqm": 120, "balcony": True},
+            "price": 650000,
+            "listing_type": "sale",
+        }
+        self.agents = HTMLGenerator().agents
+
+    def test_agents_share_system_message(self):
+        """Test all section agents use one system message"""
+        system_messages = {agent.system_message for agent in self.agents.values()}
+        assert len(system_messages) == 1
+
+    @pytest.mark.parametrize("language", ["en", "es", "pt"])
+    def test_prompts_start_with_static_prefix(self, language):
+        """Test every initial and refinement prompt starts with the (language, tone) prefix"""
+        prefix = build_static_prefix(language=language, tone="luxury")
+        for agent in self.agents.values():
+            initial = agent.build_user_prompt(property_data=self.sample_property_data, language=language, tone="luxury")
+            refinement = agent.build_refinement_prompt(
+                property_data=self.sample_property_data,
+                current_content="Current text",
+                suggestion="Make it shorter",
+                language=language,
+                tone="luxury",
+            )
+            assert initial.startswith(prefix)
+            assert refinement.startswith(prefix)
+
+    def test_listing_payload_comes_last(self):
+        """Test listing-specific data never appears before the static instructions end"""
+        other_listing = dict(self.sample_property_data, title="Villa in Cascais", price=1200000)
+        for agent in self.agents.values():
+            first = agent.build_user_prompt(property_data=self.sample_property_data, language="pt", tone="modern")
+            second = agent.build_user_prompt(property_data=other_listing, language="pt", tone="modern")
+            payload = agent.build_payload(
+                context=PropertyContext.build(property_data=self.sample_property_data, language="pt", tone="modern")
+            )
+            assert first.endswith(payload)
+            # The instruction part is byte-identical across listings
+            assert first[: -len(payload)] == second[: len(first) - len(payload)]
+
+    def test_refinement_ends_with_suggestion(self):
+        """Test the current content and suggestion close the refinement prompt"""
+        prompt = self.agents["title"].build_refinement_prompt(
+            property_data=self.sample_property_data,
+            current_content="Lisbon flat",
+            suggestion="Use 30-60 characters",
+            language="en",
+            tone="classic",
+        )
+        assert prompt.index("Lisbon flat") > prompt.index("Property data")
+        assert prompt.endswith("- Use 30-60 characters")
@@ -0,0 +1,78 @@
+import pytest
+import sys
+import os
+import dataclasses
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.property_context import PropertyContext
+from core.property_facts import serialize_property_facts
+from agents.content_generation.title_agent import TitleAgent
+
+
+class TestPropertyContext:
+    """Test the shared per-listing PropertyContext"""
+
+    def setup_method(self):
+        """Setup test data"""
+        self.sample_property_data = {
+            "title": "Modern home in San Francisco",
+            "location": {"city": "San Francisco", "neighborhood": "Nob Hill"},
+            "features": {
+                "bedrooms": 3,
+                "bathrooms": 2,
+                "area_sqm": 167,
+                "balcony": True,
+                "parking": True,
+                "elevator": False,
+                "floor": 1,
+                "year_built": 2010,
+            },
+            "price": 850000,
+            "listing_type": "sale",
+        }
+
+    def test_build_is_cached(self):
+        """Test the same listing, language and tone share one context object"""
+        first = PropertyContext.build(property_data=self.sample_property_data, language="en", tone="modern")
+        second = PropertyContext.build(property_data=dict(self.sample_property_data), language="en", tone="modern")
+        assert first is second
+        other_tone = PropertyContext.build(property_data=self.sample_property_data, language="en", tone="luxury")
+        assert other_tone is not first
+
+    def test_context_is_immutable(self):
+        """Test the context cannot be modified by agents"""
+        context = PropertyContext.build(property_data=self.sample_property_data, language="en", tone="modern")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            context.language = "es"
+        with pytest.raises(TypeError):
+            context.property_data["price"] = 1
+        with pytest.raises(TypeError):
+            context.payloads["features"] = ""
+        assert not hasattr(context, "__dict__")
+
+    def test_caller_mutation_does_not_leak(self):
+        """Test the context keeps its own copy of the listing data"""
+        property_data = dict(self.sample_property_data)
+        context = PropertyContext.build(property_data=property_data, language="en", tone="modern")
+        property_data["price"] = 1
+        assert context.property_data["price"] == 850000
+
+    def test_derived_fields(self):
+        """Test the derived fields are rendered once from the listing"""
+        context = PropertyContext.build(property_data=self.sample_property_data, language="es", tone="modern")
+        assert context.language_name == "Español"
+        assert context.property_facts == serialize_property_facts(property_data=self.sample_property_data, language="es")
+        assert context.features_list.splitlines()[:3] == ["- 3 dormitorios", "- 2 baños", "- 167 metros cuadrados"]
+        assert "acceso por ascensor" not in context.features_list
+        assert context.neighborhood_info == "Neighborhood: Nob Hill, City: San Francisco"
+
+    def test_agent_prompt_uses_context(self):
+        """Test passing a context builds the same prompt as passing raw listing data"""
+        agent = TitleAgent()
+        context = PropertyContext.build(property_data=self.sample_property_data, language="pt", tone="modern")
+        from_context = agent.build_user_prompt(property_data=None, context=context)
+        from_data = agent.build_user_prompt(property_data=self.sample_property_data, language="pt", tone="modern")
+        assert from_context == from_data
+        assert from_context.endswith(context.payloads["property_data"])
@@ -0,0 +1,100 @@
+import pytest
+import sys
+import os
+import re
+import json
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.html_generator import HTMLGenerator
+from core.property_facts import serialize_property_facts
+from agents.evaluation.improvement_suggestion_agent import ImprovementSuggestionAgent
+
+
+def count_tokens(text):
+    """Approximate BPE token count: one token per word and per punctuation mark"""
+    return len(re.findall(r"\w+|[^\w\s]", text))
+
+
+class TestPropertyFacts:
+    """Test compact property-data serialization"""
+
+    def setup_method(self):
+        """Setup test data"""
+        self.sample_property_data = {
+            "title": "Modern home in San Francisco",
+            "location": {"city": "San Francisco", "neighborhood": "Nob Hill"},
+            "features": {
+                "bedrooms": 3,
+                "bathrooms": 2,
+                "area_sqm": 167,
+                "balcony": True,
+                "parking": True,
+                "elevator": False,
+                "floor": 1,
+                "year_built": 2010,
+            },
+            "price": 850000,
+            "listing_type": "sale",
+        }
+
+    def test_serializes_all_facts(self):
+        """Test every fact of the listing is kept"""
+        facts = serialize_property_facts(property_data=self.sample_property_data, language="en")
+        assert facts == (
+            "Modern home in San Francisco · for sale · price 850,000 · 3 bedrooms · 2 baths · 167 m² · "
+            "floor 1 · built 2010 · balcony · parking · no elevator · Nob Hill, San Francisco"
+        )
+
+    def test_localized_serialization(self):
+        """Test labels and number formatting follow the language"""
+        spanish = serialize_property_facts(property_data=self.sample_property_data, language="es")
+        portuguese = serialize_property_facts(property_data=self.sample_property_data, language="pt")
+        assert "3 dormitorios" in spanish and "precio 850.000" in spanish and "sin ascensor" in spanish
+        assert "3 quartos" in portuguese and "preço 850.000" in portuguese and "sem elevador" in portuguese
+
+    def test_key_order_does_not_change_output(self):
+        """Test the serialization is canonical regardless of dict ordering"""
+        reordered = dict(reversed(list(self.sample_property_data.items())))
+        reordered["features"] = dict(reversed(list(self.sample_property_data["features"].items())))
+        assert serialize_property_facts(reordered, "pt") == serialize_property_facts(self.sample_property_data, "pt")
+
+    def test_unknown_fields_are_kept(self):
+        """Test fields the serializer does not know about are not dropped"""
+        data = dict(self.sample_property_data, energy_rating="A", features={"pool": True, "garden_sqm": 40})
+        facts = serialize_property_facts(property_data=data, language="en")
+        assert "energy rating A" in facts
+        assert "pool" in facts and "garden sqm 40" in facts
+
+    @pytest.mark.parametrize("section", ["title", "meta", "h1", "description", "call_to_action"])
+    @pytest.mark.parametrize("language", ["en", "es", "pt"])
+    def test_token_reduction_per_content_prompt(self, section, language):
+        """Test the compact payload shrinks every content prompt that carries the property data"""
+        agent = HTMLGenerator().agents[section]
+        prompt = agent.build_user_prompt(property_data=self.sample_property_data, language=language, tone="luxury")
+        facts = serialize_property_facts(property_data=self.sample_property_data, language=language)
+        legacy_prompt = prompt.replace(facts, str(self.sample_property_data))
+
+        reduction = 1 - count_tokens(prompt) / count_tokens(legacy_prompt)
+        payload_reduction = 1 - count_tokens(facts) / count_tokens(str(self.sample_property_data))
+        assert payload_reduction > 0.5
+        assert reduction > 0.2
+
+    @pytest.mark.parametrize("language", ["en", "es", "pt"])
+    def test_token_reduction_improvement_prompt(self, language):
+        """Test the compact payload shrinks the improvement prompt compared to pretty-printed JSON"""
+        agent = ImprovementSuggestionAgent()
+        evaluation_results = {"all_findings": [{"type": "tone", "message": "Text should have a 'luxury' tone."}]}
+        prompt = agent._build_improvement_prompt(
+            current_content="<h1>Modern home</h1>",
+            evaluation_results=evaluation_results,
+            property_data=self.sample_property_data,
+            language=language,
+            tone="luxury",
+        )
+        facts = serialize_property_facts(property_data=self.sample_property_data, language=language)
+        legacy_prompt = prompt.replace(facts, json.dumps(obj=self.sample_property_data, indent=2))
+
+        reduction = 1 - count_tokens(prompt) / count_tokens(legacy_prompt)
+        assert reduction > 0.1
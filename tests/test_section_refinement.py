@@ -0,0 +1,433 @@
+import pytest
+import sys
+import os
+import asyncio
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.html_generator import HTMLGenerator
+from core.listing_document import ListingDocument
+from core.neighborhood_store import NeighborhoodStore, neighborhood_key
+from core.cta_pool import CallToActionPool
+from core.best_of_n import BestOfNSampler
+from evaluate.complete_evaluator import CompleteEvaluator, CHECK_COSTS, SECTION_CHECKS, SHORT_CIRCUIT_POLICIES
+from evaluate.language import ToneMatchEvaluator
+from agents.evaluation.improvement_suggestion_agent import ImprovementSuggestionAgent
+
+
+async def fake_tone(document=None, target_tone="professional", **kwargs):
+    """Tone check that passes unless the text shouts"""
+    passed = "!!!" not in document.plain_text
+    findings = [] if passed else [{"type": "tone", "message": f"Text should have a '{target_tone}' tone."}]
+    return {"evaluator": "ToneMatchEvaluator", "score": 1.0 if passed else 0.2, "passed": passed, "findings": findings}
+
+
+class TestSectionRefinement:
+    """Test per-section evaluation and the per-section refinement loop"""
+
+    def setup_method(self):
+        """Setup test data"""
+        self.sample_property_data = {
+            "title": "Modern home in San Francisco",
+            "location": {"city": "San Francisco", "neighborhood": "Nob Hill"},
+            "features": {"bedrooms": 3, "bathrooms": 2},
+            "price": 850000,
+            "listing_type": "sale",
+        }
+        self.sections = {
+            "title": "Modern three bedroom home for sale in the heart of the city",
+            "meta": "A bright modern home with three bedrooms, two bathrooms and a quiet garden close to the park.",
+            "h1": "A bright modern home close to the park",
+            "description": "The house has three bright bedrooms. The kitchen is open and the garden is quiet.",
+            "key_features": "- 3 bedrooms\n- 2 bathrooms",
+            "neighborhood": "The street is quiet. The park and the school are close.",
+            "call_to_action": "Call us today!!!",
+        }
+
+    @pytest.mark.asyncio
+    async def test_sections_are_scored_separately(self):
+        """Test each section gets its own checks and findings"""
+        evaluator = CompleteEvaluator()
+        evaluator.tone_match.evaluate = fake_tone
+        results = await evaluator.evaluate_sections(
+            document=ListingDocument(sections=self.sections),
+            property_data=self.sample_property_data,
+            language="en",
+            tone="luxury",
+        )
+        assert set(results["sections"]) == set(SECTION_CHECKS)
+        for section, result in results["sections"].items():
+            assert list(result["evaluations"]) + result["skipped_checks"] == SECTION_CHECKS[section]
+        assert "call_to_action" in results["failed_sections"]
+        assert all(finding["section"] for finding in results["all_findings"])
+        assert results["sections"]["call_to_action"]["content"] == "Call us today!!!"
+
+    @pytest.mark.asyncio
+    async def test_only_requested_sections_are_evaluated(self):
+        """Test pending sections restrict the evaluation"""
+        evaluator = CompleteEvaluator()
+        evaluator.tone_match.evaluate = fake_tone
+        results = await evaluator.evaluate_sections(
+            document=ListingDocument(sections=self.sections), sections=["key_features", "call_to_action"]
+        )
+        assert list(results["sections"]) == ["key_features", "call_to_action"]
+
+    @pytest.mark.asyncio
+    async def test_document_level_seo_is_deferred(self):
+        """Test a section evaluated on its own ignores SEO issues that depend on the whole document"""
+        evaluator = CompleteEvaluator()
+        evaluator.tone_match.evaluate = fake_tone
+        document = ListingDocument(sections={"title": "Home", "description": "Short text."})
+        title = await evaluator.evaluate_section(document=document, section="title")
+        assert not title["passed"]
+        assert {finding["element_type"] for finding in title["findings"]} == {"Title"}
+        description = await evaluator.evaluate_section(document=document, section="description")
+        assert "seo" in description["evaluations"] and description["evaluations"]["seo"]["passed"]
+        document_findings = await evaluator.evaluate_document_checks(document=document)
+        assert "Content Quality" in {finding["element_type"] for finding in document_findings["description"]}
+
+    @pytest.mark.asyncio
+    async def test_checks_run_cheapest_first(self):
+        """Test section checks run in cost order whatever order they are listed in"""
+        evaluator = CompleteEvaluator(short_circuit="never")
+        evaluator.tone_match.evaluate = fake_tone
+        order = []
+        for name in CHECK_COSTS:
+
+            async def tracked(check=evaluator.checks[name], **inputs):
+                order.append(check.name)
+                return await check.run(**inputs)
+
+            evaluator.register_check(name=name, run=tracked, cost=evaluator.checks[name].cost)
+        await evaluator._run_checks(
+            check_names=["tone_match", "seo", "readability", "facts", "language_match"],
+            short_circuit="never",
+            document=ListingDocument(sections=self.sections),
+            target=ListingDocument(sections=self.sections).section_document(section_name="description"),
+            section="description",
+            property_data=self.sample_property_data,
+            language="en",
+            language_name="English",
+            tone="luxury",
+            seo_findings=[],
+        )
+        assert order == ["facts", "language_match", "readability", "seo", "tone_match"]
+
+    @pytest.mark.asyncio
+    async def test_short_circuit_policies(self):
+        """Test a failed cheap check skips the LLM checks or every remaining check, per policy"""
+        sections = dict(self.sections, call_to_action="Call us today to visit this 5-bedroom home!!!")
+        skipped = {}
+        for policy in SHORT_CIRCUIT_POLICIES:
+            evaluator = CompleteEvaluator(short_circuit=policy)
+            evaluator.tone_match.evaluate = fake_tone
+            result = await evaluator.evaluate_section(
+                document=ListingDocument(sections=sections),
+                section="call_to_action",
+                property_data=self.sample_property_data,
+                tone="luxury",
+            )
+            assert not result["evaluations"]["facts"]["passed"]
+            skipped[policy] = result["skipped_checks"]
+        assert skipped == {"never": [], "llm": ["tone_match"], "always": ["language_match", "tone_match"]}
+
+    @pytest.mark.asyncio
+    async def test_check_stats(self):
+        """Test per-check latency, failures and short-circuit rates are recorded"""
+        evaluator = CompleteEvaluator(short_circuit="llm")
+        evaluator.tone_match.evaluate = fake_tone
+        document = ListingDocument(sections=dict(self.sections, call_to_action="A 5-bedroom home. Call us!!!"))
+        await evaluator.evaluate_section(
+            document=document, section="call_to_action", property_data=self.sample_property_data, tone="luxury"
+        )
+        stats = evaluator.get_check_stats()
+        assert stats["policy"] == "llm"
+        assert stats["evaluations"] == stats["short_circuited"] == 1
+        assert stats["checks"]["facts"]["runs"] == stats["checks"]["facts"]["failures"] == 1
+        assert stats["checks"]["facts"]["mean_ms"] >= 0
+        assert stats["checks"]["tone_match"]["short_circuit_rate"] == 1.0
+        assert stats["checks"]["readability"]["short_circuit_rate"] is None
+        with pytest.raises(ValueError):
+            CompleteEvaluator(short_circuit="sometimes")
+
+    def test_improvement_prompt_only_has_failed_sections(self):
+        """Test the improvement prompt carries only the failing sections' text and findings"""
+        agent = ImprovementSuggestionAgent()
+        evaluation_results = {
+            "sections": {
+                "title": {"passed": True, "content": "Great title", "evaluations": {}, "findings": []},
+                "call_to_action": {
+                    "passed": False,
+                    "content": "Call us today!!!",
+                    "evaluations": {"tone_match": {"score": 0.2}},
+                    "findings": [{"type": "tone", "message": "Text should have a 'luxury' tone."}],
+                },
+            }
+        }
+        prompt = agent._build_improvement_prompt(
+            current_content="",
+            evaluation_results=evaluation_results,
+            property_data=self.sample_property_data,
+            language="en",
+            tone="luxury",
+        )
+        assert "call_to_action: Call us today!!!" in prompt
+        assert "[call_to_action] tone/medium: Text should have a 'luxury' tone." in prompt
+        assert '"call_to_action": "None" OR' in prompt
+        assert "Great title" not in prompt
+        assert '"title":' not in prompt
+
+    def test_meta_description_key_is_mapped(self):
+        """Test the model's meta_description key is routed to the meta section"""
+        agent = ImprovementSuggestionAgent()
+        suggestions = agent._parse_suggestions_response(
+            suggestions_text='{"meta_description": "Problem: too short. Fix: expand it.", "h1": "None"}',
+            evaluation_results={},
+        )
+        assert suggestions["meta"]["suggestion"].startswith("Problem")
+
+    def _pipeline_generator(self, evaluated, drafts, document_findings=None, max_iterations=3):
+        """Build an HTMLGenerator whose agents and evaluators are in-memory fakes"""
+
+        class FakeEvaluator:
+            tone_match = ToneMatchEvaluator()
+
+            async def evaluate_section(self, document, section, document_findings=None, **kwargs):
+                evaluated.append(section)
+                passed = document.sections[section] != "draft" and not document_findings
+                return {"passed": passed, "content": document.sections[section], "evaluations": {}, "findings": []}
+
+            async def evaluate_document_checks(self, document):
+                return document_findings or {}
+
+            async def evaluate_html_complete(self, **kwargs):
+                return {"needs_improvement": False}
+
+            def get_check_stats(self):
+                return {}
+
+            def get_whitelist_stats(self):
+                return {}
+
+        class FakeImprovementAgent:
+            async def generate_section_improvements(self, evaluation_results, **kwargs):
+                return {section: {"suggestion": "Fix it"} for section in evaluation_results["sections"]}
+
+        class FakeAgent:
+            def __init__(self, draft, depends_on=("*",)):
+                self.draft = draft
+                self.DEPENDS_ON = depends_on
+
+            async def generate_initial(self, **kwargs):
+                return await self.draft() if callable(self.draft) else self.draft
+
+            async def refine(self, current_content, **kwargs):
+                return "fixed" if current_content == "draft" else current_content + "+"
+
+        generator = HTMLGenerator(max_iterations=max_iterations)
+        generator.agents = {section: FakeAgent(draft) for section, draft in drafts.items()}
+        generator.draft_agents = generator.agents
+        generator.complete_evaluator = FakeEvaluator()
+        generator.improvement_agent = FakeImprovementAgent()
+        generator.neighborhood_store = NeighborhoodStore(path=":memory:", variants=2)
+        generator.cta_pool = None
+        generator.prompt_batcher = None
+        generator.sampler = None
+        return generator
+
+    @pytest.mark.asyncio
+    async def test_passing_sections_leave_the_loop(self):
+        """Test a section is neither re-evaluated nor refined once it passes"""
+        evaluated = []
+        generator = self._pipeline_generator(evaluated, drafts={"title": "draft", "h1": "good", "description": "draft"})
+        await generator.generate_html(property_data=self.sample_property_data, language="en", tone="modern")
+        assert sorted(evaluated) == ["description", "description", "h1", "title", "title"]
+        assert generator.sections == {"title": "fixed", "h1": "good", "description": "fixed"}
+        assert generator.section_iterations == {"title": 1, "h1": 0, "description": 1}
+
+    @pytest.mark.asyncio
+    async def test_sections_do_not_wait_for_each_other(self):
+        """Test a fast section is evaluated and refined while a slow draft is still running"""
+        title_refined = asyncio.Event()
+        evaluated = []
+
+        async def slow_description():
+            # Only finishes once the title went through its whole pipeline
+            await asyncio.wait_for(title_refined.wait(), timeout=5)
+            return "good"
+
+        generator = self._pipeline_generator(evaluated, drafts={"title": "draft", "description": slow_description})
+        original_refinements = generator._apply_section_refinements
+
+        async def tracking_refinements(**kwargs):
+            refined = await original_refinements(**kwargs)
+            if "title" in refined:
+                title_refined.set()
+            return refined
+
+        generator._apply_section_refinements = tracking_refinements
+        await generator.generate_html(property_data=self.sample_property_data, language="en", tone="modern")
+        assert evaluated == ["title", "title", "description"]
+        assert generator.sections == {"title": "fixed", "description": "good"}
+
+    @pytest.mark.asyncio
+    async def test_document_checks_run_after_settling(self):
+        """Test document-level findings send their section through one more refinement"""
+        evaluated = []
+        generator = self._pipeline_generator(
+            evaluated,
+            drafts={"title": "good", "description": "good"},
+            document_findings={"description": [{"type": "seo", "message": "Thin Content"}]},
+        )
+        await generator.generate_html(property_data=self.sample_property_data, language="en", tone="modern")
+        assert generator.sections == {"title": "good", "description": "good+"}
+        assert generator.section_iterations == {"title": 0, "description": 1}
+
+    @pytest.mark.asyncio
+    async def test_incremental_regeneration_drafts_only_affected_sections(self):
+        """Test a price change redrafts the sections that read it and only re-evaluates the others"""
+        evaluated = []
+        generator = self._pipeline_generator(
+            evaluated, drafts={"title": "draft", "key_features": "draft", "neighborhood": "draft"}
+        )
+        generator.agents["key_features"].DEPENDS_ON = ("features",)
+        generator.agents["neighborhood"].DEPENDS_ON = ("location.neighborhood", "location.city")
+        new_property_data = dict(self.sample_property_data, price=799000)
+        await generator.regenerate_html(
+            previous_sections={"title": "old title", "key_features": "good", "neighborhood": "good"},
+            old_property_data=self.sample_property_data,
+            new_property_data=new_property_data,
+            language="en",
+            tone="modern",
+        )
+        assert generator.redrafted_sections == ["title"]
+        assert generator.sections == {"title": "fixed", "key_features": "good", "neighborhood": "good"}
+        assert sorted(evaluated) == ["key_features", "neighborhood", "title", "title"]
+        # The kept neighborhood section was not drafted in this run, so it is not stored again
+        assert generator.neighborhood_store.get_stats()["stored"] == 0
+
+    @pytest.mark.asyncio
+    async def test_neighborhood_sections_are_served_from_the_store(self):
+        """Test passing neighborhood sections fill the store and later listings are served from it"""
+        evaluated = []
+        drafts = iter(["Nob Hill is quiet.", "Nob Hill is central.", "unused"])
+
+        async def next_draft():
+            return next(drafts)
+
+        generator = self._pipeline_generator(evaluated, drafts={"neighborhood": next_draft})
+        listings = [dict(self.sample_property_data, title=f"Home {index}") for index in range(4)]
+        for listing in listings:
+            await generator.generate_html(property_data=listing, language="en", tone="modern")
+        # Two listings fill the store's two variants, the next two make no draft and no evaluation
+        assert evaluated == ["neighborhood", "neighborhood"]
+        assert generator.neighborhood_store.get_stats() == {"hits": 2, "misses": 2, "stored": 2}
+        key = neighborhood_key(property_data=listings[0], language="en", tone="modern", model=generator.model)
+        assert {content for content, _ in generator.neighborhood_store.get_variants(key=key)} == {
+            "Nob Hill is quiet.",
+            "Nob Hill is central.",
+        }
+        assert generator.sections["neighborhood"] in {"Nob Hill is quiet.", "Nob Hill is central."}
+
+    @pytest.mark.asyncio
+    async def test_pooled_call_to_action_replaces_the_draft(self):
+        """Test the first pooled call to action passing the listing's checks is served without a draft"""
+        evaluated = []
+        generator = self._pipeline_generator(evaluated, drafts={"call_to_action": "draft"})
+        generator.cta_pool = CallToActionPool()
+        generator.cta_pool.set_variants(
+            language="en",
+            tone="modern",
+            listing_type="sale",
+            entries=[{"text": "draft", "score": 0.9}, {"text": "Book a viewing today.", "score": 0.8}],
+        )
+        await generator.generate_html(property_data=self.sample_property_data, language="en", tone="modern")
+        # The fake evaluator fails "draft", so the pooled "draft" variant is rejected wherever the rotation starts
+        assert generator.sections["call_to_action"] == "Book a viewing today."
+        assert generator.section_iterations["call_to_action"] == 0
+        stats = generator.cta_pool.get_stats()
+        assert stats["served"] == 1 and stats["fallbacks"] == 0
+
+    @pytest.mark.asyncio
+    async def test_call_to_action_falls_back_to_the_llm(self):
+        """Test the call to action is drafted and refined when no pooled variant passes"""
+        evaluated = []
+        generator = self._pipeline_generator(evaluated, drafts={"call_to_action": "draft"})
+        generator.cta_pool = CallToActionPool()
+        generator.cta_pool.set_variants(
+            language="en", tone="modern", listing_type="sale", entries=[{"text": "draft", "score": 0.9}]
+        )
+        await generator.generate_html(property_data=self.sample_property_data, language="en", tone="modern")
+        assert generator.sections["call_to_action"] == "fixed"
+        assert generator.cta_pool.get_stats() == {"served": 0, "rejected": 1, "fallbacks": 1}
+
+    @pytest.mark.asyncio
+    async def test_template_mode_makes_no_llm_call(self):
+        """Test key features and H1 come from their templates and skip evaluation and refinement"""
+        evaluated = []
+        generator = self._pipeline_generator(evaluated, drafts={"title": "good", "h1": "draft", "key_features": "draft"})
+        generator.templates = "template"
+        await generator.generate_html(property_data=self.sample_property_data, language="en", tone="luxury")
+        assert evaluated == ["title"]
+        assert generator.sections["h1"] == "Exquisite 3-bedroom residence in Nob Hill, San Francisco for sale"
+        assert generator.sections["key_features"] == "- 3 elegant bedrooms\n- 2 refined bathrooms"
+
+    @pytest.mark.asyncio
+    async def test_template_fallback_replaces_failed_llm_sections(self):
+        """Test fallback mode renders the template when the LLM call fails, and only for template sections"""
+
+        async def unreachable():
+            raise ConnectionError("Ollama is not running")
+
+        evaluated = []
+        generator = self._pipeline_generator(evaluated, drafts={"h1": unreachable, "key_features": "good"})
+        generator.templates = "fallback"
+        await generator.generate_html(property_data=self.sample_property_data, language="es", tone="modern")
+        assert generator.sections == {
+            "h1": "Vivienda moderna de 3 dormitorios en Nob Hill, San Francisco en venta",
+            "key_features": "good",
+        }
+
+        generator = self._pipeline_generator(evaluated, drafts={"title": unreachable})
+        generator.templates = "fallback"
+        with pytest.raises(ConnectionError):
+            await generator.generate_html(property_data=self.sample_property_data, language="es", tone="modern")
+
+    @pytest.mark.asyncio
+    async def test_best_of_n_refines_only_sections_without_a_passing_candidate(self):
+        """Test a passing candidate is kept without refinement and the others go through the loop"""
+        title_drafts = iter(["draft", "good", "good"])
+
+        async def title():
+            return next(title_drafts)
+
+        evaluated = []
+        generator = self._pipeline_generator(evaluated, drafts={"title": title, "description": "draft"})
+        generator.sampler = BestOfNSampler(candidates=3)
+        await generator.generate_html(property_data=self.sample_property_data, language="en", tone="modern")
+        assert generator.sections == {"title": "good", "description": "fixed"}
+        assert generator.section_iterations == {"title": 0, "description": 1}
+        # Distinct title candidates are evaluated once each; the description is then evaluated by the loop twice
+        assert sorted(evaluated) == ["description", "description", "description", "title", "title"]
+        assert generator.sampler.get_stats() == {"sections": 2, "passed": 1, "drafts": 6, "duplicates": 3}
+
+    @pytest.mark.asyncio
+    async def test_best_of_n_stores_only_fully_evaluated_neighborhoods(self):
+        """Test a locally checked neighborhood candidate gets the full evaluation before it is stored"""
+        evaluated = []
+        generator = self._pipeline_generator(evaluated, drafts={"neighborhood": "good"})
+        generator.sampler = BestOfNSampler(candidates=2)
+        full_evaluations = []
+        local_evaluate = generator.complete_evaluator.evaluate_section
+
+        async def evaluate_section(local_only=False, **kwargs):
+            if not local_only:
+                full_evaluations.append(kwargs["section"])
+            return await local_evaluate(local_only=local_only, **kwargs)
+
+        generator.complete_evaluator.evaluate_section = evaluate_section
+        await generator.generate_html(property_data=self.sample_property_data, language="en", tone="modern")
+        assert generator.sections == {"neighborhood": "good"}
+        assert full_evaluations == ["neighborhood"]
+        assert generator.neighborhood_store.get_stats()["stored"] == 1
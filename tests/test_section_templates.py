@@ -0,0 +1,103 @@
+import pytest
+import sys
+import os
+import asyncio
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from config.options import LANGUAGE_OPTIONS, TONE_OPTIONS
+from core.html_generator import HTMLGenerator
+from core.listing_document import ListingDocument
+from core.section_templates import MAX_H1_LENGTH, MAX_KEY_FEATURES, TEMPLATE_SECTIONS, render_h1, render_key_features, render_section
+from evaluate.fact import RuleFactEvaluator
+
+
+class TestSectionTemplates:
+    """Test the template renderers for key features and H1"""
+
+    def setup_method(self):
+        """Setup test data"""
+        self.property_data = {
+            "title": "Modern apartment in downtown",
+            "location": {"city": "San Francisco", "neighborhood": "Mission Bay"},
+            "features": {
+                "bedrooms": 2,
+                "bathrooms": 1,
+                "area_sqm": 80,
+                "balcony": True,
+                "parking": False,
+                "elevator": True,
+                "floor": 3,
+                "year_built": 2020,
+            },
+            "price": 650000,
+            "listing_type": "sale",
+        }
+
+    def test_key_features_follow_language_and_tone(self):
+        """Test the phrasing table of the tone is used on top of the language defaults"""
+        assert render_key_features(property_data=self.property_data, language="en", tone="luxury").splitlines() == [
+            "- 2 elegant bedrooms",
+            "- 1 refined bathroom",
+            "- 80 m² of exclusive living space",
+            "- Private balcony for refined outdoor living",
+            "- Elevator access",
+        ]
+        features = render_key_features(property_data=self.property_data, language="pt", tone="classic")
+        assert features.startswith("- 2 quartos bem proporcionados\n- 1 banheiro\n")
+        assert len(features.splitlines()) == MAX_KEY_FEATURES
+        assert "parking" not in render_key_features(property_data=self.property_data, language="en", tone="modern").lower()
+
+    def test_key_features_keep_zero_values(self):
+        """Test a ground floor is listed while None, empty and false features are left out"""
+        features = {"floor": 0, "balcony": None, "parking": False, "elevator": ""}
+        assert render_key_features(property_data={"features": features}, language="en", tone="modern") == "- Set on floor 0"
+
+    def test_h1_fits_and_drops_suffixes(self):
+        """Test the H1 keeps the location when it fits and drops suffixes from the end otherwise"""
+        assert render_h1(property_data=self.property_data, language="en", tone="modern") == (
+            "Contemporary 2-bedroom home in Mission Bay, San Francisco for sale"
+        )
+        long_location = dict(self.property_data, location={"city": "San Francisco", "neighborhood": "South of Market"})
+        heading = render_h1(property_data=long_location, language="pt", tone="family-oriented")
+        assert heading == "Casa familiar espaçosa de 2 quartos em South of Market, San Francisco"
+        assert render_h1(property_data={"title": "Loft"}, language="es", tone="youthful") == "Vivienda luminosa"
+        assert render_h1(property_data={"features": {"bedrooms": 1}}, language="es", tone="modern") == (
+            "Vivienda moderna de 1 dormitorio"
+        )
+
+    def test_h1_suffix_fallback_order(self):
+        """Test the listing type goes first, then the city, then the neighborhood, retrying the listing type each time"""
+
+        def h1(neighborhood, city):
+            property_data = dict(self.property_data, location={"neighborhood": neighborhood, "city": city})
+            return render_h1(property_data=property_data, language="es", tone="luxury")
+
+        heading = "Exclusiva residencia de 2 dormitorios"
+        assert h1("Nob Hill", "San Francisco") == f"{heading} en Nob Hill, San Francisco"
+        assert h1("Financial District", "San Francisco") == f"{heading} en Financial District en venta"
+        assert h1("Fisherman's Wharf and Embarcadero", "San Francisco") == f"{heading} en San Francisco en venta"
+        assert h1("Fisherman's Wharf and Embarcadero", "Santa María de Guadalupe de la Sierra") == f"{heading} en venta"
+
+    @pytest.mark.parametrize("language", list(LANGUAGE_OPTIONS))
+    @pytest.mark.parametrize("tone", list(TONE_OPTIONS))
+    def test_templates_pass_the_fact_check(self, language, tone):
+        """Test every language and tone states the listing's facts the way the rule check reads them"""
+        evaluator = RuleFactEvaluator()
+        for section in TEMPLATE_SECTIONS:
+            text = render_section(section=section, property_data=self.property_data, language=language, tone=tone)
+            result = asyncio.run(
+                evaluator.evaluate(
+                    document=ListingDocument.from_text(text=text, language=language),
+                    property_data=self.property_data,
+                    language=language,
+                )
+            )
+            assert result["passed"], (section, text, result["findings"])
+        assert len(render_h1(property_data=self.property_data, language=language, tone=tone)) <= MAX_H1_LENGTH
+
+    def test_invalid_template_mode(self):
+        """Test HTMLGenerator rejects unknown template modes"""
+        with pytest.raises(ValueError, match="Unsupported template mode"):
+            HTMLGenerator(templates="always")
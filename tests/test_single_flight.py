@@ -0,0 +1,103 @@
+import pytest
+import sys
+import os
+import asyncio
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.html_generator import HTMLGenerator
+from core.single_flight import SingleFlight, canonical_key
+
+
+class TestSingleFlight:
+    """Test in-flight deduplication of identical concurrent work"""
+
+    def test_canonical_key_ignores_dict_order(self):
+        """Test keys depend on the values, not on the order of dict keys"""
+        first = canonical_key({"price": 1, "location": {"city": "Lisboa", "neighborhood": "Alfama"}}, "pt")
+        second = canonical_key({"location": {"neighborhood": "Alfama", "city": "Lisboa"}, "price": 1}, "pt")
+        assert first == second
+        assert first != canonical_key({"price": 2, "location": {"city": "Lisboa", "neighborhood": "Alfama"}}, "pt")
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_job(self):
+        """Test identical concurrent calls run the job once, and later calls start fresh work"""
+        group = SingleFlight(name="test")
+        calls = []
+
+        async def job():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return len(calls)
+
+        results = await asyncio.gather(*[group.run(key="a", job=job) for _ in range(5)])
+        assert results == [1] * 5
+        assert await group.run(key="a", job=job) == 2
+        assert await group.run(key="b", job=job) == 3
+        assert group.get_stats() == {"calls": 7, "coalesced": 4, "in_flight": 0}
+
+    @pytest.mark.asyncio
+    async def test_failures_reach_every_caller(self):
+        """Test a failing job raises in every caller that joined it"""
+        group = SingleFlight(name="test")
+
+        async def job():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("model unavailable")
+
+        results = await asyncio.gather(*[group.run(key="a", job=job) for _ in range(3)], return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        """Test the job keeps running for the remaining callers and stops once nobody waits"""
+        group = SingleFlight(name="test")
+        started = asyncio.Event()
+
+        async def job():
+            started.set()
+            await asyncio.sleep(0.05)
+            return "done"
+
+        first = asyncio.ensure_future(group.run(key="a", job=job))
+        second = asyncio.ensure_future(group.run(key="a", job=job))
+        await started.wait()
+        first.cancel()
+        assert await second == "done"
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+        lone = asyncio.ensure_future(group.run(key="b", job=job))
+        await asyncio.sleep(0.01)
+        lone.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await lone
+        await asyncio.sleep(0)
+        assert group.get_stats()["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_duplicate_generations_are_coalesced(self):
+        """Test two generators submitting the same listing share one pipeline run"""
+        runs = []
+
+        async def fake_generate_sections(self, property_data, language, tone):
+            runs.append(self)
+            await asyncio.sleep(0.01)
+            return {"title": property_data["title"], "h1": "Welcome home"}
+
+        property_data = {"title": "Modern home in San Francisco", "price": 850000}
+        generators = [HTMLGenerator(), HTMLGenerator(), HTMLGenerator(max_iterations=2)]
+        original = HTMLGenerator._generate_sections
+        HTMLGenerator._generate_sections = fake_generate_sections
+        try:
+            pages = await asyncio.gather(
+                *[generator.generate_html(property_data=property_data, language="en", tone="luxury") for generator in generators]
+            )
+        finally:
+            HTMLGenerator._generate_sections = original
+        # Same listing and settings -> one run; a different iteration count is different work
+        assert len(runs) == 2
+        assert pages[0] == pages[1] == pages[2]
+        assert "Modern home in San Francisco" in pages[0]
+        assert generators[1].sections == generators[0].sections